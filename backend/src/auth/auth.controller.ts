@@ -1,5 +1,6 @@
-import { Controller, Post, Body, UseGuards, Request, Param, Patch } from '@nestjs/common';
+import { Controller, Get, Post, Body, UseGuards, Request, Param, Patch } from '@nestjs/common';
 import { AuthService } from './auth.service';
+import { PasswordHasher } from './password-hasher.service';
 import { LocalAuthGuard } from './local-auth.guard';
 import { JwtAuthGuard } from './jwt-auth.guard';
 import { RolesGuard } from './roles.guard';
@@ -12,7 +13,10 @@ import { AcceptCoordinatorInviteDto } from '../invites/dto/accept-coordinator-in
 
 @Controller('auth')
 export class AuthController {
-  constructor(private authService: AuthService) {}
+  constructor(
+    private authService: AuthService,
+    private passwordHasher: PasswordHasher,
+  ) {}
 
   @Post('register')
   async register(@Body() registerDto: RegisterDto) {
@@ -49,6 +53,13 @@ export class AuthController {
     return this.authService.approvePriestRequest(userId, body.approved, req.user.id);
   }
 
+  @UseGuards(JwtAuthGuard, RolesGuard)
+  @Roles('admin')
+  @Get('password-hasher/stats')
+  getPasswordHasherStats() {
+    return this.passwordHasher.stats();
+  }
+
   @Post('register-coordinator/:token')
   async registerCoordinator(
     @Param('token') token: string,
@@ -6,6 +6,7 @@ import { AuthService } from './auth.service';
 import { AuthController } from './auth.controller';
 import { JwtStrategy } from './jwt.strategy';
 import { LocalStrategy } from './local.strategy';
+import { PasswordHasher } from './password-hasher.service';
 import { UsersModule } from '../users/users.module';
 import { InvitesModule } from '../invites/invites.module';
 
@@ -25,7 +26,7 @@ import { InvitesModule } from '../invites/invites.module';
     }),
   ],
   controllers: [AuthController],
-  providers: [AuthService, LocalStrategy, JwtStrategy],
+  providers: [AuthService, PasswordHasher, LocalStrategy, JwtStrategy],
   exports: [AuthService],
 })
 export class AuthModule {}
\ No newline at end of file
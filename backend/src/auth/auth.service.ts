@@ -1,8 +1,8 @@
-import { Injectable, UnauthorizedException, BadRequestException } from '@nestjs/common';
+import { Injectable, UnauthorizedException, BadRequestException, Logger } from '@nestjs/common';
 import { JwtService } from '@nestjs/jwt';
 import { UsersService } from '../users/users.service';
 import { InvitesService } from '../invites/invites.service';
-import * as bcrypt from 'bcryptjs';
+import { PasswordHasher } from './password-hasher.service';
 import { User, UserRole } from '../entities/user.entity';
 import { RegisterDto } from './dto/register.dto';
 import { RegisterPriestRequestDto } from './dto/register-priest-request.dto';
@@ -11,21 +11,36 @@ import { AcceptCoordinatorInviteDto } from '../invites/dto/accept-coordinator-in
 
 @Injectable()
 export class AuthService {
+  private readonly logger = new Logger(AuthService.name);
+
   constructor(
     private usersService: UsersService,
     private jwtService: JwtService,
     private invitesService: InvitesService,
+    private passwordHasher: PasswordHasher,
   ) {}
 
   async validateUser(email: string, password: string): Promise<any> {
     const user = await this.usersService.findByEmail(email);
-    if (user && await bcrypt.compare(password, user.password)) {
-      const { password, ...result } = user;
+    // bcrypt runs on the hashing worker pool, never on the event loop
+    if (user && await this.passwordHasher.compare(password, user.password)) {
+      if (this.passwordHasher.needsRehash(user.password)) {
+        this.rehashPassword(user.id, password);
+      }
+      const { password: _hash, ...result } = user;
       return result;
     }
     return null;
   }
 
+  // The cost factor changed: store a new hash in the background, without delaying the login
+  private rehashPassword(userId: string, password: string): void {
+    this.passwordHasher
+      .hash(password)
+      .then(hash => this.usersService.update(userId, { password: hash }))
+      .catch(error => this.logger.warn(`Could not rehash password for user ${userId}: ${error.message}`));
+  }
+
   async login(user: any) {
     const payload = { email: user.email, sub: user.id, role: user.role };
     return {
@@ -43,13 +58,12 @@ export class AuthService {
 
   async register(registerDto: RegisterDto) {
     // Check if user exists
-    const existingUser = await this.usersService.findByEmail(registerDto.email);
-    if (existingUser) {
+    if (await this.usersService.existsByEmail(registerDto.email)) {
       throw new UnauthorizedException('Ya existe un usuario con este correo electrónico');
     }
 
     // Hash password
-    const hashedPassword = await bcrypt.hash(registerDto.password, 12);
+    const hashedPassword = await this.passwordHasher.hash(registerDto.password);
 
     // Create user
     const user = await this.usersService.create({
@@ -63,13 +77,12 @@ export class AuthService {
 
   async registerPriestRequest(registerPriestRequestDto: RegisterPriestRequestDto) {
     // Check if user exists
-    const existingUser = await this.usersService.findByEmail(registerPriestRequestDto.email);
-    if (existingUser) {
+    if (await this.usersService.existsByEmail(registerPriestRequestDto.email)) {
       throw new UnauthorizedException('Ya existe un usuario con este correo electrónico');
     }
 
     // Hash password
-    const hashedPassword = await bcrypt.hash(registerPriestRequestDto.password, 12);
+    const hashedPassword = await this.passwordHasher.hash(registerPriestRequestDto.password);
 
     // Create user with pending approval status
     const user = await this.usersService.create({
@@ -100,7 +113,7 @@ export class AuthService {
 
   async registerFromInvite(token: string, registerFromInviteDto: RegisterFromInviteDto) {
     // Hash password
-    const hashedPassword = await bcrypt.hash(registerFromInviteDto.password, 12);
+    const hashedPassword = await this.passwordHasher.hash(registerFromInviteDto.password);
 
     // Accept the invitation and create user
     const { user, invite } = await this.invitesService.acceptInvite(token, {
@@ -0,0 +1,156 @@
+import { Injectable, Logger, OnModuleDestroy, ServiceUnavailableException } from '@nestjs/common';
+import { Worker } from 'worker_threads';
+import { cpus } from 'os';
+import { join } from 'path';
+import * as bcrypt from 'bcryptjs';
+
+// bcrypt cost for new hashes; hashes stored with another cost are rehashed on login
+export const BCRYPT_ROUNDS = parseInt(process.env.BCRYPT_ROUNDS || '12', 10);
+
+// Threads hashing at once, and requests that may wait for one before being rejected with 503
+const POOL_SIZE = parseInt(process.env.PASSWORD_HASH_WORKERS || String(Math.max(1, Math.min(4, cpus().length - 1))), 10);
+const QUEUE_LIMIT = parseInt(process.env.PASSWORD_HASH_QUEUE_LIMIT || '200', 10);
+
+type HashTask =
+  | { op: 'compare'; password: string; hash: string }
+  | { op: 'hash'; password: string; rounds: number };
+
+interface PendingTask {
+  id: number;
+  task: HashTask;
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+  worker: Worker;
+  current: PendingTask | null;
+}
+
+@Injectable()
+export class PasswordHasher implements OnModuleDestroy {
+  private readonly logger = new Logger(PasswordHasher.name);
+  private readonly workers: PoolWorker[] = [];
+  private readonly queue: PendingTask[] = [];
+  private nextId = 0;
+  private rejected = 0;
+  private closing = false;
+
+  compare(password: string, hash: string): Promise<boolean> {
+    return this.submit({ op: 'compare', password, hash });
+  }
+
+  hash(password: string, rounds = BCRYPT_ROUNDS): Promise<string> {
+    return this.submit({ op: 'hash', password, rounds });
+  }
+
+  // Reading the cost of a hash is instant: it skips the pool
+  needsRehash(hash: string): boolean {
+    try {
+      return bcrypt.getRounds(hash) !== BCRYPT_ROUNDS;
+    } catch {
+      return false;
+    }
+  }
+
+  stats(): Record<string, number> {
+    return {
+      workers: this.workers.length,
+      busy: this.workers.filter(poolWorker => poolWorker.current).length,
+      queued: this.queue.length,
+      rejected: this.rejected,
+      poolSize: POOL_SIZE,
+      queueLimit: QUEUE_LIMIT,
+    };
+  }
+
+  async onModuleDestroy() {
+    // Workers exiting from here are not failures: no error log and no respawn
+    this.closing = true;
+    for (const pending of this.queue.splice(0)) {
+      pending.reject(new ServiceUnavailableException('El servidor se está deteniendo'));
+    }
+    await Promise.all(this.workers.map(poolWorker => poolWorker.worker.terminate()));
+  }
+
+  private submit(task: HashTask): Promise<any> {
+    if (this.closing) {
+      return Promise.reject(new ServiceUnavailableException('El servidor se está deteniendo'));
+    }
+
+    // Backpressure: with the queue full, reject instead of piling up requests without bound
+    if (this.queue.length >= QUEUE_LIMIT) {
+      this.rejected++;
+      return Promise.reject(
+        new ServiceUnavailableException('Demasiados inicios de sesión simultáneos. Inténtalo de nuevo en unos segundos.'),
+      );
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, task, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  private dispatch(): void {
+    if (this.closing) return;
+
+    while (this.queue.length > 0) {
+      let poolWorker = this.workers.find(candidate => !candidate.current);
+      if (!poolWorker && this.workers.length < POOL_SIZE) {
+        poolWorker = this.spawn();
+      }
+      if (!poolWorker) return;
+
+      const pending = this.queue.shift();
+      poolWorker.current = pending;
+      poolWorker.worker.postMessage({ id: pending.id, ...pending.task });
+    }
+  }
+
+  private spawn(): PoolWorker {
+    // Under ts-node the thread loads the .ts file; once compiled, the .js from dist
+    const isTs = __filename.endsWith('.ts');
+    const worker = new Worker(join(__dirname, `password-hasher.worker.${isTs ? 'ts' : 'js'}`), {
+      execArgv: isTs ? ['-r', 'ts-node/register'] : undefined,
+    });
+    worker.unref();
+
+    const poolWorker: PoolWorker = { worker, current: null };
+
+    worker.on('message', ({ id, result, error }) => {
+      const pending = poolWorker.current;
+      if (!pending || pending.id !== id) return;
+
+      poolWorker.current = null;
+      if (error) {
+        pending.reject(new Error(error));
+      } else {
+        pending.resolve(result);
+      }
+      this.dispatch();
+    });
+
+    // A dead thread fails its current task and is replaced on the next dispatch
+    const fail = (error: Error) => {
+      this.workers.splice(this.workers.indexOf(poolWorker), 1);
+      if (poolWorker.current) {
+        poolWorker.current.reject(error);
+        poolWorker.current = null;
+      }
+      if (this.closing) return;
+
+      this.logger.error(`Password hashing worker failed: ${error.message}`);
+      this.dispatch();
+    };
+    worker.on('error', fail);
+    worker.on('exit', code => {
+      if (this.workers.includes(poolWorker)) {
+        fail(new Error(`worker exited with code ${code}`));
+      }
+    });
+
+    this.workers.push(poolWorker);
+    return poolWorker;
+  }
+}
@@ -0,0 +1,12 @@
+import { parentPort } from 'worker_threads';
+import * as bcrypt from 'bcryptjs';
+
+// PasswordHasher pool thread: bcrypt off the main event loop
+parentPort.on('message', async ({ id, op, password, hash, rounds }) => {
+  try {
+    const result = op === 'compare' ? await bcrypt.compare(password, hash) : await bcrypt.hash(password, rounds);
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
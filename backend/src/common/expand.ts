@@ -0,0 +1,20 @@
+import { BadRequestException } from '@nestjs/common';
+
+// ?expand=priest,parish → relaciones que cargar tras una escritura, solo de entre las permitidas
+export function parseExpand(expand: string | undefined, allowed: readonly string[]): string[] {
+  if (!expand) return [];
+
+  const relations = expand.split(',').map(relation => relation.trim()).filter(Boolean);
+  const invalid = relations.filter(relation => !allowed.includes(relation));
+
+  if (invalid.length) {
+    throw new BadRequestException(`expand inválido: ${invalid.join(', ')}. Valores permitidos: ${allowed.join(', ')}`);
+  }
+
+  // Una relación anidada (confessionBand.priest) necesita también la de primer nivel
+  const withParents = relations.flatMap(relation =>
+    relation.split('.').map((_, index, parts) => parts.slice(0, index + 1).join('.')),
+  );
+
+  return [...new Set(withParents)];
+}
@@ -0,0 +1,154 @@
+import { Inject, Injectable } from '@nestjs/common';
+import { createHash } from 'crypto';
+
+export const AVAILABILITY_CACHE_STORE = 'AVAILABILITY_CACHE_STORE';
+
+// Lo que identifica una consulta de disponibilidad
+export interface AvailabilityQuery {
+  parishId?: string;
+  startDate?: string;
+  endDate?: string;
+  cursor?: string;
+  limit?: number;
+}
+
+// Almacén intercambiable: en memoria por defecto; una implementación compartida
+// (p. ej. Redis) permite invalidar entre varias instancias
+export interface AvailabilityCacheStore {
+  get(key: string): Promise<unknown | undefined>;
+  set(key: string, value: unknown, ttlMs: number): Promise<void>;
+  deleteWhere(predicate: (key: string) => boolean): Promise<number>;
+  stats?(): Record<string, number>;
+}
+
+// LRU acotado en número de entradas, con caducidad por entrada
+export class LruAvailabilityStore implements AvailabilityCacheStore {
+  private entries = new Map<string, { value: unknown; expiresAt: number }>();
+  private evictions = 0;
+
+  constructor(private readonly maxEntries = 500) {}
+
+  async get(key: string): Promise<unknown | undefined> {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    // Reinsertar para marcarla como la más reciente
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  async set(key: string, value: unknown, ttlMs: number): Promise<void> {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+  }
+
+  async deleteWhere(predicate: (key: string) => boolean): Promise<number> {
+    let deleted = 0;
+    for (const key of [...this.entries.keys()]) {
+      if (predicate(key)) {
+        this.entries.delete(key);
+        deleted++;
+      }
+    }
+    return deleted;
+  }
+
+  stats(): Record<string, number> {
+    return { size: this.entries.size, maxEntries: this.maxEntries, evictions: this.evictions };
+  }
+}
+
+@Injectable()
+export class AvailabilityCache {
+  // Acota lo que tarda en desaparecer una franja que ya empezó en las consultas sin ventana
+  private readonly ttlMs = parseInt(process.env.AVAILABILITY_CACHE_TTL_MS || '30000', 10);
+  private hits = 0;
+  private misses = 0;
+  private invalidations = 0;
+  // Versión de la disponibilidad: sube con cada cambio. El prefijo evita repetir ETags tras un reinicio
+  private readonly epoch = Date.now().toString(36);
+  private version = 0;
+
+  constructor(@Inject(AVAILABILITY_CACHE_STORE) private readonly store: AvailabilityCacheStore) {}
+
+  static key(query: AvailabilityQuery): string {
+    const hasWindow = !!(query.startDate && query.endDate);
+    return JSON.stringify({
+      parishId: query.parishId || null,
+      startDate: hasWindow ? new Date(query.startDate).toISOString() : null,
+      endDate: hasWindow ? new Date(query.endDate).toISOString() : null,
+      cursor: query.cursor || null,
+      limit: query.limit || null,
+    });
+  }
+
+  async getOrLoad<T>(query: AvailabilityQuery, load: () => Promise<T>): Promise<T> {
+    const key = AvailabilityCache.key(query);
+    const cached = await this.store.get(key);
+
+    if (cached !== undefined) {
+      this.hits++;
+      return cached as T;
+    }
+
+    this.misses++;
+    const version = this.version;
+    const value = await load();
+
+    // Si hubo un cambio mientras se consultaba, el resultado puede ser anterior: no se guarda
+    if (version === this.version) {
+      await this.store.set(key, value, this.ttlMs);
+    }
+    return value;
+  }
+
+  // ETag fuerte de una consulta: cambia con la versión y, sin ventana de fechas, con el paso del tiempo
+  etag(query: AvailabilityQuery): string {
+    const key = AvailabilityCache.key(query);
+    const hasWindow = !!(query.startDate && query.endDate);
+    const period = hasWindow ? 0 : Math.floor(Date.now() / this.ttlMs);
+    const digest = createHash('sha1').update(key).digest('base64url').slice(0, 16);
+
+    return `"${this.epoch}-${this.version}-${period}-${digest}"`;
+  }
+
+  // Elimina las consultas de esa parroquia (y las de todas las parroquias) cuya ventana toca [from, to]
+  async invalidate(parishId: string | null, from: Date, to: Date): Promise<void> {
+    this.version++;
+
+    const deleted = await this.store.deleteWhere(key => {
+      const entry = JSON.parse(key);
+      if (entry.parishId && entry.parishId !== parishId) return false;
+
+      const start = entry.startDate ? new Date(entry.startDate).getTime() : -Infinity;
+      const end = entry.endDate ? new Date(entry.endDate).getTime() : Infinity;
+      return start <= new Date(to).getTime() && end >= new Date(from).getTime();
+    });
+
+    this.invalidations += deleted;
+  }
+
+  stats(): Record<string, number> {
+    const lookups = this.hits + this.misses;
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups ? this.hits / lookups : 0,
+      invalidations: this.invalidations,
+      version: this.version,
+      ttlMs: this.ttlMs,
+      ...(this.store.stats ? this.store.stats() : {}),
+    };
+  }
+}
@@ -0,0 +1,18 @@
+import { Controller, MessageEvent, Query, Sse } from '@nestjs/common';
+import { Observable } from 'rxjs';
+import { BandEventsService } from './band-events.service';
+
+// Sin JwtAuthGuard: EventSource no puede enviar cabeceras y solo se publican plazas y estados
+@Controller('confession-bands')
+export class BandEventsController {
+  constructor(private readonly bandEventsService: BandEventsService) {}
+
+  // Una conexión por cliente en lugar de sondear public/available
+  @Sse('public/events')
+  streamBandEvents(
+    @Query('parishId') parishId?: string,
+    @Query('priestId') priestId?: string,
+  ): Observable<MessageEvent> {
+    return this.bandEventsService.stream({ parishId, priestId });
+  }
+}
@@ -0,0 +1,51 @@
+import { Injectable, MessageEvent } from '@nestjs/common';
+import { Observable, Subject, interval, merge } from 'rxjs';
+import { filter, map } from 'rxjs/operators';
+import { BandStatus } from '../entities/confession-band.entity';
+
+// Mantiene viva la conexión a través de proxies que cortan conexiones inactivas
+const HEARTBEAT_MS = parseInt(process.env.BAND_EVENTS_HEARTBEAT_MS || '25000', 10);
+
+export const BAND_REMOVED = 'removed';
+
+// Cambio de disponibilidad de una franja, tal y como se envía al cliente
+export interface BandDelta {
+  bandId: string;
+  currentBookings: number;
+  status: BandStatus | typeof BAND_REMOVED;
+}
+
+// Parroquia y sacerdote solo sirven para filtrar las suscripciones; no se envían
+export interface BandChange extends BandDelta {
+  parishId: string;
+  priestId: string;
+}
+
+export interface BandEventsFilter {
+  parishId?: string;
+  priestId?: string;
+}
+
+@Injectable()
+export class BandEventsService {
+  private readonly changes = new Subject<BandChange>();
+
+  publish(change: BandChange): void {
+    this.changes.next(change);
+  }
+
+  stream(filters: BandEventsFilter = {}): Observable<MessageEvent> {
+    const deltas = this.changes.pipe(
+      filter(change => !filters.parishId || change.parishId === filters.parishId),
+      filter(change => !filters.priestId || change.priestId === filters.priestId),
+      map(({ bandId, currentBookings, status }): MessageEvent => ({
+        type: 'band',
+        data: { bandId, currentBookings, status },
+      })),
+    );
+
+    const heartbeat = interval(HEARTBEAT_MS).pipe(map((): MessageEvent => ({ type: 'ping', data: '' })));
+
+    return merge(deltas, heartbeat);
+  }
+}
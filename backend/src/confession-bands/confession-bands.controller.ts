@@ -10,15 +10,19 @@ import {
   Request,
   Query,
   ParseUUIDPipe,
+  Res,
 } from '@nestjs/common';
-import { ConfessionBandsService } from './confession-bands.service';
+import { BAND_EXPANDABLE, ConfessionBandsService } from './confession-bands.service';
 import { CreateBandDto } from './dto/create-band.dto';
 import { UpdateBandDto } from './dto/update-band.dto';
 import { BookBandDto } from './dto/book-band.dto';
+import { JoinWaitlistDto } from './dto/join-waitlist.dto';
+import { ParseBandIdPipe } from './parse-band-id.pipe';
 import { JwtAuthGuard } from '../auth/jwt-auth.guard';
 import { RolesGuard } from '../auth/roles.guard';
 import { Roles } from '../auth/roles.decorator';
 import { BandStatus } from '../entities/confession-band.entity';
+import { parseExpand } from '../common/expand';
 
 @Controller('confession-bands')
 @UseGuards(JwtAuthGuard)
@@ -30,25 +34,46 @@ export class ConfessionBandsController {
   @Post()
   @UseGuards(RolesGuard)
   @Roles('priest')
-  create(@Body() createBandDto: CreateBandDto, @Request() req) {
-    return this.confessionBandsService.create(createBandDto, req.user.id);
+  create(@Body() createBandDto: CreateBandDto, @Request() req, @Query('expand') expand?: string) {
+    return this.confessionBandsService.create(createBandDto, req.user.id, parseExpand(expand, BAND_EXPANDABLE));
   }
 
   @Get('my-bands')
   @UseGuards(RolesGuard)
   @Roles('priest')
-  findMyBands(
+  async findMyBands(
     @Request() req,
+    @Res({ passthrough: true }) res,
     @Query('startDate') startDate?: string,
     @Query('endDate') endDate?: string,
+    @Query('view') view?: string,
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
   ) {
+    // view=summary: campos de la franja y recuentos por estado; el detalle, en my-bands/:id
+    if (view === 'summary') {
+      const page = await this.confessionBandsService.findAllSummary(
+        req.user.id,
+        startDate,
+        endDate,
+        cursor,
+        limit ? parseInt(limit, 10) : undefined,
+      );
+
+      if (page.nextCursor) {
+        res.setHeader('X-Next-Cursor', page.nextCursor);
+      }
+
+      return page.items;
+    }
+
     return this.confessionBandsService.findAll(req.user.id, startDate, endDate);
   }
 
   @Get('my-bands/:id')
   @UseGuards(RolesGuard)
   @Roles('priest')
-  findOne(@Param('id', ParseUUIDPipe) id: string, @Request() req) {
+  findOne(@Param('id', ParseBandIdPipe) id: string, @Request() req) {
     return this.confessionBandsService.findOne(id, req.user.id);
   }
 
@@ -56,17 +81,18 @@ export class ConfessionBandsController {
   @UseGuards(RolesGuard)
   @Roles('priest')
   update(
-    @Param('id', ParseUUIDPipe) id: string, 
+    @Param('id', ParseBandIdPipe) id: string, 
     @Body() updateBandDto: UpdateBandDto,
     @Request() req,
+    @Query('expand') expand?: string,
   ) {
-    return this.confessionBandsService.update(id, updateBandDto, req.user.id);
+    return this.confessionBandsService.update(id, updateBandDto, req.user.id, parseExpand(expand, BAND_EXPANDABLE));
   }
 
   @Delete('my-bands/:id')
   @UseGuards(RolesGuard)
   @Roles('priest')
-  remove(@Param('id', ParseUUIDPipe) id: string, @Request() req) {
+  remove(@Param('id', ParseBandIdPipe) id: string, @Request() req) {
     return this.confessionBandsService.remove(id, req.user.id);
   }
 
@@ -74,11 +100,12 @@ export class ConfessionBandsController {
   @UseGuards(RolesGuard)
   @Roles('priest')
   changeStatus(
-    @Param('id', ParseUUIDPipe) id: string,
+    @Param('id', ParseBandIdPipe) id: string,
     @Body('status') status: BandStatus,
     @Request() req,
+    @Query('expand') expand?: string,
   ) {
-    return this.confessionBandsService.changeStatus(id, status, req.user.id);
+    return this.confessionBandsService.changeStatus(id, status, req.user.id, parseExpand(expand, BAND_EXPANDABLE));
   }
 
   // ===== FAITHFUL ENDPOINTS =====
@@ -87,11 +114,14 @@ export class ConfessionBandsController {
   @UseGuards(RolesGuard)
   @Roles('faithful')
   getAvailableBands(
+    @Res({ passthrough: true }) res,
     @Query('startDate') startDate?: string,
     @Query('endDate') endDate?: string,
     @Query('parishId') parishId?: string,
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
   ) {
-    return this.confessionBandsService.getAvailableBands(startDate, endDate, parishId);
+    return this.availablePage(res, startDate, endDate, parishId, cursor, limit);
   }
 
   @Post('book')
@@ -115,14 +145,51 @@ export class ConfessionBandsController {
     return this.confessionBandsService.cancelBooking(confessionId, req.user.id);
   }
 
-  // ===== PUBLIC ENDPOINTS (for display without booking) =====
+  // Lista de espera de franjas llenas: al cancelarse una reserva, la plaza pasa al primero de la cola
+  @Post('waitlist')
+  @UseGuards(RolesGuard)
+  @Roles('faithful')
+  joinWaitlist(@Body() joinWaitlistDto: JoinWaitlistDto, @Request() req) {
+    return this.confessionBandsService.joinWaitlist(joinWaitlistDto, req.user.id);
+  }
 
-  @Get('public/available')
-  getPublicAvailableBands(
-    @Query('startDate') startDate?: string,
-    @Query('endDate') endDate?: string,
-    @Query('parishId') parishId?: string,
-  ) {
-    return this.confessionBandsService.getAvailableBands(startDate, endDate, parishId);
+  @Get('my-waitlist')
+  @UseGuards(RolesGuard)
+  @Roles('faithful')
+  getMyWaitlist(@Request() req) {
+    return this.confessionBandsService.getFaithfulWaitlist(req.user.id);
+  }
+
+  @Delete('waitlist/:id')
+  @UseGuards(RolesGuard)
+  @Roles('faithful')
+  leaveWaitlist(@Param('id', ParseUUIDPipe) entryId: string, @Request() req) {
+    return this.confessionBandsService.leaveWaitlist(entryId, req.user.id);
+  }
+
+  // ===== ADMIN ENDPOINTS =====
+
+  @Get('availability/cache-stats')
+  @UseGuards(RolesGuard)
+  @Roles('admin')
+  getAvailabilityCacheStats() {
+    return this.confessionBandsService.getAvailabilityCacheStats();
+  }
+
+  // La respuesta sigue siendo un array; la siguiente página se indica en X-Next-Cursor
+  private async availablePage(res, startDate?: string, endDate?: string, parishId?: string, cursor?: string, limit?: string) {
+    const page = await this.confessionBandsService.getAvailableBands(
+      startDate,
+      endDate,
+      parishId,
+      cursor,
+      limit ? parseInt(limit, 10) : undefined,
+    );
+
+    if (page.nextCursor) {
+      res.setHeader('X-Next-Cursor', page.nextCursor);
+    }
+
+    return page.items;
   }
 }
\ No newline at end of file
@@ -2,13 +2,30 @@ import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { ConfessionBandsService } from './confession-bands.service';
 import { ConfessionBandsController } from './confession-bands.controller';
+import { BandEventsController } from './band-events.controller';
+import { PublicBandsController } from './public-bands.controller';
+import { BandEventsService } from './band-events.service';
 import { ConfessionBand } from '../entities/confession-band.entity';
 import { Confession } from '../entities/confession.entity';
+import { WaitlistEntry } from '../entities/waitlist-entry.entity';
+import { ArchivedConfession } from '../entities/archived-confession.entity';
+import { ConfessionArchiveService } from '../confessions/confession-archive.service';
+import { AVAILABILITY_CACHE_STORE, AvailabilityCache, LruAvailabilityStore } from './availability-cache';
 
 @Module({
-  imports: [TypeOrmModule.forFeature([ConfessionBand, Confession])],
-  controllers: [ConfessionBandsController],
-  providers: [ConfessionBandsService],
-  exports: [ConfessionBandsService],
+  imports: [TypeOrmModule.forFeature([ConfessionBand, Confession, WaitlistEntry, ArchivedConfession])],
+  controllers: [ConfessionBandsController, PublicBandsController, BandEventsController],
+  providers: [
+    ConfessionBandsService,
+    BandEventsService,
+    AvailabilityCache,
+    // Aquí y no en ConfessionsModule: "mis reservas" también lee el archivo, y ConfessionsModule ya importa este módulo
+    ConfessionArchiveService,
+    {
+      provide: AVAILABILITY_CACHE_STORE,
+      useFactory: () => new LruAvailabilityStore(parseInt(process.env.AVAILABILITY_CACHE_MAX_ENTRIES || '500', 10)),
+    },
+  ],
+  exports: [ConfessionBandsService, ConfessionArchiveService],
 })
 export class ConfessionBandsModule {}
\ No newline at end of file
@@ -1,11 +1,223 @@
 import { Injectable, NotFoundException, BadRequestException, ForbiddenException } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository, Between, LessThan, MoreThan } from 'typeorm';
+import { isUUID } from 'class-validator';
+import { Repository, Between, LessThan, MoreThan, EntityManager, QueryFailedError } from 'typeorm';
 import { ConfessionBand, BandStatus, RecurrenceType } from '../entities/confession-band.entity';
 import { Confession, ConfessionStatus } from '../entities/confession.entity';
 import { CreateBandDto } from './dto/create-band.dto';
 import { UpdateBandDto } from './dto/update-band.dto';
 import { BookBandDto } from './dto/book-band.dto';
+import { JoinWaitlistDto } from './dto/join-waitlist.dto';
+import { WaitlistEntry, WaitlistStatus } from '../entities/waitlist-entry.entity';
+import { ArchivedConfession } from '../entities/archived-confession.entity';
+import { ConfessionArchiveService, archivedAsConfession } from '../confessions/confession-archive.service';
+import {
+  expandOccurrences,
+  isSeriesParent,
+  occurrenceId,
+  parseOccurrenceId,
+  recurrenceExceptions,
+  seriesEnd,
+  virtualOccurrence,
+} from './recurrence';
+import { AvailabilityCache } from './availability-cache';
+import { BAND_REMOVED, BandEventsService } from './band-events.service';
+
+// Relaciones que ?expand= puede pedir en las respuestas de escritura
+export const BAND_EXPANDABLE = ['priest', 'parish', 'confessions', 'confessions.faithful'] as const;
+
+// Violación de índice único en SQLite o PostgreSQL
+export function isUniqueViolation(error: unknown): boolean {
+  if (!(error instanceof QueryFailedError)) return false;
+  const driverError: any = (error as any).driverError || {};
+  return driverError.code === '23505' || /UNIQUE constraint failed/i.test(String(driverError.message || error.message));
+}
+
+export interface RemoveBandResult {
+  message: string;
+  cancelledConfessions: number;
+  detachedConfessions: number;
+  deletedBands: number;
+}
+
+// Paginación de franjas disponibles (keyset sobre startTime, id). Solo se pagina si se pide cursor
+// o limit: sin ellos la respuesta es la lista completa, como la esperan los clientes que no leen X-Next-Cursor
+export const AVAILABLE_PAGE_SIZE = 50;
+export const AVAILABLE_MAX_PAGE_SIZE = 100;
+
+// Solo los campos que muestra la interfaz del fiel
+export interface AvailableBandView {
+  id: string;
+  priestId: string;
+  parishId: string;
+  parentBandId: string;
+  startTime: Date;
+  endTime: Date;
+  status: BandStatus;
+  location: string;
+  notes: string;
+  maxCapacity: number;
+  currentBookings: number;
+  priest: { id: string; firstName: string; lastName: string } | null;
+  parish: { id: string; name: string; address: string; city: string } | null;
+}
+
+export interface AvailableBandsPage {
+  items: AvailableBandView[];
+  nextCursor: string | null;
+}
+
+// Vista resumida de "mis franjas": sin confesiones ni fieles, solo recuentos por estado.
+// Como available, solo se pagina si se pide cursor o limit
+export const SUMMARY_PAGE_SIZE = 100;
+export const SUMMARY_MAX_PAGE_SIZE = 500;
+// Franjas por consulta de recuentos: sin paginar, la lista IN superaría el límite de parámetros
+const SUMMARY_COUNT_BATCH_SIZE = 500;
+
+export type ConfessionCounts = Record<ConfessionStatus, number>;
+
+export interface BandSummary {
+  id: string;
+  priestId: string;
+  parishId: string;
+  parentBandId: string;
+  startTime: Date;
+  endTime: Date;
+  status: BandStatus;
+  location: string;
+  notes: string;
+  maxCapacity: number;
+  currentBookings: number;
+  isRecurrent: boolean;
+  recurrenceType: RecurrenceType;
+  confessionCounts: ConfessionCounts;
+}
+
+export interface BandSummaryPage {
+  items: BandSummary[];
+  nextCursor: string | null;
+}
+
+function emptyConfessionCounts(): ConfessionCounts {
+  return Object.values(ConfessionStatus).reduce((counts, status) => ({ ...counts, [status]: 0 }), {} as ConfessionCounts);
+}
+
+function toBandSummary(band: ConfessionBand, counts?: ConfessionCounts): BandSummary {
+  return {
+    id: band.id,
+    priestId: band.priestId,
+    parishId: band.parishId,
+    parentBandId: band.parentBandId,
+    startTime: band.startTime,
+    endTime: band.endTime,
+    status: band.status,
+    location: band.location,
+    notes: band.notes,
+    maxCapacity: band.maxCapacity,
+    currentBookings: band.currentBookings,
+    isRecurrent: band.isRecurrent,
+    recurrenceType: band.recurrenceType,
+    confessionCounts: counts || emptyConfessionCounts(),
+  };
+}
+
+export interface WaitlistPosition {
+  id: string;
+  bandId: string;
+  status: WaitlistStatus;
+  // Posición en la cola (1 = la siguiente plaza libre es suya); null si ya no espera
+  position: number | null;
+  confessionId: string | null;
+}
+
+interface BandInterval {
+  startTime: Date;
+  endTime: Date;
+}
+
+// Las ocurrencias que empiezan antes del intervalo pueden seguir abiertas dentro de él
+const OVERLAP_LOOKBACK_MS = 24 * 60 * 60 * 1000;
+
+// Sin ventana ni tamaño de página, las series se expanden como mucho hasta aquí
+const UNBOUNDED_EXPANSION_HORIZON_MS = 180 * 24 * 60 * 60 * 1000;
+
+function compareIntervals(a: BandInterval, b: BandInterval): number {
+  return new Date(a.startTime).getTime() - new Date(b.startTime).getTime();
+}
+
+// Recorrido único de dos listas ordenadas por inicio: ¿algún intervalo de `a` pisa alguno de `b`?
+function hasCrossOverlap(a: BandInterval[], b: BandInterval[]): boolean {
+  let i = 0;
+  let j = 0;
+  let endA = -Infinity;
+  let endB = -Infinity;
+
+  while (i < a.length || j < b.length) {
+    if (j >= b.length || (i < a.length && compareIntervals(a[i], b[j]) <= 0)) {
+      if (new Date(a[i].startTime).getTime() < endB) return true;
+      endA = Math.max(endA, new Date(a[i].endTime).getTime());
+      i++;
+    } else {
+      if (new Date(b[j].startTime).getTime() < endA) return true;
+      endB = Math.max(endB, new Date(b[j].endTime).getTime());
+      j++;
+    }
+  }
+
+  return false;
+}
+
+function toAvailableBandView(band: ConfessionBand): AvailableBandView {
+  return {
+    id: band.id,
+    priestId: band.priestId,
+    parishId: band.parishId,
+    parentBandId: band.parentBandId,
+    startTime: band.startTime,
+    endTime: band.endTime,
+    status: band.status,
+    location: band.location,
+    notes: band.notes,
+    maxCapacity: band.maxCapacity,
+    currentBookings: band.currentBookings,
+    priest: band.priest ? { id: band.priest.id, firstName: band.priest.firstName, lastName: band.priest.lastName } : null,
+    parish: band.parish
+      ? { id: band.parish.id, name: band.parish.name, address: band.parish.address, city: band.parish.city }
+      : null,
+  };
+}
+
+// Desempate de la paginación: el uuid de la fila o, en una ocurrencia virtual, el de su serie.
+// (startTime, uuid) es único porque una serie no repite inicio y compara igual en SQL y aquí
+function keysetId(band: { id: string }): string {
+  const occurrence = parseOccurrenceId(band.id);
+  return occurrence ? occurrence.parentId : band.id;
+}
+
+// Orden de la paginación: startTime y, a igualdad, keysetId
+function compareKeyset(a: { startTime: Date; id: string }, b: { startTime: Date; id: string }): number {
+  const diff = new Date(a.startTime).getTime() - new Date(b.startTime).getTime();
+  if (diff !== 0) return diff;
+
+  const [idA, idB] = [keysetId(a), keysetId(b)];
+  return idA < idB ? -1 : idA > idB ? 1 : 0;
+}
+
+export function encodeCursor(band: { startTime: Date; id: string }): string {
+  return Buffer.from(`${new Date(band.startTime).toISOString()}|${keysetId(band)}`).toString('base64url');
+}
+
+export function decodeCursor(cursor: string): { startTime: Date; id: string } {
+  const [start, id] = Buffer.from(cursor, 'base64url').toString('utf8').split('|');
+  const startTime = new Date(start);
+
+  // Solo uuids: el cursor se compara con columnas uuid en PostgreSQL
+  if (!isUUID(id) || isNaN(startTime.getTime())) {
+    throw new BadRequestException('Cursor de paginación inválido');
+  }
+
+  return { startTime, id };
+}
 
 @Injectable()
 export class ConfessionBandsService {
@@ -14,11 +226,18 @@ export class ConfessionBandsService {
     private bandsRepository: Repository<ConfessionBand>,
     @InjectRepository(Confession)
     private confessionsRepository: Repository<Confession>,
+    @InjectRepository(WaitlistEntry)
+    private waitlistRepository: Repository<WaitlistEntry>,
+    @InjectRepository(ArchivedConfession)
+    private archiveRepository: Repository<ArchivedConfession>,
+    private availabilityCache: AvailabilityCache,
+    private bandEvents: BandEventsService,
+    private confessionArchiveService: ConfessionArchiveService,
   ) {}
 
   // ===== CRUD OPERATIONS FOR PRIESTS =====
 
-  async create(createBandDto: CreateBandDto, priestId: string): Promise<ConfessionBand> {
+  async create(createBandDto: CreateBandDto, priestId: string, expand: string[] = []): Promise<ConfessionBand> {
     const startTime = new Date(createBandDto.startTime);
     const endTime = new Date(createBandDto.endTime);
 
@@ -31,9 +250,6 @@ export class ConfessionBandsService {
       throw new BadRequestException('La hora de inicio debe ser en el futuro');
     }
 
-    // Verificar solapamientos
-    await this.checkForOverlaps(priestId, startTime, endTime);
-
     const band = this.bandsRepository.create({
       ...createBandDto,
       startTime,
@@ -43,14 +259,15 @@ export class ConfessionBandsService {
       recurrenceEndDate: createBandDto.recurrenceEndDate ? new Date(createBandDto.recurrenceEndDate) : null,
     });
 
-    const savedBand = await this.bandsRepository.save(band);
+    // Verificar solapamientos (de una serie, todas sus ocurrencias en una sola pasada)
+    await this.checkForOverlaps(priestId, this.bandIntervals(band));
 
-    // Si es recurrente, crear las repeticiones
-    if (createBandDto.isRecurrent && createBandDto.recurrenceType !== RecurrenceType.NONE) {
-      await this.createRecurrentBands(savedBand);
-    }
+    // Si es recurrente, la regla queda en la franja padre: las repeticiones se expanden
+    // al consultar y solo se materializan al reservarlas o editarlas
+    const savedBand = await this.bandsRepository.save(band);
+    await this.invalidateAvailability(savedBand);
 
-    return this.findOne(savedBand.id, priestId);
+    return this.expandBand(savedBand, expand);
   }
 
   async findAll(priestId: string, startDate?: string, endDate?: string): Promise<ConfessionBand[]> {
@@ -60,14 +277,83 @@ export class ConfessionBandsService {
       whereConditions.startTime = Between(new Date(startDate), new Date(endDate));
     }
 
-    return this.bandsRepository.find({
+    const bands = await this.bandsRepository.find({
       where: whereConditions,
       relations: ['confessions', 'confessions.faithful'],
       order: { startTime: 'ASC' },
     });
+
+    // Añadir las ocurrencias virtuales de sus series en el mismo intervalo
+    const from = startDate && endDate ? new Date(startDate) : new Date(0);
+    const to = startDate && endDate ? new Date(endDate) : null;
+    const occurrences = await this.expandRecurrences(from, to, { priestId });
+
+    return this.mergeByStartTime(bands, occurrences);
+  }
+
+  async findAllSummary(
+    priestId: string,
+    startDate?: string,
+    endDate?: string,
+    cursor?: string,
+    limit?: number,
+  ): Promise<BandSummaryPage> {
+    const paged = !!(cursor || limit);
+    const pageSize = paged ? Math.min(Math.max(limit || SUMMARY_PAGE_SIZE, 1), SUMMARY_MAX_PAGE_SIZE) : Infinity;
+    const after = cursor ? decodeCursor(cursor) : null;
+    const hasWindow = !!(startDate && endDate);
+
+    // Solo columnas de la franja: ni confesiones ni fieles
+    const query = this.bandsRepository
+      .createQueryBuilder('band')
+      .where('band.priestId = :priestId', { priestId });
+
+    if (hasWindow) {
+      query.andWhere('band.startTime BETWEEN :startDate AND :endDate', {
+        startDate: new Date(startDate),
+        endDate: new Date(endDate),
+      });
+    }
+
+    if (after) {
+      query.andWhere('(band.startTime > :afterStart OR (band.startTime = :afterStart AND band.id > :afterId))', {
+        afterStart: after.startTime,
+        afterId: after.id,
+      });
+    }
+
+    query.orderBy('band.startTime', 'ASC').addOrderBy('band.id', 'ASC');
+    if (paged) {
+      query.limit(pageSize + 1);
+    }
+    const rows = await query.getMany();
+
+    const hasMoreRows = rows.length > pageSize;
+    const bands = rows.slice(0, pageSize);
+
+    // Ocurrencias virtuales (sin confesiones todavía), solo hasta donde llega esta página
+    const from = after ? after.startTime : hasWindow ? new Date(startDate) : new Date(0);
+    const to = hasMoreRows ? bands[bands.length - 1].startTime : hasWindow ? new Date(endDate) : null;
+    const occurrences = (await this.expandRecurrences(from, to, { priestId }, [], paged ? pageSize + 2 : undefined))
+      .filter(occurrence => !after || compareKeyset(occurrence, after) > 0);
+
+    const merged = [...bands, ...occurrences].sort(compareKeyset);
+    const items = merged.slice(0, pageSize);
+    const hasMore = hasMoreRows || merged.length > pageSize;
+
+    const counts = await this.countConfessionsByStatus(bands.map(band => band.id));
+
+    return {
+      items: items.map(band => toBandSummary(band, counts.get(band.id))),
+      nextCursor: hasMore ? encodeCursor(items[items.length - 1]) : null,
+    };
   }
 
   async findOne(id: string, priestId: string): Promise<ConfessionBand> {
+    if (parseOccurrenceId(id)) {
+      return this.findOccurrence(id, priestId);
+    }
+
     const band = await this.bandsRepository.findOne({
       where: { id, priestId },
       relations: ['confessions', 'confessions.faithful', 'priest', 'parish'],
@@ -80,7 +366,30 @@ export class ConfessionBandsService {
     return band;
   }
 
+  // Solo las columnas de la franja, para validar antes de escribir
+  private async findOwnBand(id: string, priestId: string): Promise<ConfessionBand> {
+    const band = await this.bandsRepository.findOne({ where: { id, priestId } });
+
+    if (!band) {
+      throw new NotFoundException('Franja de confesión no encontrada');
+    }
+
+    return band;
+  }
+
+  // Una escritura devuelve lo que acaba de escribir; las relaciones solo se cargan si se piden
+  private async expandBand(band: ConfessionBand, expand: string[]): Promise<ConfessionBand> {
+    if (expand.length === 0) return band;
+
+    return this.bandsRepository.findOne({ where: { id: band.id }, relations: expand });
+  }
+
   async findOneById(id: string): Promise<ConfessionBand> {
+    // Una ocurrencia virtual solo se pide para reservarla: se materializa
+    if (parseOccurrenceId(id)) {
+      id = (await this.materializeOccurrence(id)).id;
+    }
+
     const band = await this.bandsRepository.findOne({
       where: { id },
       relations: ['confessions', 'confessions.faithful', 'priest', 'parish'],
@@ -93,8 +402,13 @@ export class ConfessionBandsService {
     return band;
   }
 
-  async update(id: string, updateBandDto: UpdateBandDto, priestId: string): Promise<ConfessionBand> {
-    const band = await this.findOne(id, priestId);
+  async update(id: string, updateBandDto: UpdateBandDto, priestId: string, expand: string[] = []): Promise<ConfessionBand> {
+    // Editar una ocurrencia virtual la convierte en una franja concreta de la serie
+    if (parseOccurrenceId(id)) {
+      id = (await this.materializeOccurrence(id, priestId)).id;
+    }
+
+    const band = await this.findOwnBand(id, priestId);
 
     // Si se actualiza horario, verificar solapamientos
     if (updateBandDto.startTime || updateBandDto.endTime) {
@@ -105,7 +419,7 @@ export class ConfessionBandsService {
         throw new BadRequestException('La hora de inicio debe ser anterior a la hora de fin');
       }
 
-      await this.checkForOverlaps(priestId, startTime, endTime, id);
+      await this.checkForOverlaps(priestId, this.bandIntervals(Object.assign(new ConfessionBand(), band, { startTime, endTime })), id);
     }
 
     // Verificar si hay reservas activas antes de permitir ciertos cambios
@@ -120,186 +434,330 @@ export class ConfessionBandsService {
     if (updateBandDto.recurrenceDays) updateData.recurrenceDays = JSON.stringify(updateBandDto.recurrenceDays);
 
     await this.bandsRepository.update(id, updateData);
-    return this.findOne(id, priestId);
-  }
+    const updated = Object.assign(new ConfessionBand(), band, updateData);
 
-  async remove(id: string, priestId: string): Promise<{ message: string }> {
-    const band = await this.findOne(id, priestId);
+    // Tanto el horario anterior como el nuevo dejan de ser válidos
+    await this.invalidateAvailability(band);
+    await this.invalidateAvailability(updated);
 
-    // Find all confessions associated with this band (regardless of status)
-    const associatedConfessions = await this.confessionsRepository.find({
-      where: { confessionBandId: id }
-    });
+    return this.expandBand(updated, expand);
+  }
 
-    // Handle associated confessions before deletion
-    if (associatedConfessions.length > 0) {
-      // Cancel active confessions and nullify the confessionBandId for all
-      for (const confession of associatedConfessions) {
-        if (confession.status === ConfessionStatus.BOOKED) {
-          // Cancel active bookings
-          await this.confessionsRepository.update(confession.id, {
-            status: ConfessionStatus.CANCELLED,
-            confessionBandId: null
-          });
-        } else {
-          // For other statuses (completed, cancelled, etc.), just remove the reference
-          await this.confessionsRepository.update(confession.id, {
-            confessionBandId: null
-          });
-        }
+  async remove(id: string, priestId: string): Promise<RemoveBandResult> {
+    if (parseOccurrenceId(id)) {
+      const occurrence = await this.findOccurrence(id, priestId);
+
+      // Ocurrencia sin materializar: basta con excluirla de la serie
+      if (occurrence.id === id) {
+        await this.addRecurrenceException(this.bandsRepository.manager, occurrence.parentBandId, occurrence.occurrenceStart);
+        await this.invalidateAvailability(occurrence);
+        this.bandEvents.publish({
+          bandId: id,
+          currentBookings: 0,
+          status: BAND_REMOVED,
+          parishId: occurrence.parishId,
+          priestId: occurrence.priestId,
+        });
+        return {
+          message: 'Instancia de franja recurrente eliminada exitosamente',
+          cancelledConfessions: 0,
+          detachedConfessions: 0,
+          deletedBands: 0,
+        };
       }
+      id = occurrence.id;
     }
 
-    // Si es parte de una serie recurrente, solo eliminar esta instancia
-    if (band.parentBandId) {
-      await this.bandsRepository.remove(band);
-      return { message: 'Instancia de franja recurrente eliminada exitosamente' };
-    }
+    const band = await this.bandsRepository.findOne({ where: { id, priestId } });
 
-    // Si es la franja padre de una serie recurrente, eliminar todas las instancias futuras
-    if (band.isRecurrent) {
-      // First handle confessions from child bands
-      const childBands = await this.bandsRepository.find({
-        where: {
-          parentBandId: id,
-          startTime: MoreThan(new Date())
-        }
-      });
+    if (!band) {
+      throw new NotFoundException('Franja de confesión no encontrada');
+    }
 
-      for (const childBand of childBands) {
-        const childConfessions = await this.confessionsRepository.find({
-          where: { confessionBandId: childBand.id }
+    // Si es la franja padre de una serie recurrente, también se eliminan todas las instancias futuras
+    const isSeries = band.isRecurrent && !band.parentBandId;
+    const now = new Date();
+    const bandFilter = isSeries
+      ? '("confessionBandId" = :id OR "confessionBandId" IN (SELECT id FROM confession_bands WHERE "parentBandId" = :id AND "startTime" > :now))'
+      : '"confessionBandId" = :id';
+
+    const removedIds = [id];
+    const result = await this.bandsRepository.manager.transaction(async manager => {
+      // Cancelar las reservas activas y soltar la referencia a la franja
+      const cancelled = await manager
+        .createQueryBuilder()
+        .update(Confession)
+        .set({ status: ConfessionStatus.CANCELLED, confessionBandId: null })
+        .where(bandFilter, { id, now })
+        .andWhere('status = :booked', { booked: ConfessionStatus.BOOKED })
+        .execute();
+
+      // El resto (completadas, canceladas, etc.) solo pierde la referencia
+      const detached = await manager
+        .createQueryBuilder()
+        .update(Confession)
+        .set({ confessionBandId: null })
+        .where(bandFilter, { id, now })
+        .execute();
+
+      let deletedChildren = 0;
+      if (isSeries) {
+        const futureChildren = await manager.find(ConfessionBand, {
+          select: ['id'],
+          where: { parentBandId: id, startTime: MoreThan(now) },
         });
+        removedIds.push(...futureChildren.map(child => child.id));
+
+        const children = await manager
+          .createQueryBuilder()
+          .delete()
+          .from(ConfessionBand)
+          .where('"parentBandId" = :id AND "startTime" > :now', { id, now })
+          .execute();
+        deletedChildren = children.affected || 0;
+
+        // Las instancias pasadas se conservan como franjas sueltas
+        await manager
+          .createQueryBuilder()
+          .update(ConfessionBand)
+          .set({ parentBandId: null })
+          .where('"parentBandId" = :id', { id })
+          .execute();
+      }
 
-        for (const confession of childConfessions) {
-          if (confession.status === ConfessionStatus.BOOKED) {
-            await this.confessionsRepository.update(confession.id, {
-              status: ConfessionStatus.CANCELLED,
-              confessionBandId: null
-            });
-          } else {
-            await this.confessionsRepository.update(confession.id, {
-              confessionBandId: null
-            });
-          }
-        }
+      // Una instancia eliminada no debe volver a expandirse desde la serie
+      if (band.parentBandId) {
+        await this.addRecurrenceException(manager, band.parentBandId, band.occurrenceStart || band.startTime);
       }
 
-      // Now delete the child bands
-      await this.bandsRepository.delete({
-        parentBandId: id,
-        startTime: MoreThan(new Date())
+      await manager.delete(ConfessionBand, { id });
+
+      return {
+        message: band.parentBandId
+          ? 'Instancia de franja recurrente eliminada exitosamente'
+          : 'Franja eliminada exitosamente',
+        cancelledConfessions: cancelled.affected || 0,
+        detachedConfessions: detached.affected || 0,
+        deletedBands: deletedChildren + 1,
+      };
+    });
+
+    await this.invalidateAvailability(band);
+    for (const bandId of removedIds) {
+      this.bandEvents.publish({
+        bandId,
+        currentBookings: 0,
+        status: BAND_REMOVED,
+        parishId: band.parishId,
+        priestId: band.priestId,
       });
     }
 
-    await this.bandsRepository.remove(band);
-    return { message: 'Franja eliminada exitosamente' };
+    return result;
   }
 
-  async changeStatus(id: string, status: BandStatus, priestId: string): Promise<ConfessionBand> {
-    const band = await this.findOne(id, priestId);
+  async changeStatus(id: string, status: BandStatus, priestId: string, expand: string[] = []): Promise<ConfessionBand> {
+    if (parseOccurrenceId(id)) {
+      id = (await this.materializeOccurrence(id, priestId)).id;
+    }
+
+    const band = await this.findOwnBand(id, priestId);
 
     if (status === BandStatus.CANCELLED && band.currentBookings > 0) {
       throw new BadRequestException('No se puede cancelar una franja que tiene reservas activas. Cancela las reservas primero.');
     }
 
     await this.bandsRepository.update(id, { status });
-    return this.findOne(id, priestId);
+    await this.invalidateAvailability(band);
+
+    const updated = Object.assign(new ConfessionBand(), band, { status });
+    this.notifyBandChanged(updated);
+    return this.expandBand(updated, expand);
   }
 
   // ===== BOOKING OPERATIONS FOR FAITHFUL =====
 
-  async getAvailableBands(startDate?: string, endDate?: string, parishId?: string): Promise<ConfessionBand[]> {
-    let whereConditions: any = {
-      status: BandStatus.AVAILABLE,
-      startTime: MoreThan(new Date()), // Solo futuras
-    };
+  async getAvailableBands(
+    startDate?: string,
+    endDate?: string,
+    parishId?: string,
+    cursor?: string,
+    limit?: number,
+  ): Promise<AvailableBandsPage> {
+    return this.availabilityCache.getOrLoad({ parishId, startDate, endDate, cursor, limit }, () =>
+      this.queryAvailableBands(startDate, endDate, parishId, cursor, limit),
+    );
+  }
 
-    if (startDate && endDate) {
-      whereConditions.startTime = Between(new Date(startDate), new Date(endDate));
-    }
+  // Vacía las consultas de disponibilidad en caché que cubren el horario de la franja (o de su serie)
+  async invalidateAvailability(band: ConfessionBand): Promise<void> {
+    if (!band) return;
 
-    if (parishId) {
-      whereConditions.parishId = parishId;
-    }
+    const to = isSeriesParent(band) ? seriesEnd(band) : band.endTime;
+    await this.availabilityCache.invalidate(band.parishId, band.startTime, to);
+  }
 
-    const bands = await this.bandsRepository.find({
-      where: whereConditions,
-      relations: ['priest', 'parish'],
-      order: { startTime: 'ASC' },
+  // Publica plazas y estado de la franja a los suscriptores de public/events (tras el commit)
+  notifyBandChanged(band: ConfessionBand): void {
+    if (!band) return;
+
+    this.bandEvents.publish({
+      bandId: band.id,
+      currentBookings: band.currentBookings,
+      status: band.status,
+      parishId: band.parishId,
+      priestId: band.priestId,
     });
+  }
 
-    // Filtrar solo las que tienen espacio disponible
-    return bands.filter(band => band.currentBookings < band.maxCapacity);
+  availabilityEtag(startDate?: string, endDate?: string, parishId?: string, cursor?: string, limit?: number): string {
+    return this.availabilityCache.etag({ parishId, startDate, endDate, cursor, limit });
   }
 
-  async bookBand(bookBandDto: BookBandDto, faithfulId: string): Promise<Confession> {
-    const band = await this.bandsRepository.findOne({
-      where: { id: bookBandDto.bandId, status: BandStatus.AVAILABLE },
-      relations: ['confessions'],
-    });
+  getAvailabilityCacheStats(): Record<string, number> {
+    return this.availabilityCache.stats();
+  }
 
-    if (!band) {
-      throw new NotFoundException('Franja de confesión no encontrada o no disponible');
+  private async queryAvailableBands(
+    startDate?: string,
+    endDate?: string,
+    parishId?: string,
+    cursor?: string,
+    limit?: number,
+  ): Promise<AvailableBandsPage> {
+    const paged = !!(cursor || limit);
+    const pageSize = paged ? Math.min(Math.max(limit || AVAILABLE_PAGE_SIZE, 1), AVAILABLE_MAX_PAGE_SIZE) : Infinity;
+    const after = cursor ? decodeCursor(cursor) : null;
+    const hasWindow = !!(startDate && endDate);
+
+    // Capacidad, ventana y página resueltas en SQL; de sacerdote y parroquia solo lo que se muestra
+    const query = this.bandsRepository
+      .createQueryBuilder('band')
+      .leftJoin('band.priest', 'priest')
+      .leftJoin('band.parish', 'parish')
+      .select([
+        'band.id', 'band.priestId', 'band.parishId', 'band.parentBandId', 'band.startTime', 'band.endTime',
+        'band.status', 'band.location', 'band.notes', 'band.maxCapacity', 'band.currentBookings',
+        'priest.id', 'priest.firstName', 'priest.lastName',
+        'parish.id', 'parish.name', 'parish.address', 'parish.city',
+      ])
+      .where('band.status = :available', { available: BandStatus.AVAILABLE })
+      .andWhere('band.currentBookings < band.maxCapacity');
+
+    if (hasWindow) {
+      query.andWhere('band.startTime BETWEEN :startDate AND :endDate', {
+        startDate: new Date(startDate),
+        endDate: new Date(endDate),
+      });
+    } else {
+      query.andWhere('band.startTime > :now', { now: new Date() }); // Solo futuras
     }
 
-    // Verificar capacidad
-    if (band.currentBookings >= band.maxCapacity) {
-      throw new BadRequestException('Esta franja ya está llena');
+    if (parishId) {
+      query.andWhere('band.parishId = :parishId', { parishId });
     }
 
-    // Verificar que el fiel no tenga ya una reserva en esta franja
-    const existingBooking = await this.confessionsRepository.findOne({
-      where: {
-        confessionBandId: band.id,
-        faithfulId,
-        status: ConfessionStatus.BOOKED,
-      },
-    });
+    if (after) {
+      query.andWhere('(band.startTime > :afterStart OR (band.startTime = :afterStart AND band.id > :afterId))', {
+        afterStart: after.startTime,
+        afterId: after.id,
+      });
+    }
 
-    if (existingBooking) {
-      throw new BadRequestException('Ya tienes una reserva en esta franja');
+    query.orderBy('band.startTime', 'ASC').addOrderBy('band.id', 'ASC');
+    if (paged) {
+      query.limit(pageSize + 1);
     }
+    const rows = await query.getMany();
 
-    // Crear la reserva
-    const confession = this.confessionsRepository.create({
-      faithfulId,
-      confessionBandId: band.id,
-      scheduledTime: bookBandDto.preferredTime ? new Date(bookBandDto.preferredTime) : band.startTime,
-      status: ConfessionStatus.BOOKED,
-      notes: bookBandDto.notes,
-      preparationNotes: bookBandDto.preparationNotes,
-    });
+    const hasMoreRows = rows.length > pageSize;
+    const bands = rows.slice(0, pageSize);
+
+    // Ocurrencias virtuales, solo hasta donde llega esta página
+    const from = after ? after.startTime : hasWindow ? new Date(startDate) : new Date();
+    const to = hasMoreRows ? bands[bands.length - 1].startTime : hasWindow ? new Date(endDate) : null;
+    const occurrences = (await this.expandRecurrences(from, to, { parishId }, ['priest', 'parish'], paged ? pageSize + 2 : undefined))
+      .filter(occurrence => !after || compareKeyset(occurrence, after) > 0);
+
+    const merged = [...bands, ...occurrences].sort(compareKeyset);
+    const items = merged.slice(0, pageSize);
+    const hasMore = hasMoreRows || merged.length > pageSize;
+
+    return {
+      items: items.map(toAvailableBandView),
+      nextCursor: hasMore ? encodeCursor(items[items.length - 1]) : null,
+    };
+  }
+
+  async bookBand(bookBandDto: BookBandDto, faithfulId: string): Promise<Confession> {
+    // Reservar una ocurrencia virtual crea antes su franja concreta
+    const bandId = parseOccurrenceId(bookBandDto.bandId)
+      ? (await this.materializeOccurrence(bookBandDto.bandId)).id
+      : bookBandDto.bandId;
+
+    const savedConfession = await this.bandsRepository.manager.transaction(async manager => {
+      if (!(await this.reserveSeat(manager, bandId))) {
+        const band = await manager.findOne(ConfessionBand, { where: { id: bandId } });
+
+        if (!band || band.status === BandStatus.CANCELLED) {
+          throw new NotFoundException('Franja de confesión no encontrada o no disponible');
+        }
 
-    const savedConfession = await this.confessionsRepository.save(confession);
+        throw new BadRequestException('Esta franja ya está llena');
+      }
+
+      const band = await manager.findOne(ConfessionBand, { where: { id: bandId } });
 
-    // Actualizar contador y estado de la franja
-    const newBookingCount = band.currentBookings + 1;
-    const newStatus = newBookingCount >= band.maxCapacity ? BandStatus.FULL : BandStatus.AVAILABLE;
+      // Crear la reserva; el índice único (franja, fiel, BOOKED) rechaza duplicados
+      // concurrentes y el rollback devuelve la plaza reservada
+      const confession = manager.create(Confession, {
+        faithfulId,
+        confessionBandId: band.id,
+        scheduledTime: bookBandDto.preferredTime ? new Date(bookBandDto.preferredTime) : band.startTime,
+        status: ConfessionStatus.BOOKED,
+        notes: bookBandDto.notes,
+        preparationNotes: bookBandDto.preparationNotes,
+      });
 
-    await this.bandsRepository.update(band.id, {
-      currentBookings: newBookingCount,
-      status: newStatus,
+      let saved: Confession;
+      try {
+        saved = await manager.save(confession);
+      } catch (error) {
+        if (isUniqueViolation(error)) {
+          throw new BadRequestException('Ya tienes una reserva en esta franja');
+        }
+        throw error;
+      }
+
+      // Quien reserva directamente deja de esperar en esta franja
+      await manager.update(
+        WaitlistEntry,
+        { confessionBandId: band.id, faithfulId, status: WaitlistStatus.WAITING },
+        { status: WaitlistStatus.LEFT },
+      );
+
+      return saved;
     });
 
-    return this.confessionsRepository.findOne({
+    const booked = await this.confessionsRepository.findOne({
       where: { id: savedConfession.id },
       relations: ['faithful', 'confessionBand', 'confessionBand.priest'],
     });
+    await this.invalidateAvailability(booked.confessionBand);
+    this.notifyBandChanged(booked.confessionBand);
+
+    return booked;
   }
 
   async cancelBooking(confessionId: string, faithfulId: string): Promise<{ message: string }> {
     const confession = await this.confessionsRepository.findOne({
       where: { id: confessionId, faithfulId, status: ConfessionStatus.BOOKED },
-      relations: ['confessionBand'],
     });
 
     if (!confession) {
       throw new NotFoundException('Reserva no encontrada');
     }
 
-    const band = confession.confessionBand;
-
     // Verificar que sea posible cancelar (ej: al menos 2 horas antes)
     const timeDiff = confession.scheduledTime.getTime() - new Date().getTime();
     const twoHoursInMs = 2 * 60 * 60 * 1000;
@@ -308,144 +766,471 @@ export class ConfessionBandsService {
       throw new BadRequestException('No se puede cancelar una reserva con menos de 2 horas de anticipación');
     }
 
-    // Actualizar estado de la confesión
-    await this.confessionsRepository.update(confessionId, {
-      status: ConfessionStatus.CANCELLED,
-    });
+    await this.bandsRepository.manager.transaction(async manager => {
+      // Solo la cancelación que cambia el estado libera la plaza (evita dobles decrementos)
+      const cancelled = await manager.update(
+        Confession,
+        { id: confessionId, status: ConfessionStatus.BOOKED },
+        { status: ConfessionStatus.CANCELLED },
+      );
 
-    // Actualizar contador y estado de la franja
-    const newBookingCount = Math.max(0, band.currentBookings - 1);
-    await this.bandsRepository.update(band.id, {
-      currentBookings: newBookingCount,
-      status: BandStatus.AVAILABLE, // Vuelve a estar disponible
+      if (!cancelled.affected) {
+        throw new NotFoundException('Reserva no encontrada');
+      }
+
+      // La plaza liberada pasa directamente al primero de la lista de espera
+      await this.releaseBookedSeat(manager, confession.confessionBandId);
     });
 
+    if (confession.confessionBandId) {
+      const band = await this.bandsRepository.findOne({ where: { id: confession.confessionBandId } });
+      await this.invalidateAvailability(band);
+      this.notifyBandChanged(band);
+    }
+
     return { message: 'Reserva cancelada exitosamente' };
   }
 
+  // Historial completo del fiel: también las reservas antiguas ya archivadas (índice por fiel y fecha)
   async getFaithfulBookings(faithfulId: string): Promise<Confession[]> {
-    return this.confessionsRepository.find({
+    const options = {
       where: { faithfulId },
       relations: ['confessionBand', 'confessionBand.priest', 'confessionBand.parish'],
-      order: { scheduledTime: 'ASC' },
+      order: { scheduledTime: 'ASC' as const },
+    };
+
+    // Sin ventana de fechas: el archivo solo se lee si guarda alguna fila, como en findOne y el historial
+    if (!this.confessionArchiveService.windowNeedsArchive()) {
+      return this.confessionsRepository.find(options);
+    }
+
+    const [archived, live] = await Promise.all([
+      this.archiveRepository.find(options),
+      this.confessionsRepository.find(options),
+    ]);
+
+    if (archived.length === 0) return live;
+
+    // Una reserva BOOKED antigua sigue en la tabla viva: se mezclan por fecha
+    return [...archived.map(archivedAsConfession), ...live].sort(
+      (a, b) => new Date(a.scheduledTime).getTime() - new Date(b.scheduledTime).getTime(),
+    );
+  }
+
+  // ===== WAITLIST FOR FULL BANDS =====
+
+  async joinWaitlist(joinWaitlistDto: JoinWaitlistDto, faithfulId: string): Promise<WaitlistPosition> {
+    // Una ocurrencia virtual no tiene reservas: nunca está llena
+    if (parseOccurrenceId(joinWaitlistDto.bandId)) {
+      throw new BadRequestException('La franja tiene plazas libres: resérvala directamente');
+    }
+
+    const band = await this.bandsRepository.findOne({ where: { id: joinWaitlistDto.bandId } });
+
+    if (!band || band.status === BandStatus.CANCELLED) {
+      throw new NotFoundException('Franja de confesión no encontrada o no disponible');
+    }
+
+    if (new Date(band.startTime) <= new Date()) {
+      throw new BadRequestException('No puedes unirte a la lista de espera de una franja que ya pasó');
+    }
+
+    if (band.status !== BandStatus.FULL) {
+      throw new BadRequestException('La franja tiene plazas libres: resérvala directamente');
+    }
+
+    const booked = await this.confessionsRepository.findOne({
+      where: { confessionBandId: band.id, faithfulId, status: ConfessionStatus.BOOKED },
+    });
+
+    if (booked) {
+      throw new BadRequestException('Ya tienes una reserva en esta franja');
+    }
+
+    const entry = await this.bandsRepository.manager.transaction(async manager => {
+      let saved: WaitlistEntry;
+      try {
+        saved = await manager.save(
+          manager.create(WaitlistEntry, {
+            confessionBandId: band.id,
+            faithfulId,
+            status: WaitlistStatus.WAITING,
+            joinedAt: new Date(),
+            notes: joinWaitlistDto.notes,
+            preparationNotes: joinWaitlistDto.preparationNotes,
+          }),
+        );
+      } catch (error) {
+        if (isUniqueViolation(error)) {
+          throw new BadRequestException('Ya estás en la lista de espera de esta franja');
+        }
+        throw error;
+      }
+
+      // Si se liberó una plaza entre la comprobación y el alta, la cola avanza ya
+      await this.promoteFromWaitlist(manager, band.id);
+      return saved;
     });
+
+    return this.waitlistPosition(await this.waitlistRepository.findOne({ where: { id: entry.id } }));
   }
 
-  // ===== UTILITY METHODS =====
+  async getFaithfulWaitlist(faithfulId: string): Promise<WaitlistPosition[]> {
+    const entries = await this.waitlistRepository.find({
+      where: { faithfulId, status: WaitlistStatus.WAITING },
+      order: { joinedAt: 'ASC' },
+    });
 
-  private async checkForOverlaps(priestId: string, startTime: Date, endTime: Date, excludeId?: string): Promise<void> {
-    let whereConditions: any = {
-      priestId,
+    return Promise.all(entries.map(entry => this.waitlistPosition(entry)));
+  }
+
+  async leaveWaitlist(entryId: string, faithfulId: string): Promise<{ message: string }> {
+    const left = await this.waitlistRepository.update(
+      { id: entryId, faithfulId, status: WaitlistStatus.WAITING },
+      { status: WaitlistStatus.LEFT },
+    );
+
+    if (!left.affected) {
+      throw new NotFoundException('No estás en esa lista de espera');
+    }
+
+    return { message: 'Has salido de la lista de espera' };
+  }
+
+  // Libera la plaza de una reserva cancelada y la entrega a la cabeza de la lista de espera,
+  // dentro de la transacción de la cancelación
+  async releaseBookedSeat(manager: EntityManager, bandId: string): Promise<number> {
+    if (!bandId) return 0;
+
+    // Sin plaza que liberar no hay nadie a quien promocionar
+    if (!(await this.releaseSeat(manager, bandId))) return 0;
+    return this.promoteFromWaitlist(manager, bandId);
+  }
+
+  private async waitlistPosition(entry: WaitlistEntry): Promise<WaitlistPosition> {
+    let position: number = null;
+
+    if (entry.status === WaitlistStatus.WAITING) {
+      const ahead = await this.waitlistRepository
+        .createQueryBuilder('entry')
+        .where('entry.confessionBandId = :bandId', { bandId: entry.confessionBandId })
+        .andWhere('entry.status = :waiting', { waiting: WaitlistStatus.WAITING })
+        .andWhere('(entry.joinedAt < :joinedAt OR (entry.joinedAt = :joinedAt AND entry.id < :id))', {
+          joinedAt: entry.joinedAt,
+          id: entry.id,
+        })
+        .getCount();
+      position = ahead + 1;
+    }
+
+    return {
+      id: entry.id,
+      bandId: entry.confessionBandId,
+      status: entry.status,
+      position,
+      confessionId: entry.confessionId || null,
     };
+  }
 
-    if (excludeId) {
-      whereConditions = {
-        ...whereConditions,
-        id: { $ne: excludeId },
-      };
+  // Mientras haya plaza libre, la cabeza de la cola pasa a tener una reserva BOOKED
+  private async promoteFromWaitlist(manager: EntityManager, bandId: string): Promise<number> {
+    let promoted = 0;
+
+    for (;;) {
+      const head = await manager
+        .createQueryBuilder(WaitlistEntry, 'entry')
+        .where('entry.confessionBandId = :bandId', { bandId })
+        .andWhere('entry.status = :waiting', { waiting: WaitlistStatus.WAITING })
+        .orderBy('entry.joinedAt', 'ASC')
+        .addOrderBy('entry.id', 'ASC')
+        .getOne();
+
+      if (!head) break;
+
+      // Reclamar la cabeza; si otra cancelación se adelantó, pasar a la siguiente
+      const claimed = await manager.update(
+        WaitlistEntry,
+        { id: head.id, status: WaitlistStatus.WAITING },
+        { status: WaitlistStatus.PROMOTED },
+      );
+      if (!claimed.affected) continue;
+
+      // Quien ya tiene reserva en la franja sale de la cola sin ocupar otra plaza
+      const booked = await manager.findOne(Confession, {
+        where: { confessionBandId: bandId, faithfulId: head.faithfulId, status: ConfessionStatus.BOOKED },
+      });
+      if (booked) {
+        await manager.update(WaitlistEntry, { id: head.id }, { status: WaitlistStatus.LEFT });
+        continue;
+      }
+
+      if (!(await this.reserveSeat(manager, bandId))) {
+        // Sin plaza libre: la entrada conserva su sitio
+        await manager.update(WaitlistEntry, { id: head.id }, { status: WaitlistStatus.WAITING });
+        break;
+      }
+
+      const band = await manager.findOne(ConfessionBand, { where: { id: bandId } });
+      const confession = await manager.save(
+        manager.create(Confession, {
+          faithfulId: head.faithfulId,
+          confessionBandId: bandId,
+          scheduledTime: band.startTime,
+          status: ConfessionStatus.BOOKED,
+          notes: head.notes,
+          preparationNotes: head.preparationNotes,
+        }),
+      );
+
+      await manager.update(WaitlistEntry, { id: head.id }, { confessionId: confession.id });
+      promoted++;
+    }
+
+    return promoted;
+  }
+
+  // ===== UTILITY METHODS =====
+
+  // Reservar plaza: incremento condicional y paso a FULL en una sola sentencia,
+  // así dos reservas simultáneas nunca superan maxCapacity. También la usa ConfessionsService.create
+  async reserveSeat(manager: EntityManager, bandId: string): Promise<boolean> {
+    const reserved = await manager
+      .createQueryBuilder()
+      .update(ConfessionBand)
+      .set({
+        currentBookings: () => '"currentBookings" + 1',
+        status: () => 'CASE WHEN "currentBookings" + 1 >= "maxCapacity" THEN :full ELSE :available END',
+      })
+      .where('id = :id', { id: bandId })
+      .andWhere('status = :available')
+      .andWhere('"currentBookings" < "maxCapacity"')
+      .setParameters({ full: BandStatus.FULL, available: BandStatus.AVAILABLE })
+      .execute();
+
+    return !!reserved.affected;
+  }
+
+  // Recuentos por franja y estado en una consulta agregada por lote
+  private async countConfessionsByStatus(bandIds: string[]): Promise<Map<string, ConfessionCounts>> {
+    const counts = new Map<string, ConfessionCounts>();
+
+    for (let offset = 0; offset < bandIds.length; offset += SUMMARY_COUNT_BATCH_SIZE) {
+      const rows = await this.confessionsRepository
+        .createQueryBuilder('confession')
+        .select('confession.confessionBandId', 'bandId')
+        .addSelect('confession.status', 'status')
+        .addSelect('COUNT(*)', 'count')
+        .where('confession.confessionBandId IN (:...bandIds)', {
+          bandIds: bandIds.slice(offset, offset + SUMMARY_COUNT_BATCH_SIZE),
+        })
+        .groupBy('confession.confessionBandId')
+        .addGroupBy('confession.status')
+        .getRawMany();
+
+      for (const row of rows) {
+        const bandCounts = counts.get(row.bandId) || emptyConfessionCounts();
+        bandCounts[row.status] = parseInt(row.count, 10);
+        counts.set(row.bandId, bandCounts);
+      }
     }
 
-    const overlappingBands = await this.bandsRepository
+    return counts;
+  }
+
+  private async releaseSeat(manager: EntityManager, bandId: string): Promise<boolean> {
+    if (!bandId) return false;
+
+    // Decremento y vuelta a AVAILABLE en la misma sentencia; las franjas canceladas siguen canceladas.
+    // El contador nunca baja de 0 aunque una reserva antigua no lo hubiera incrementado
+    const released = await manager
+      .createQueryBuilder()
+      .update(ConfessionBand)
+      .set({
+        currentBookings: () => '"currentBookings" - 1',
+        status: () => 'CASE WHEN status = :full THEN :available ELSE status END',
+      })
+      .where('id = :id', { id: bandId })
+      .andWhere('"currentBookings" > 0')
+      .setParameters({ full: BandStatus.FULL, available: BandStatus.AVAILABLE })
+      .execute();
+
+    return !!released.affected;
+  }
+
+  // Intervalos que ocupará la franja: ella misma y, si es una serie, todas sus ocurrencias
+  private bandIntervals(band: ConfessionBand): BandInterval[] {
+    const startTime = new Date(band.startTime);
+    const duration = new Date(band.endTime).getTime() - startTime.getTime();
+
+    return [
+      { startTime, endTime: new Date(band.endTime) },
+      ...expandOccurrences(band, startTime).map(start => ({ startTime: start, endTime: new Date(start.getTime() + duration) })),
+    ];
+  }
+
+  private async checkForOverlaps(priestId: string, intervals: BandInterval[], excludeId?: string): Promise<void> {
+    const candidates = [...intervals].sort(compareIntervals);
+    const from = candidates[0].startTime;
+    const to = new Date(Math.max(...candidates.map(interval => interval.endTime.getTime())));
+
+    // Rango sobre el índice (priestId, startTime, endTime) de las franjas no canceladas
+    const query = this.bandsRepository
       .createQueryBuilder('band')
       .where('band.priestId = :priestId', { priestId })
       .andWhere('band.status != :cancelled', { cancelled: BandStatus.CANCELLED })
-      .andWhere(
-        '(band.startTime < :endTime AND band.endTime > :startTime)',
-        { startTime, endTime }
-      );
+      .andWhere('(band.startTime < :to AND band.endTime > :from)', { from, to });
 
     if (excludeId) {
-      overlappingBands.andWhere('band.id != :excludeId', { excludeId });
+      // Ni la propia franja ni las instancias de su serie cuentan como solapamiento
+      query.andWhere('band.id != :excludeId', { excludeId });
+      query.andWhere('(band.parentBandId IS NULL OR band.parentBandId != :excludeId)');
+    }
+
+    let existing: BandInterval[] = [];
+    if (candidates.length === 1) {
+      // Un único intervalo: basta con saber si existe alguna fila
+      if (await query.getExists()) {
+        throw new BadRequestException('Ya tienes franjas programadas que se solapan con este horario');
+      }
+    } else {
+      existing = await query
+        .select(['band.id', 'band.startTime', 'band.endTime'])
+        .orderBy('band.startTime', 'ASC')
+        .getMany();
     }
 
-    const overlaps = await overlappingBands.getMany();
+    // Las ocurrencias virtuales de sus series también ocupan su agenda
+    const occurrences = (await this.expandRecurrences(new Date(from.getTime() - OVERLAP_LOOKBACK_MS), to, { priestId }))
+      .filter(occurrence => occurrence.parentBandId !== excludeId);
 
-    if (overlaps.length > 0) {
+    const merged = [...existing, ...occurrences].sort(compareIntervals);
+
+    if (hasCrossOverlap(candidates, merged)) {
       throw new BadRequestException('Ya tienes franjas programadas que se solapan con este horario');
     }
   }
 
-  private async createRecurrentBands(parentBand: ConfessionBand): Promise<void> {
-    if (!parentBand.isRecurrent || !parentBand.recurrenceDays) return;
-
-    const recurrenceDays = JSON.parse(parentBand.recurrenceDays);
-    const endDate = parentBand.recurrenceEndDate || new Date(Date.now() + 365 * 24 * 60 * 60 * 1000); // 1 año por defecto
-    
-    const startDate = new Date(parentBand.startTime);
-    const bandDuration = parentBand.endTime.getTime() - parentBand.startTime.getTime();
-
-    const recurringBands: Partial<ConfessionBand>[] = [];
-
-    // Generar instancias según el tipo de recurrencia
-    switch (parentBand.recurrenceType) {
-      case RecurrenceType.WEEKLY:
-        let currentWeek = new Date(startDate);
-        currentWeek.setDate(startDate.getDate() + 7); // Empezar la próxima semana
-
-        while (currentWeek <= endDate) {
-          for (const dayOfWeek of recurrenceDays) {
-            const instanceDate = new Date(currentWeek);
-            instanceDate.setDate(currentWeek.getDate() - currentWeek.getDay() + dayOfWeek);
-
-            if (instanceDate > startDate && instanceDate <= endDate) {
-              const instanceStart = new Date(instanceDate);
-              instanceStart.setHours(startDate.getHours(), startDate.getMinutes(), 0, 0);
-              
-              const instanceEnd = new Date(instanceStart.getTime() + bandDuration);
-
-              recurringBands.push({
-                priestId: parentBand.priestId,
-                startTime: instanceStart,
-                endTime: instanceEnd,
-                location: parentBand.location,
-                notes: parentBand.notes,
-                maxCapacity: parentBand.maxCapacity,
-                parishId: parentBand.parishId,
-                parentBandId: parentBand.id,
-                isRecurrent: false,
-                status: BandStatus.AVAILABLE,
-              });
-            }
-          }
-          currentWeek.setDate(currentWeek.getDate() + 7);
-        }
-        break;
+  // ===== RECURRENCE (series expanded on read, materialized on write) =====
+
+  // Con `limit` (páginas), cada serie aporta como mucho sus primeras `limit` ocurrencias: basta para
+  // llenar la página y, si alguna se corta, la página tiene más de pageSize elementos y sigue
+  // (las páginas piden pageSize + 2: una para detectar que hay más y otra por la que cae en el cursor).
+  // Sin ventana ni límite, la expansión se detiene en UNBOUNDED_EXPANSION_HORIZON_MS
+  private async expandRecurrences(
+    from: Date,
+    to: Date | null,
+    filters: { priestId?: string; parishId?: string },
+    relations: string[] = [],
+    limit?: number,
+  ): Promise<ConfessionBand[]> {
+    if (!to && !limit) {
+      to = new Date(Math.max(from.getTime(), Date.now()) + UNBOUNDED_EXPANSION_HORIZON_MS);
+    }
 
-      case RecurrenceType.DAILY:
-        let currentDay = new Date(startDate);
-        currentDay.setDate(startDate.getDate() + 1);
-
-        while (currentDay <= endDate) {
-          const instanceStart = new Date(currentDay);
-          instanceStart.setHours(startDate.getHours(), startDate.getMinutes(), 0, 0);
-          
-          const instanceEnd = new Date(instanceStart.getTime() + bandDuration);
-
-          recurringBands.push({
-            priestId: parentBand.priestId,
-            startTime: instanceStart,
-            endTime: instanceEnd,
-            location: parentBand.location,
-            notes: parentBand.notes,
-            maxCapacity: parentBand.maxCapacity,
-            parishId: parentBand.parishId,
-            parentBandId: parentBand.id,
-            isRecurrent: false,
-            status: BandStatus.AVAILABLE,
-          });
-
-          currentDay.setDate(currentDay.getDate() + 1);
-        }
-        break;
+    const query = this.bandsRepository
+      .createQueryBuilder('band')
+      .where('band.isRecurrent = :recurrent', { recurrent: true })
+      .andWhere('band.parentBandId IS NULL')
+      .andWhere('band.recurrenceType != :none', { none: RecurrenceType.NONE })
+      .andWhere('(band.recurrenceEndDate IS NULL OR band.recurrenceEndDate >= :from)', { from });
+
+    if (to) {
+      query.andWhere('band.startTime <= :to', { to });
+    }
+    if (filters.priestId) {
+      query.andWhere('band.priestId = :priestId', { priestId: filters.priestId });
+    }
+    if (filters.parishId) {
+      query.andWhere('band.parishId = :parishId', { parishId: filters.parishId });
+    }
+    for (const relation of relations) {
+      query.leftJoinAndSelect(`band.${relation}`, relation);
     }
 
-    // Crear las instancias recurrentes en lotes
-    if (recurringBands.length > 0) {
-      const batchSize = 50; // Crear en lotes para evitar problemas de rendimiento
-      for (let i = 0; i < recurringBands.length; i += batchSize) {
-        const batch = recurringBands.slice(i, i + batchSize);
-        await this.bandsRepository.save(batch);
-      }
+    const parents = await query.getMany();
+    if (parents.length === 0) return [];
+
+    // Las ocurrencias ya materializadas (reservadas o editadas) se devuelven como franjas reales
+    const children = await this.bandsRepository
+      .createQueryBuilder('band')
+      .select(['band.id', 'band.parentBandId', 'band.occurrenceStart', 'band.startTime'])
+      .where('band.parentBandId IN (:...parentIds)', { parentIds: parents.map(parent => parent.id) })
+      .getMany();
+    const materialized = new Set(
+      children.map(child => occurrenceId(child.parentBandId, new Date(child.occurrenceStart || child.startTime))),
+    );
+    // Las materializadas se descartan después: se expanden tantas de más como hijas tenga la serie
+    const childCounts = new Map<string, number>();
+    for (const child of children) {
+      childCounts.set(child.parentBandId, (childCounts.get(child.parentBandId) || 0) + 1);
+    }
+
+    return parents.flatMap(parent =>
+      expandOccurrences(parent, from, to, limit && limit + (childCounts.get(parent.id) || 0))
+        .filter(startTime => !materialized.has(occurrenceId(parent.id, startTime)))
+        .slice(0, limit || undefined)
+        .map(startTime => virtualOccurrence(parent, startTime)),
+    );
+  }
+
+  private mergeByStartTime(bands: ConfessionBand[], occurrences: ConfessionBand[]): ConfessionBand[] {
+    if (occurrences.length === 0) return bands;
+    return [...bands, ...occurrences].sort((a, b) => new Date(a.startTime).getTime() - new Date(b.startTime).getTime());
+  }
+
+  // Ocurrencia por id virtual: la franja concreta si ya existe, o la virtual si la serie la genera
+  private async findOccurrence(id: string, priestId?: string): Promise<ConfessionBand> {
+    const { parentId, startTime } = parseOccurrenceId(id);
+
+    const existing = await this.bandsRepository
+      .createQueryBuilder('band')
+      .where('band.parentBandId = :parentId', { parentId })
+      .andWhere('(band.occurrenceStart = :startTime OR (band.occurrenceStart IS NULL AND band.startTime = :startTime))', { startTime })
+      .getOne();
+
+    if (existing) {
+      return priestId ? this.findOne(existing.id, priestId) : this.findOneById(existing.id);
+    }
+
+    const parent = await this.bandsRepository.findOne({
+      where: priestId ? { id: parentId, priestId } : { id: parentId },
+      relations: ['priest', 'parish'],
+    });
+
+    const [occurrence] = parent ? expandOccurrences(parent, startTime, startTime) : [];
+    if (!occurrence || occurrence.getTime() !== startTime.getTime()) {
+      throw new NotFoundException('Franja de confesión no encontrada');
+    }
+
+    return virtualOccurrence(parent, startTime);
+  }
+
+  private async materializeOccurrence(id: string, priestId?: string): Promise<ConfessionBand> {
+    const occurrence = await this.findOccurrence(id, priestId);
+    if (occurrence.id !== id) return occurrence;
+
+    const { id: _virtualId, priest, parish, confessions, createdAt, updatedAt, ...fields } = occurrence;
+
+    try {
+      return await this.bandsRepository.save(this.bandsRepository.create(fields));
+    } catch (error) {
+      if (!isUniqueViolation(error)) throw error;
+
+      // Otra petición la materializó a la vez
+      return this.bandsRepository.findOne({
+        where: { parentBandId: occurrence.parentBandId, occurrenceStart: occurrence.occurrenceStart },
+      });
+    }
+  }
+
+  private async addRecurrenceException(manager: EntityManager, parentId: string, startTime: Date): Promise<void> {
+    const parent = await manager.findOne(ConfessionBand, { where: { id: parentId } });
+    if (!parent || !isSeriesParent(parent)) return;
+
+    const exceptions = recurrenceExceptions(parent);
+    const key = new Date(startTime).toISOString();
+    if (!exceptions.includes(key)) {
+      await manager.update(ConfessionBand, parentId, { recurrenceExceptions: JSON.stringify([...exceptions, key]) });
     }
   }
-}
\ No newline at end of file
+}
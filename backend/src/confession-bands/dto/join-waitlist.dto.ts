@@ -0,0 +1,14 @@
+import { IsString, IsOptional } from 'class-validator';
+
+export class JoinWaitlistDto {
+  @IsString({ message: 'ID de franja requerido' })
+  bandId: string;
+
+  @IsString({ message: 'Las notas deben ser una cadena de texto' })
+  @IsOptional()
+  notes?: string;
+
+  @IsString({ message: 'Las notas de preparación deben ser una cadena de texto' })
+  @IsOptional()
+  preparationNotes?: string;
+}
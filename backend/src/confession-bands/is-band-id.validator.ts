@@ -0,0 +1,16 @@
+import { ValidateBy, ValidationOptions } from 'class-validator';
+import { isBandId } from './recurrence';
+
+// Para DTOs: el UUID de una franja o el id de una ocurrencia virtual, como ParseBandIdPipe
+export function IsBandId(validationOptions?: ValidationOptions): PropertyDecorator {
+  return ValidateBy(
+    {
+      name: 'isBandId',
+      validator: {
+        validate: value => isBandId(value),
+        defaultMessage: () => '$property must be a UUID',
+      },
+    },
+    validationOptions,
+  );
+}
@@ -0,0 +1,13 @@
+import { BadRequestException, Injectable, PipeTransform } from '@nestjs/common';
+import { isBandId } from './recurrence';
+
+// Acepta el UUID de una franja o el id de una ocurrencia recurrente virtual (<uuid>@<inicio ISO>)
+@Injectable()
+export class ParseBandIdPipe implements PipeTransform<string, string> {
+  transform(value: string): string {
+    if (isBandId(value)) {
+      return value;
+    }
+    throw new BadRequestException('Validation failed (uuid is expected)');
+  }
+}
@@ -0,0 +1,52 @@
+import { Controller, Get, Headers, HttpStatus, Query, Res } from '@nestjs/common';
+import { ConfessionBandsService } from './confession-bands.service';
+
+// Segundos que un proxy o el navegador pueden reutilizar la lista pública sin revalidar
+const PUBLIC_AVAILABLE_MAX_AGE_S = parseInt(process.env.PUBLIC_AVAILABLE_MAX_AGE_S || '10', 10);
+
+// If-None-Match admite varias etiquetas, '*' y etiquetas débiles (W/)
+function etagMatches(ifNoneMatch: string | undefined, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch
+    .split(',')
+    .map(tag => tag.trim().replace(/^W\//, ''))
+    .some(tag => tag === '*' || tag === etag);
+}
+
+// Sin JwtAuthGuard: la respuesta es la misma para cualquiera, así que Cache-Control: public es seguro
+@Controller('confession-bands')
+export class PublicBandsController {
+  constructor(private readonly confessionBandsService: ConfessionBandsService) {}
+
+  // Lo consultan webs parroquiales y quioscos: cacheable por proxies y con GET condicional
+  @Get('public/available')
+  async getPublicAvailableBands(
+    @Res({ passthrough: true }) res,
+    @Headers('if-none-match') ifNoneMatch?: string,
+    @Query('startDate') startDate?: string,
+    @Query('endDate') endDate?: string,
+    @Query('parishId') parishId?: string,
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
+  ) {
+    const pageSize = limit ? parseInt(limit, 10) : undefined;
+    const etag = this.confessionBandsService.availabilityEtag(startDate, endDate, parishId, cursor, pageSize);
+
+    res.setHeader('ETag', etag);
+    res.setHeader('Cache-Control', `public, max-age=${PUBLIC_AVAILABLE_MAX_AGE_S}, must-revalidate`);
+
+    // Sin cambios desde la versión que tiene el cliente: ni consulta ni serialización
+    if (etagMatches(ifNoneMatch, etag)) {
+      res.status(HttpStatus.NOT_MODIFIED);
+      return;
+    }
+
+    const page = await this.confessionBandsService.getAvailableBands(startDate, endDate, parishId, cursor, pageSize);
+
+    if (page.nextCursor) {
+      res.setHeader('X-Next-Cursor', page.nextCursor);
+    }
+
+    return page.items;
+  }
+}
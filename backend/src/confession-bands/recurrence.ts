@@ -0,0 +1,108 @@
+import { isUUID } from 'class-validator';
+import { ConfessionBand, BandStatus, RecurrenceType } from '../entities/confession-band.entity';
+
+// Sin fecha de fin, una serie dura un año desde su creación
+const DEFAULT_SERIES_LENGTH_MS = 365 * 24 * 60 * 60 * 1000;
+const OCCURRENCE_SEPARATOR = '@';
+
+// Las ocurrencias virtuales se identifican como <id de la franja padre>@<inicio ISO>
+export function occurrenceId(parentId: string, startTime: Date): string {
+  return `${parentId}${OCCURRENCE_SEPARATOR}${startTime.toISOString()}`;
+}
+
+export function parseOccurrenceId(id: string): { parentId: string; startTime: Date } | null {
+  const [parentId, start, ...rest] = (id || '').split(OCCURRENCE_SEPARATOR);
+  if (rest.length || !start || !isUUID(parentId)) return null;
+
+  const startTime = new Date(start);
+  if (isNaN(startTime.getTime()) || startTime.toISOString() !== start) return null;
+
+  return { parentId, startTime };
+}
+
+// UUID de una franja persistida o id de una ocurrencia virtual
+export function isBandId(value: unknown): boolean {
+  return typeof value === 'string' && (isUUID(value) || !!parseOccurrenceId(value));
+}
+
+export function isSeriesParent(band: ConfessionBand): boolean {
+  return band.isRecurrent && !band.parentBandId && band.recurrenceType !== RecurrenceType.NONE;
+}
+
+export function seriesEnd(parent: ConfessionBand): Date {
+  return parent.recurrenceEndDate || new Date(new Date(parent.createdAt || parent.startTime).getTime() + DEFAULT_SERIES_LENGTH_MS);
+}
+
+export function recurrenceExceptions(parent: ConfessionBand): string[] {
+  return parent.recurrenceExceptions ? JSON.parse(parent.recurrenceExceptions) : [];
+}
+
+// Inicios de las ocurrencias de la serie dentro de [from, to], sin contar la franja padre;
+// con `limit`, solo las primeras
+export function expandOccurrences(parent: ConfessionBand, from: Date, to?: Date | null, limit?: number): Date[] {
+  if (!isSeriesParent(parent)) return [];
+
+  const recurrenceDays: number[] = parent.recurrenceDays ? JSON.parse(parent.recurrenceDays) : [];
+  if (parent.recurrenceType === RecurrenceType.WEEKLY && recurrenceDays.length === 0) return [];
+  // Como antes, MONTHLY todavía no genera repeticiones
+  if (parent.recurrenceType === RecurrenceType.MONTHLY) return [];
+
+  const parentStart = new Date(parent.startTime);
+  const end = seriesEnd(parent);
+  const last = to && to < end ? to : end;
+  const exceptions = new Set(recurrenceExceptions(parent));
+
+  // Recorrer día a día desde el día siguiente a la franja padre (o desde `from`)
+  const day = new Date(parentStart);
+  day.setHours(0, 0, 0, 0);
+  day.setDate(day.getDate() + 1);
+  const firstDay = new Date(from);
+  firstDay.setHours(0, 0, 0, 0);
+  if (firstDay > day) day.setTime(firstDay.getTime());
+
+  const occurrences: Date[] = [];
+  for (; day <= last; day.setDate(day.getDate() + 1)) {
+    if (parent.recurrenceType === RecurrenceType.WEEKLY && !recurrenceDays.includes(day.getDay())) continue;
+
+    const start = new Date(day);
+    start.setHours(parentStart.getHours(), parentStart.getMinutes(), 0, 0);
+
+    if (start <= parentStart || start < from || start > last) continue;
+    if (exceptions.has(start.toISOString())) continue;
+
+    occurrences.push(start);
+    if (limit && occurrences.length >= limit) break;
+  }
+
+  return occurrences;
+}
+
+// Franja no persistida que representa una ocurrencia de la serie
+export function virtualOccurrence(parent: ConfessionBand, startTime: Date): ConfessionBand {
+  const duration = new Date(parent.endTime).getTime() - new Date(parent.startTime).getTime();
+
+  return Object.assign(new ConfessionBand(), {
+    id: occurrenceId(parent.id, startTime),
+    priestId: parent.priestId,
+    startTime,
+    endTime: new Date(startTime.getTime() + duration),
+    status: BandStatus.AVAILABLE,
+    location: parent.location,
+    parishId: parent.parishId,
+    notes: parent.notes,
+    maxCapacity: parent.maxCapacity,
+    currentBookings: 0,
+    recurrenceType: RecurrenceType.NONE,
+    recurrenceDays: null,
+    recurrenceEndDate: null,
+    recurrenceExceptions: null,
+    isRecurrent: false,
+    parentBandId: parent.id,
+    occurrenceStart: startTime,
+    createdAt: parent.createdAt,
+    updatedAt: parent.updatedAt,
+    priest: parent.priest,
+    parish: parent.parish,
+    confessions: [],
+  });
+}
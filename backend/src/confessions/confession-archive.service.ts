@@ -0,0 +1,120 @@
+import { Injectable, Logger, OnApplicationBootstrap, OnModuleDestroy } from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { In, LessThan, Repository } from 'typeorm';
+import { Confession, ConfessionStatus } from '../entities/confession.entity';
+import { ArchivedConfession } from '../entities/archived-confession.entity';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Finished confessions older than the horizon leave the live table
+const ARCHIVE_HORIZON_DAYS = parseInt(process.env.CONFESSION_ARCHIVE_HORIZON_DAYS || '365', 10);
+const ARCHIVE_INTERVAL_MS = parseInt(process.env.CONFESSION_ARCHIVE_INTERVAL_MS || String(DAY_MS), 10);
+const ARCHIVE_BATCH_SIZE = parseInt(process.env.CONFESSION_ARCHIVE_BATCH_SIZE || '1000', 10);
+const ARCHIVABLE_STATUSES = [ConfessionStatus.COMPLETED, ConfessionStatus.CANCELLED];
+
+// An archived row shaped as the Confession the API returns, keeping its archivedAt
+export function archivedAsConfession(archived: ArchivedConfession): Confession & { archivedAt: Date } {
+  return Object.assign(new Confession(), archived);
+}
+
+export interface ArchiveRunResult {
+  archived: number;
+  cutoff: Date;
+}
+
+@Injectable()
+export class ConfessionArchiveService implements OnApplicationBootstrap, OnModuleDestroy {
+  private readonly logger = new Logger(ConfessionArchiveService.name);
+  private timer: NodeJS.Timeout;
+  private running: Promise<ArchiveRunResult> = null;
+  // Latest scheduledTime present in the archive; windows starting after it never read the archive
+  private newestArchived: Date = null;
+
+  constructor(
+    @InjectRepository(Confession)
+    private confessionsRepository: Repository<Confession>,
+    @InjectRepository(ArchivedConfession)
+    private archiveRepository: Repository<ArchivedConfession>,
+  ) {}
+
+  async onApplicationBootstrap() {
+    await this.refreshNewestArchived();
+
+    if (process.env.CONFESSION_ARCHIVE_ENABLED === 'false') return;
+
+    this.timer = setInterval(() => {
+      this.run().catch(error => this.logger.error(`Archiving failed: ${error.message}`));
+    }, ARCHIVE_INTERVAL_MS);
+    this.timer.unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.timer);
+  }
+
+  // Does a history window starting at `startDate` (none = from the beginning) reach archived rows?
+  windowNeedsArchive(startDate?: string): boolean {
+    if (!this.newestArchived) return false;
+    // MAX() comes back in the driver's raw format (no zone on SQLite): a day of slack keeps this conservative
+    return !startDate || new Date(startDate).getTime() <= this.newestArchived.getTime() + DAY_MS;
+  }
+
+  // One run at a time; concurrent callers share it
+  run(): Promise<ArchiveRunResult> {
+    if (!this.running) {
+      this.running = this.archive().finally(() => {
+        this.running = null;
+      });
+    }
+    return this.running;
+  }
+
+  private async archive(): Promise<ArchiveRunResult> {
+    const cutoff = new Date(Date.now() - ARCHIVE_HORIZON_DAYS * DAY_MS);
+    let archived = 0;
+
+    // Small batches, each moved in its own transaction, so live bookings are never blocked for long
+    for (;;) {
+      const moved = await this.confessionsRepository.manager.transaction(async manager => {
+        const batch = await manager.find(Confession, {
+          where: { status: In(ARCHIVABLE_STATUSES), scheduledTime: LessThan(cutoff) },
+          order: { scheduledTime: 'ASC' },
+          take: ARCHIVE_BATCH_SIZE,
+        });
+        if (batch.length === 0) return 0;
+
+        const archivedAt = new Date();
+        await manager
+          .createQueryBuilder()
+          .insert()
+          .into(ArchivedConfession)
+          .values(batch.map(confession => ({ ...confession, archivedAt })))
+          .orIgnore()
+          .execute();
+
+        await manager.delete(Confession, { id: In(batch.map(confession => confession.id)) });
+        return batch.length;
+      });
+
+      archived += moved;
+      if (moved < ARCHIVE_BATCH_SIZE) break;
+    }
+
+    // Also picks up rows archived by other instances
+    await this.refreshNewestArchived();
+    if (archived > 0) {
+      this.logger.log(`Archived ${archived} confessions scheduled before ${cutoff.toISOString()}`);
+    }
+
+    return { archived, cutoff };
+  }
+
+  private async refreshNewestArchived(): Promise<void> {
+    const { newest } = await this.archiveRepository
+      .createQueryBuilder('archived')
+      .select('MAX(archived.scheduledTime)', 'newest')
+      .getRawOne();
+
+    this.newestArchived = newest ? new Date(newest) : null;
+  }
+}
@@ -1,26 +1,68 @@
-import { Controller, Get, Post, Body, Patch, Param, Delete, UseGuards, Request } from '@nestjs/common';
-import { ConfessionsService } from './confessions.service';
+import { Controller, Get, Post, Body, Patch, Param, Delete, UseGuards, Request, Query, Res, BadRequestException } from '@nestjs/common';
+import { CONFESSION_EXPANDABLE, ConfessionsService } from './confessions.service';
+import { ConfessionArchiveService } from './confession-archive.service';
+import { ConfessionStatus } from '../entities/confession.entity';
 import { CreateConfessionDto } from './dto/create-confession.dto';
 import { UpdateConfessionDto } from './dto/update-confession.dto';
 import { JwtAuthGuard } from '../auth/jwt-auth.guard';
 import { RolesGuard } from '../auth/roles.guard';
 import { Roles } from '../auth/roles.decorator';
+import { parseExpand } from '../common/expand';
 
 @Controller('confessions')
 export class ConfessionsController {
-  constructor(private readonly confessionsService: ConfessionsService) {}
+  constructor(
+    private readonly confessionsService: ConfessionsService,
+    private readonly confessionArchiveService: ConfessionArchiveService,
+  ) {}
 
   @UseGuards(JwtAuthGuard, RolesGuard)
   @Roles('faithful')
   @Post()
-  create(@Body() createConfessionDto: CreateConfessionDto, @Request() req) {
-    return this.confessionsService.create(createConfessionDto, req.user.id);
+  create(@Body() createConfessionDto: CreateConfessionDto, @Request() req, @Query('expand') expand?: string) {
+    return this.confessionsService.create(createConfessionDto, req.user.id, parseExpand(expand, CONFESSION_EXPANDABLE));
+  }
+
+  // Runs the archiving job now instead of waiting for its interval
+  @UseGuards(JwtAuthGuard, RolesGuard)
+  @Roles('admin')
+  @Post('archive/run')
+  runArchive() {
+    return this.confessionArchiveService.run();
   }
 
   @UseGuards(JwtAuthGuard)
   @Get()
-  findAll(@Request() req) {
-    return this.confessionsService.findAll(req.user.id, req.user.role);
+  async findAll(
+    @Request() req,
+    @Res({ passthrough: true }) res,
+    @Query('status') status?: string,
+    @Query('startDate') startDate?: string,
+    @Query('endDate') endDate?: string,
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
+  ) {
+    // status=booked,completed
+    const statuses = status ? status.split(',').map(value => value.trim()) : undefined;
+    const validStatuses = Object.values(ConfessionStatus) as string[];
+    if (statuses?.some(value => !validStatuses.includes(value))) {
+      throw new BadRequestException(`Estado inválido. Valores permitidos: ${validStatuses.join(', ')}`);
+    }
+
+    const page = await this.confessionsService.findAll(req.user.id, req.user.role, {
+      status: statuses as ConfessionStatus[],
+      startDate,
+      endDate,
+      cursor,
+      limit: limit ? parseInt(limit, 10) : undefined,
+    });
+
+    // The response stays an array; the next page is announced in X-Next-Cursor
+    if (page.nextCursor) {
+      res.setHeader('X-Next-Cursor', page.nextCursor);
+    }
+
+    return page.items;
   }
 
   @UseGuards(JwtAuthGuard)
@@ -31,21 +73,27 @@ export class ConfessionsController {
 
   @UseGuards(JwtAuthGuard)
   @Patch(':id')
-  update(@Param('id') id: string, @Body() updateConfessionDto: UpdateConfessionDto, @Request() req) {
-    return this.confessionsService.update(id, updateConfessionDto, req.user.id, req.user.role);
+  update(
+    @Param('id') id: string,
+    @Body() updateConfessionDto: UpdateConfessionDto,
+    @Request() req,
+    @Query('expand') expand?: string,
+  ) {
+    const relations = parseExpand(expand, CONFESSION_EXPANDABLE);
+    return this.confessionsService.update(id, updateConfessionDto, req.user.id, req.user.role, relations);
   }
 
   @UseGuards(JwtAuthGuard)
   @Patch(':id/cancel')
-  cancel(@Param('id') id: string, @Request() req) {
-    return this.confessionsService.cancel(id, req.user.id, req.user.role);
+  cancel(@Param('id') id: string, @Request() req, @Query('expand') expand?: string) {
+    return this.confessionsService.cancel(id, req.user.id, req.user.role, parseExpand(expand, CONFESSION_EXPANDABLE));
   }
 
   @UseGuards(JwtAuthGuard, RolesGuard)
   @Roles('priest')
   @Patch(':id/complete')
-  complete(@Param('id') id: string, @Request() req) {
-    return this.confessionsService.complete(id, req.user.id);
+  complete(@Param('id') id: string, @Request() req, @Query('expand') expand?: string) {
+    return this.confessionsService.complete(id, req.user.id, parseExpand(expand, CONFESSION_EXPANDABLE));
   }
 
   @UseGuards(JwtAuthGuard)
@@ -4,12 +4,13 @@ import { ConfessionsService } from './confessions.service';
 import { ConfessionsController } from './confessions.controller';
 import { Confession } from '../entities/confession.entity';
 import { ConfessionBand } from '../entities/confession-band.entity';
+import { ArchivedConfession } from '../entities/archived-confession.entity';
 import { ConfessionSlotsModule } from '../confession-slots/confession-slots.module';
 import { ConfessionBandsModule } from '../confession-bands/confession-bands.module';
 
 @Module({
   imports: [
-    TypeOrmModule.forFeature([Confession, ConfessionBand]),
+    TypeOrmModule.forFeature([Confession, ConfessionBand, ArchivedConfession]),
     ConfessionSlotsModule,
     ConfessionBandsModule,
   ],
@@ -1,14 +1,66 @@
 import { Injectable, NotFoundException, BadRequestException, ForbiddenException } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { Repository, SelectQueryBuilder } from 'typeorm';
 import { Confession, ConfessionStatus } from '../entities/confession.entity';
 import { ConfessionBand, BandStatus } from '../entities/confession-band.entity';
 import { ConfessionSlotsService } from '../confession-slots/confession-slots.service';
-import { ConfessionBandsService } from '../confession-bands/confession-bands.service';
+import {
+  ConfessionBandsService,
+  decodeCursor,
+  encodeCursor,
+  isUniqueViolation,
+} from '../confession-bands/confession-bands.service';
+import { ArchivedConfession } from '../entities/archived-confession.entity';
+import { ConfessionArchiveService, archivedAsConfession } from './confession-archive.service';
 import { SlotStatus } from '../entities/confession-slot.entity';
 import { CreateConfessionDto } from './dto/create-confession.dto';
 import { UpdateConfessionDto } from './dto/update-confession.dto';
 
+// Relations that ?expand= may request on write responses
+export const CONFESSION_EXPANDABLE = [
+  'faithful',
+  'confessionSlot',
+  'confessionSlot.priest',
+  'confessionBand',
+  'confessionBand.priest',
+] as const;
+
+// Keyset pagination of the confession history over (scheduledTime, id), only when a cursor or limit
+// is passed: without them the whole history is returned, as clients that ignore X-Next-Cursor expect
+export const CONFESSIONS_PAGE_SIZE = 100;
+export const CONFESSIONS_MAX_PAGE_SIZE = 500;
+// Ids per relation-loading query, well under the bind parameter limits of SQLite and Postgres
+const HISTORY_LOAD_BATCH_SIZE = 500;
+
+export interface ConfessionFilters {
+  status?: ConfessionStatus[];
+  startDate?: string;
+  endDate?: string;
+  cursor?: string;
+  limit?: number;
+}
+
+export interface ConfessionsPage {
+  items: Confession[];
+  nextCursor: string | null;
+}
+
+// Restricts a history query to what one role may see; must call where().
+// Applies to both the live table and the archive, which share column and relation names
+type ConfessionScope = (query: SelectQueryBuilder<Confession | ArchivedConfession>) => void;
+type HistoryRepository = Repository<any>;
+
+interface HistoryKey {
+  id: string;
+  scheduledTime: Date;
+  archived: boolean;
+}
+
+function compareHistory(a: { scheduledTime: Date; id: string }, b: { scheduledTime: Date; id: string }): number {
+  const diff = new Date(a.scheduledTime).getTime() - new Date(b.scheduledTime).getTime();
+  return diff !== 0 ? diff : a.id < b.id ? -1 : a.id > b.id ? 1 : 0;
+}
+
 @Injectable()
 export class ConfessionsService {
   constructor(
@@ -16,11 +68,14 @@ export class ConfessionsService {
     private confessionsRepository: Repository<Confession>,
     @InjectRepository(ConfessionBand)
     private bandsRepository: Repository<ConfessionBand>,
+    @InjectRepository(ArchivedConfession)
+    private archiveRepository: Repository<ArchivedConfession>,
+    private confessionArchiveService: ConfessionArchiveService,
     private confessionSlotsService: ConfessionSlotsService,
     private confessionBandsService: ConfessionBandsService,
   ) {}
 
-  async create(createConfessionDto: CreateConfessionDto, faithfulId: string): Promise<Confession> {
+  async create(createConfessionDto: CreateConfessionDto, faithfulId: string, expand: string[] = []): Promise<Confession> {
     // Validate that either confessionSlotId or confessionBandId is provided
     if (!createConfessionDto.confessionSlotId && !createConfessionDto.confessionBandId) {
       throw new BadRequestException('Debes proporcionar confessionSlotId o confessionBandId');
@@ -32,6 +87,7 @@ export class ConfessionsService {
 
     let scheduledTime: Date;
     let priestId: string;
+    let bookedBand: ConfessionBand;
 
     // Handle confession slot (legacy system)
     if (createConfessionDto.confessionSlotId) {
@@ -67,6 +123,8 @@ export class ConfessionsService {
     // Handle confession band (new system)
     else if (createConfessionDto.confessionBandId) {
       const band = await this.confessionBandsService.findOneById(createConfessionDto.confessionBandId);
+      // A virtual recurrence occurrence is materialized by findOneById
+      createConfessionDto.confessionBandId = band.id;
       
       if (band.status !== BandStatus.AVAILABLE) {
         throw new BadRequestException('Esta franja de confesión no está disponible');
@@ -76,18 +134,6 @@ export class ConfessionsService {
         throw new BadRequestException('No puedes reservar una franja que ya pasó');
       }
 
-      // Check current bookings count
-      const currentBookings = await this.confessionsRepository.count({
-        where: {
-          confessionBandId: createConfessionDto.confessionBandId,
-          status: ConfessionStatus.BOOKED,
-        },
-      });
-
-      if (currentBookings >= band.maxCapacity) {
-        throw new BadRequestException('Esta franja ya está llena');
-      }
-
       // Check if user already has a booking for this band
       const existingBooking = await this.confessionsRepository.findOne({
         where: {
@@ -103,12 +149,7 @@ export class ConfessionsService {
 
       scheduledTime = band.startTime;
       priestId = band.priestId;
-
-      // Check if band should become full
-      const newBookingsCount = currentBookings + 1;
-      if (newBookingsCount >= band.maxCapacity) {
-        await this.bandsRepository.update(band.id, { status: BandStatus.FULL });
-      }
+      bookedBand = band;
     }
 
     // Create the confession booking
@@ -118,45 +159,211 @@ export class ConfessionsService {
       scheduledTime,
     });
 
-    const savedConfession = await this.confessionsRepository.save(confession);
+    let savedConfession: Confession;
+
+    if (bookedBand) {
+      // Same seat accounting as bookBand: the conditional increment and the booking commit together,
+      // so currentBookings stays in step and concurrent requests never exceed maxCapacity
+      savedConfession = await this.confessionsRepository.manager.transaction(async manager => {
+        if (!(await this.confessionBandsService.reserveSeat(manager, bookedBand.id))) {
+          throw new BadRequestException('Esta franja ya está llena');
+        }
+
+        try {
+          return await manager.save(confession);
+        } catch (error) {
+          // The unique (band, faithful, BOOKED) index catches a concurrent duplicate; rollback frees the seat
+          if (isUniqueViolation(error)) {
+            throw new BadRequestException('Ya tienes una reserva para esta franja');
+          }
+          throw error;
+        }
+      });
 
-    return this.findOne(savedConfession.id);
+      // The band's availability changed: drop cached availability pages and push the new seat count
+      const band = await this.bandsRepository.findOne({ where: { id: bookedBand.id } });
+      await this.confessionBandsService.invalidateAvailability(band);
+      this.confessionBandsService.notifyBandChanged(band);
+    } else {
+      savedConfession = await this.confessionsRepository.save(confession);
+    }
+
+    return this.expandConfession(savedConfession, expand);
   }
 
-  async findAll(userId?: string, userRole?: string): Promise<Confession[]> {
-    const query = this.confessionsRepository.createQueryBuilder('confession')
-      .leftJoinAndSelect('confession.faithful', 'faithful')
-      .leftJoinAndSelect('confession.confessionSlot', 'slot')
-      .leftJoinAndSelect('confession.confessionBand', 'band')
-      .leftJoinAndSelect('slot.priest', 'slotPriest')
-      .leftJoinAndSelect('band.priest', 'bandPriest')
-      .orderBy('confession.scheduledTime', 'ASC');
+  async findAll(userId?: string, userRole?: string, filters: ConfessionFilters = {}): Promise<ConfessionsPage> {
+    const paged = !!(filters.cursor || filters.limit);
+    const pageSize = paged
+      ? Math.min(Math.max(filters.limit || CONFESSIONS_PAGE_SIZE, 1), CONFESSIONS_MAX_PAGE_SIZE)
+      : Infinity;
+
+    // One plan per role, each driven by its own index; priests union a slot path and a band path
+    const scopes = this.historyScopes(userId, userRole);
+    const sources: [HistoryRepository, boolean][] = [[this.confessionsRepository, false]];
+
+    // The archive is only read when the window reaches back into it and asks for finished confessions
+    const wantsFinished = !filters.status?.length
+      || filters.status.some(status => status === ConfessionStatus.COMPLETED || status === ConfessionStatus.CANCELLED);
+    if (wantsFinished && this.confessionArchiveService.windowNeedsArchive(filters.startDate)) {
+      sources.push([this.archiveRepository, true]);
+    }
 
-    // Filter based on user role
+    const branches = await Promise.all(
+      sources.flatMap(([repository, archived]) =>
+        scopes.map(scope => this.findHistoryKeys(repository, archived, scope, filters, pageSize)),
+      ),
+    );
+
+    const seen = new Set<string>();
+    const keys = branches
+      .flat()
+      .sort(compareHistory)
+      .filter(key => !seen.has(key.id) && !!seen.add(key.id));
+
+    const pageKeys = keys.slice(0, pageSize);
+    if (pageKeys.length === 0) {
+      return { items: [], nextCursor: null };
+    }
+
+    // Relations are only loaded for the rows of this page
+    const liveIds = pageKeys.filter(key => !key.archived).map(key => key.id);
+    const archivedIds = pageKeys.filter(key => key.archived).map(key => key.id);
+    const [live, archived] = await Promise.all([
+      this.loadHistoryRows(this.confessionsRepository, liveIds),
+      this.loadHistoryRows(this.archiveRepository, archivedIds),
+    ]);
+    const items = [...live, ...archived].sort(compareHistory) as Confession[];
+
+    const last = pageKeys[pageKeys.length - 1];
+    return {
+      items,
+      nextCursor: keys.length > pageSize ? encodeCursor({ startTime: last.scheduledTime, id: last.id }) : null,
+    };
+  }
+
+  private historyScopes(userId: string, userRole: string): ConfessionScope[] {
     if (userRole === 'faithful') {
-      query.where('confession.faithfulId = :userId', { userId });
-    } else if (userRole === 'priest') {
-      query.where('slot.priestId = :userId OR band.priestId = :userId', { userId });
+      return [query => query.where('confession.faithfulId = :userId', { userId })];
+    }
+
+    if (userRole === 'priest') {
+      return [
+        query => query.innerJoin('confession.confessionSlot', 'slot').where('slot.priestId = :userId', { userId }),
+        query => query.innerJoin('confession.confessionBand', 'band').where('band.priestId = :userId', { userId }),
+      ];
+    }
+
+    // Bishops and admins keep seeing every confession
+    return [query => query.where('1 = 1')];
+  }
+
+  private async loadHistoryRows(
+    repository: HistoryRepository,
+    ids: string[],
+  ): Promise<(Confession | ArchivedConfession)[]> {
+    const rows: (Confession | ArchivedConfession)[] = [];
+
+    // An unpaged history can hold more ids than one IN list may bind
+    for (let offset = 0; offset < ids.length; offset += HISTORY_LOAD_BATCH_SIZE) {
+      rows.push(...await repository.createQueryBuilder('confession')
+        .leftJoinAndSelect('confession.faithful', 'faithful')
+        .leftJoinAndSelect('confession.confessionSlot', 'slot')
+        .leftJoinAndSelect('confession.confessionBand', 'band')
+        .leftJoinAndSelect('slot.priest', 'slotPriest')
+        .leftJoinAndSelect('band.priest', 'bandPriest')
+        .where('confession.id IN (:...ids)', { ids: ids.slice(offset, offset + HISTORY_LOAD_BATCH_SIZE) })
+        .getMany());
     }
 
-    return query.getMany();
+    return rows;
   }
 
+  // (scheduledTime, id) of the next page + 1 rows within one scope of one table (every row when unpaged)
+  private async findHistoryKeys(
+    repository: HistoryRepository,
+    archived: boolean,
+    scope: ConfessionScope,
+    filters: ConfessionFilters,
+    pageSize: number,
+  ): Promise<HistoryKey[]> {
+    const query = repository.createQueryBuilder('confession')
+      .select(['confession.id', 'confession.scheduledTime']);
+
+    scope(query);
+
+    if (filters.status?.length) {
+      query.andWhere('confession.status IN (:...statuses)', { statuses: filters.status });
+    }
+    if (filters.startDate) {
+      query.andWhere('confession.scheduledTime >= :startDate', { startDate: new Date(filters.startDate) });
+    }
+    if (filters.endDate) {
+      query.andWhere('confession.scheduledTime <= :endDate', { endDate: new Date(filters.endDate) });
+    }
+    if (filters.cursor) {
+      const after = decodeCursor(filters.cursor);
+      query.andWhere(
+        '(confession.scheduledTime > :afterTime OR (confession.scheduledTime = :afterTime AND confession.id > :afterId))',
+        { afterTime: after.startTime, afterId: after.id },
+      );
+    }
+
+    query.orderBy('confession.scheduledTime', 'ASC').addOrderBy('confession.id', 'ASC');
+    if (Number.isFinite(pageSize)) {
+      query.limit(pageSize + 1);
+    }
+    const rows = await query.getMany();
+
+    return rows.map(row => ({ id: row.id, scheduledTime: row.scheduledTime, archived }));
+  }
+
+  // Archived confessions stay readable by id (with their archivedAt), they just live in another table
   async findOne(id: string): Promise<Confession> {
     const confession = await this.confessionsRepository.findOne({
       where: { id },
       relations: ['faithful', 'confessionSlot', 'confessionSlot.priest', 'confessionBand', 'confessionBand.priest'],
     });
+    if (confession) return confession;
+
+    const archived = this.confessionArchiveService.windowNeedsArchive()
+      ? await this.archiveRepository.findOne({
+          where: { id },
+          relations: ['faithful', 'confessionSlot', 'confessionSlot.priest', 'confessionBand', 'confessionBand.priest'],
+        })
+      : null;
+
+    if (!archived) {
+      throw new NotFoundException('Confesión no encontrada');
+    }
+
+    return archivedAsConfession(archived);
+  }
+
+  // Mutations only apply to the live table; archived confessions are finished and read-only
+  private async findLive(id: string): Promise<Confession> {
+    const confession = await this.confessionsRepository.findOne({
+      where: { id },
+      relations: ['faithful', 'confessionSlot', 'confessionSlot.priest', 'confessionBand', 'confessionBand.priest'],
+    });
 
     if (!confession) {
+      if (this.confessionArchiveService.windowNeedsArchive() && await this.archiveRepository.exists({ where: { id } })) {
+        throw new BadRequestException('Esta confesión está archivada y ya no se puede modificar');
+      }
       throw new NotFoundException('Confesión no encontrada');
     }
 
     return confession;
   }
 
-  async update(id: string, updateConfessionDto: UpdateConfessionDto, userId: string, userRole: string): Promise<Confession> {
-    const confession = await this.findOne(id);
+  async update(
+    id: string,
+    updateConfessionDto: UpdateConfessionDto,
+    userId: string,
+    userRole: string,
+    expand: string[] = [],
+  ): Promise<Confession> {
+    const confession = await this.findLive(id);
 
     // Only the faithful who booked or the priest can update
     const canUpdate = (userRole === 'faithful' && confession.faithfulId === userId) ||
@@ -167,11 +374,11 @@ export class ConfessionsService {
     }
 
     await this.confessionsRepository.update(id, updateConfessionDto);
-    return this.findOne(id);
+    return this.expandConfession(this.written(confession, updateConfessionDto), expand);
   }
 
-  async cancel(id: string, userId: string, userRole: string): Promise<Confession> {
-    const confession = await this.findOne(id);
+  async cancel(id: string, userId: string, userRole: string, expand: string[] = []): Promise<Confession> {
+    const confession = await this.findLive(id);
 
     // Only the faithful who booked can cancel (priests can complete but not cancel)
     if (userRole === 'faithful' && confession.faithfulId !== userId) {
@@ -191,26 +398,41 @@ export class ConfessionsService {
       throw new BadRequestException('No puedes cancelar una confesión con menos de 2 horas de anticipación');
     }
 
-    // Update confession status
-    await this.confessionsRepository.update(id, { status: ConfessionStatus.CANCELLED });
-
     // Handle slot availability based on which system is used
     if (confession.confessionSlotId) {
+      await this.confessionsRepository.update(id, { status: ConfessionStatus.CANCELLED });
+
       // Legacy system: Update slot status back to available
       await this.confessionSlotsService.updateStatus(confession.confessionSlotId, SlotStatus.AVAILABLE);
     } else if (confession.confessionBandId) {
-      // New system: Check if band was full and make it available again
-      const band = await this.confessionBandsService.findOneById(confession.confessionBandId);
-      if (band.status === BandStatus.FULL) {
-        await this.bandsRepository.update(confession.confessionBandId, { status: BandStatus.AVAILABLE });
-      }
+      // New system: cancel, free the seat and hand it to the head of the waitlist in one transaction
+      await this.confessionsRepository.manager.transaction(async manager => {
+        const cancelled = await manager.update(
+          Confession,
+          { id, status: ConfessionStatus.BOOKED },
+          { status: ConfessionStatus.CANCELLED },
+        );
+
+        // Only the cancellation that changed the status releases the seat
+        if (cancelled.affected) {
+          await this.confessionBandsService.releaseBookedSeat(manager, confession.confessionBandId);
+        } else {
+          await manager.update(Confession, id, { status: ConfessionStatus.CANCELLED });
+        }
+      });
+
+      const band = await this.bandsRepository.findOne({ where: { id: confession.confessionBandId } });
+      await this.confessionBandsService.invalidateAvailability(band);
+      this.confessionBandsService.notifyBandChanged(band);
+    } else {
+      await this.confessionsRepository.update(id, { status: ConfessionStatus.CANCELLED });
     }
 
-    return this.findOne(id);
+    return this.expandConfession(this.written(confession, { status: ConfessionStatus.CANCELLED }), expand);
   }
 
-  async complete(id: string, priestId: string): Promise<Confession> {
-    const confession = await this.findOne(id);
+  async complete(id: string, priestId: string, expand: string[] = []): Promise<Confession> {
+    const confession = await this.findLive(id);
 
     // Only the assigned priest can complete
     if (confession.confessionSlot.priestId !== priestId) {
@@ -223,11 +445,24 @@ export class ConfessionsService {
     // Update slot status
     await this.confessionSlotsService.updateStatus(confession.confessionSlotId, SlotStatus.COMPLETED);
 
-    return this.findOne(id);
+    return this.expandConfession(this.written(confession, { status: ConfessionStatus.COMPLETED }), expand);
+  }
+
+  // The row as just written, without the relations loaded for the permission checks
+  private written(confession: Confession, changes: Partial<Confession>): Confession {
+    const { faithful, confessionSlot, confessionBand, ...columns } = confession;
+    return this.confessionsRepository.create({ ...columns, ...changes });
+  }
+
+  // Relations are only reloaded when the client asks for them with ?expand=
+  private async expandConfession(confession: Confession, expand: string[]): Promise<Confession> {
+    if (expand.length === 0) return confession;
+
+    return this.confessionsRepository.findOne({ where: { id: confession.id }, relations: expand });
   }
 
   async remove(id: string): Promise<void> {
-    const confession = await this.findOne(id);
+    const confession = await this.findLive(id);
     
     // If confession was booked, make the slot available again
     if (confession.status === ConfessionStatus.BOOKED) {
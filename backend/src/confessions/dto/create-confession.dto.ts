@@ -1,4 +1,5 @@
 import { IsString, IsOptional, IsUUID, ValidateIf } from 'class-validator';
+import { IsBandId } from '../../confession-bands/is-band-id.validator';
 
 export class CreateConfessionDto {
   @IsUUID()
@@ -6,7 +7,8 @@ export class CreateConfessionDto {
   @ValidateIf(o => !o.confessionBandId)
   confessionSlotId?: string;
 
-  @IsUUID()
+  // Also a virtual occurrence of a recurring band (<uuid>@<ISO start>), materialized on booking
+  @IsBandId()
   @IsOptional()
   @ValidateIf(o => !o.confessionSlotId)
   confessionBandId?: string;
@@ -0,0 +1,59 @@
+import { Entity, Index, PrimaryColumn, Column, ManyToOne, JoinColumn } from 'typeorm';
+import { User } from './user.entity';
+import { ConfessionSlot } from './confession-slot.entity';
+import { ConfessionBand } from './confession-band.entity';
+import { ConfessionStatus } from './confession.entity';
+
+// Confesiones COMPLETED/CANCELLED antiguas, fuera de la tabla que consultan las reservas en vivo
+@Entity('confessions_archive')
+@Index('IDX_confessions_archive_faithful_scheduled', ['faithfulId', 'scheduledTime', 'id'])
+@Index('IDX_confessions_archive_band_scheduled', ['confessionBandId', 'scheduledTime'])
+@Index('IDX_confessions_archive_slot_scheduled', ['confessionSlotId', 'scheduledTime'])
+export class ArchivedConfession {
+  // Mismo id que tenía en confessions
+  @PrimaryColumn('uuid')
+  id: string;
+
+  @Column()
+  faithfulId: string;
+
+  @Column({ nullable: true })
+  confessionSlotId: string;
+
+  @Column({ type: 'varchar' })
+  status: ConfessionStatus;
+
+  @Column({ type: 'datetime' })
+  scheduledTime: Date;
+
+  @Column({ nullable: true })
+  confessionBandId: string;
+
+  @Column({ nullable: true })
+  notes: string;
+
+  @Column({ nullable: true })
+  preparationNotes: string;
+
+  @Column({ type: 'datetime' })
+  createdAt: Date;
+
+  @Column({ type: 'datetime' })
+  updatedAt: Date;
+
+  @Column({ type: 'datetime' })
+  archivedAt: Date;
+
+  // Relations (sin claves foráneas: el archivo sobrevive a franjas y slots borrados)
+  @ManyToOne(() => User, { createForeignKeyConstraints: false })
+  @JoinColumn({ name: 'faithfulId' })
+  faithful: User;
+
+  @ManyToOne(() => ConfessionSlot, { createForeignKeyConstraints: false })
+  @JoinColumn({ name: 'confessionSlotId' })
+  confessionSlot: ConfessionSlot;
+
+  @ManyToOne(() => ConfessionBand, { createForeignKeyConstraints: false })
+  @JoinColumn({ name: 'confessionBandId' })
+  confessionBand: ConfessionBand;
+}
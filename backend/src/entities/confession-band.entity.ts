@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
 import { User } from './user.entity';
 import { Confession } from './confession.entity';
 import { Parish } from './parish.entity';
@@ -17,6 +17,13 @@ export enum RecurrenceType {
 }
 
 @Entity('confession_bands')
+// Cada ocurrencia de una serie se materializa como mucho una vez
+@Index('IDX_confession_bands_parent_occurrence', ['parentBandId', 'occurrenceStart'], { unique: true })
+// Historial de confesiones: todas las franjas de un sacerdote o de una parroquia, incluidas las canceladas
+@Index('IDX_confession_bands_priest', ['priestId'])
+@Index('IDX_confession_bands_parish', ['parishId'])
+// Búsqueda de solapamientos por sacerdote: rango sobre startTime/endTime de las franjas no canceladas
+@Index('IDX_confession_bands_priest_interval', ['priestId', 'startTime', 'endTime'], { where: `"status" <> 'cancelled'` })
 export class ConfessionBand {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -67,9 +74,15 @@ export class ConfessionBand {
   @Column({ default: false })
   isRecurrent: boolean;
 
+  @Column({ type: 'text', nullable: true })
+  recurrenceExceptions: string; // JSON array of ISO start times removed from the series
+
   @Column({ nullable: true })
   parentBandId: string; // For recurring bands, reference to the original
 
+  @Column({ type: 'datetime', nullable: true })
+  occurrenceStart: Date; // Original start of a materialized occurrence, even after edits
+
   @CreateDateColumn({ type: 'datetime', default: () => 'CURRENT_TIMESTAMP' })
   createdAt: Date;
 
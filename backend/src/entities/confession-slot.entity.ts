@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
 import { User } from './user.entity';
 import { Confession } from './confession.entity';
 import { Parish } from './parish.entity';
@@ -11,6 +11,8 @@ export enum SlotStatus {
 }
 
 @Entity('confession_slots')
+@Index('IDX_confession_slots_priest', ['priestId'])
+@Index('IDX_confession_slots_parish', ['parishId'])
 export class ConfessionSlot {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
 import { User } from './user.entity';
 import { ConfessionSlot } from './confession-slot.entity';
 import { ConfessionBand } from './confession-band.entity';
@@ -12,6 +12,12 @@ export enum ConfessionStatus {
 }
 
 @Entity('confessions')
+// Historial paginado por scheduledTime: del fiel y por cada franja o slot
+@Index('IDX_confessions_faithful_scheduled', ['faithfulId', 'scheduledTime', 'id'])
+@Index('IDX_confessions_band_scheduled', ['confessionBandId', 'scheduledTime'])
+@Index('IDX_confessions_slot_scheduled', ['confessionSlotId', 'scheduledTime'])
+// Un fiel solo puede tener una reserva activa por franja
+@Index('IDX_confessions_band_faithful_booked', ['confessionBandId', 'faithfulId'], { unique: true, where: `"status" = 'booked'` })
 export class Confession {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, ManyToOne, OneToMany, JoinColumn } from 'typeorm';
 import { Diocese } from './diocese.entity';
 import { ParishStaff } from './parish-staff.entity';
 import { PriestParishHistory } from './priest-parish-history.entity';
@@ -6,6 +6,8 @@ import { ConfessionSlot } from './confession-slot.entity';
 import { ConfessionBand } from './confession-band.entity';
 
 @Entity('parishes')
+// Parroquias de una diócesis (parishes/diocese/:dioceseId)
+@Index('IDX_parishes_diocese', ['dioceseId'])
 export class Parish {
   @PrimaryGeneratedColumn('uuid')
   id: string;
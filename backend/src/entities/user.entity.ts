@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, OneToMany, OneToOne } from 'typeorm';
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, UpdateDateColumn, OneToMany, OneToOne, BeforeInsert, BeforeUpdate } from 'typeorm';
 import { ConfessionSlot } from './confession-slot.entity';
 import { ConfessionBand } from './confession-band.entity';
 import { Confession } from './confession.entity';
@@ -7,6 +7,11 @@ import { ParishStaff } from './parish-staff.entity';
 import { PriestParishRequest } from './priest-parish-request.entity';
 import { PriestParishHistory } from './priest-parish-history.entity';
 
+// Forma canónica del correo: sin espacios ni mayúsculas
+export function normalizeEmail(email: string): string {
+  return (email || '').trim().toLowerCase();
+}
+
 export enum UserRole {
   FAITHFUL = 'faithful',
   PRIEST = 'priest',
@@ -23,6 +28,11 @@ export class User {
   @Column({ unique: true })
   email: string;
 
+  // Búsqueda por correo sin distinguir mayúsculas: una sola consulta al índice único
+  @Index('IDX_users_email_normalized', { unique: true })
+  @Column({ nullable: true, select: false })
+  emailNormalized: string;
+
   @Column()
   password: string;
 
@@ -103,4 +113,12 @@ export class User {
 
   @OneToMany(() => PriestParishHistory, history => history.priest)
   parishHistory: PriestParishHistory[];
-}
\ No newline at end of file
+
+  @BeforeInsert()
+  @BeforeUpdate()
+  setEmailNormalized() {
+    if (this.email) {
+      this.emailNormalized = normalizeEmail(this.email);
+    }
+  }
+}
@@ -0,0 +1,57 @@
+import { Entity, Index, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { User } from './user.entity';
+import { ConfessionBand } from './confession-band.entity';
+
+export enum WaitlistStatus {
+  WAITING = 'waiting',
+  PROMOTED = 'promoted',
+  LEFT = 'left',
+}
+
+@Entity('band_waitlist')
+// Un fiel solo puede esperar una vez por franja
+@Index('IDX_band_waitlist_band_faithful_waiting', ['confessionBandId', 'faithfulId'], { unique: true, where: `"status" = 'waiting'` })
+// Cabeza de la cola: orden de llegada dentro de la franja
+@Index('IDX_band_waitlist_queue', ['confessionBandId', 'status', 'joinedAt'])
+export class WaitlistEntry {
+  @PrimaryGeneratedColumn('uuid')
+  id: string;
+
+  @Column()
+  confessionBandId: string;
+
+  @Column()
+  faithfulId: string;
+
+  @Column({
+    type: 'varchar',
+    default: WaitlistStatus.WAITING,
+  })
+  status: WaitlistStatus;
+
+  // Fijado al unirse (con milisegundos); decide el orden de la cola
+  @Column({ type: 'datetime' })
+  joinedAt: Date;
+
+  @Column({ nullable: true })
+  notes: string;
+
+  @Column({ nullable: true })
+  preparationNotes: string;
+
+  // Reserva creada al salir de la lista de espera
+  @Column({ nullable: true })
+  confessionId: string;
+
+  @CreateDateColumn({ type: 'datetime', default: () => 'CURRENT_TIMESTAMP' })
+  createdAt: Date;
+
+  // Relations
+  @ManyToOne(() => ConfessionBand, { onDelete: 'CASCADE' })
+  @JoinColumn({ name: 'confessionBandId' })
+  confessionBand: ConfessionBand;
+
+  @ManyToOne(() => User)
+  @JoinColumn({ name: 'faithfulId' })
+  faithful: User;
+}
@@ -37,8 +37,7 @@ export class InvitesService {
     }
 
     // Verificar si el usuario ya existe
-    const existingUser = await this.usersService.findByEmail(createInviteDto.email);
-    if (existingUser) {
+    if (await this.usersService.existsByEmail(createInviteDto.email)) {
       throw new BadRequestException('Ya existe un usuario registrado con este correo electrónico');
     }
 
@@ -233,11 +232,11 @@ export class InvitesService {
     }
 
     // 3. Verificar si el usuario ya es coordinador de esta parroquia
-    const existingUser = await this.usersService.findByEmail(createCoordinatorInviteDto.email);
-    if (existingUser) {
+    const existingUserId = await this.usersService.findIdByEmail(createCoordinatorInviteDto.email);
+    if (existingUserId) {
       const existingCoordinator = await this.parishStaffRepository.findOne({
         where: {
-          userId: existingUser.id,
+          userId: existingUserId,
           parishId: createCoordinatorInviteDto.parishId,
           role: ParishStaffRole.PARISH_COORDINATOR,
           isActive: true
@@ -16,6 +16,7 @@ async function bootstrap() {
   app.enableCors({
     origin: true,
     credentials: true,
+    exposedHeaders: ['X-Next-Cursor', 'ETag'],
   });
 
   // Global prefix for all routes
@@ -1,16 +1,49 @@
-import { Injectable } from '@nestjs/common';
+import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
-import { User, UserRole } from '../entities/user.entity';
+import { FindOptionsWhere, IsNull, Repository } from 'typeorm';
+import { User, UserRole, normalizeEmail } from '../entities/user.entity';
 import { CreateUserDto } from './dto/create-user.dto';
 
 @Injectable()
-export class UsersService {
+export class UsersService implements OnModuleInit {
+  private readonly logger = new Logger(UsersService.name);
+
   constructor(
     @InjectRepository(User)
     private usersRepository: Repository<User>,
   ) {}
 
+  // Fill emailNormalized for rows created before the column existed (or inserted outside the ORM)
+  async onModuleInit() {
+    try {
+      await this.usersRepository
+        .createQueryBuilder()
+        .update(User)
+        .set({ emailNormalized: () => 'LOWER(TRIM(email))' })
+        .where('"emailNormalized" IS NULL')
+        .execute();
+    } catch (error) {
+      // Two stored emails differing only in case make the bulk update fail as a whole: go row by row
+      await this.backfillNormalizedEmailsByRow();
+    }
+  }
+
+  private async backfillNormalizedEmailsByRow() {
+    const pending = await this.usersRepository.find({
+      where: { emailNormalized: IsNull() },
+      select: ['id', 'email'],
+    });
+
+    for (const user of pending) {
+      try {
+        await this.usersRepository.update(user.id, { emailNormalized: normalizeEmail(user.email) });
+      } catch (error) {
+        // Left NULL: findByEmail still matches it by its exact email until someone merges the accounts
+        this.logger.warn(`Could not normalize email of user ${user.id} (${user.email}): ${error.message}`);
+      }
+    }
+  }
+
   async create(createUserDto: CreateUserDto): Promise<User> {
     const user = this.usersRepository.create(createUserDto);
     return this.usersRepository.save(user);
@@ -29,12 +62,36 @@ export class UsersService {
     });
   }
 
+  // Case-insensitive through the unique emailNormalized index; rows the backfill could not
+  // normalize (case-only duplicates) still match on their exact email
+  private emailWhere(email: string): FindOptionsWhere<User>[] {
+    return [
+      { emailNormalized: normalizeEmail(email) },
+      { emailNormalized: IsNull(), email },
+    ];
+  }
+
   async findByEmail(email: string): Promise<User> {
     return this.usersRepository.findOne({
-      where: { email },
+      where: this.emailWhere(email),
     });
   }
 
+  // Existence checks (registration, invites) read nothing from the row
+  async existsByEmail(email: string): Promise<boolean> {
+    return this.usersRepository.exists({
+      where: this.emailWhere(email),
+    });
+  }
+
+  async findIdByEmail(email: string): Promise<string | null> {
+    const user = await this.usersRepository.findOne({
+      where: this.emailWhere(email),
+      select: ['id'],
+    });
+    return user ? user.id : null;
+  }
+
   async findPriests(): Promise<User[]> {
     return this.usersRepository.find({
       where: { role: UserRole.PRIEST, isActive: true },
@@ -48,6 +105,10 @@ export class UsersService {
       updateData.ordinationDate = new Date(updateData.ordinationDate);
     }
     
+    if (updateData.email) {
+      updateData.emailNormalized = normalizeEmail(updateData.email);
+    }
+
     await this.usersRepository.update(id, updateData);
     return this.findOne(id);
   }
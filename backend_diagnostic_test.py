@@ -5,20 +5,23 @@ Focus: Testing DELETE franjas and CANCEL confessions functionality
 Based on user report: "Botón eliminar franjas (sacerdote) no funciona" and "Botón cancelar confesiones (fiel) no funciona"
 """
 
-import requests
 import json
+import os
 import time
 from datetime import datetime, timedelta
 import uuid
 
+from harness import ApiClient, write_report
+
 # Configuration
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 class DiagnosticTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=15, log=self.log)
         self.priest_token = None
         self.faithful_token = None
         self.priest_user = None
@@ -33,29 +36,8 @@ class DiagnosticTester:
         print(f"[{timestamp}] {level}: {message}")
         
     def make_request(self, method, endpoint, data=None, token=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=15)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=15)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=15)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=15)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request failed: {e}", "ERROR")
-            return None
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
 
     def test_priest_login(self):
         """Test priest login with seed data"""
@@ -398,6 +380,7 @@ class DiagnosticTester:
 if __name__ == "__main__":
     tester = DiagnosticTester()
     passed, failed = tester.run_diagnostic_tests()
+    write_report(suite="DiagnosticTester", extra={"passed": passed, "failed": failed})
     
     # Exit with error code if any critical tests failed
     exit(0 if failed == 0 else 1)
\ No newline at end of file
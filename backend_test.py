@@ -5,20 +5,24 @@ Tests the NestJS backend for Catholic confession booking system
 Focus: Bishop Dashboard endpoints, Confession history, Role-based access control, and Navigation features
 """
 
-import requests
 import json
+import os
 import time
 from datetime import datetime, timedelta
 import uuid
 
+from harness import ApiClient, write_report
+from harness.runner import ResultLog, provides, requires, run_tests
+
 # Configuration
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 class ConfesAppTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
         # Test users from review request
         self.bishop_token = None
         self.priest_token = None
@@ -32,8 +36,8 @@ class ConfesAppTester:
         self.test_confession_id = None
         self.diocese_id = None
         self.parish_ids = []
-        # Results tracking
-        self.test_results = []
+        # Results tracking (ResultLog keeps rows in test order under parallel runs)
+        self.test_results = ResultLog()
         
     def log(self, message, level="INFO"):
         """Log test messages with timestamp"""
@@ -41,32 +45,12 @@ class ConfesAppTester:
         print(f"[{timestamp}] {level}: {message}")
         
     def make_request(self, method, endpoint, data=None, token=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request failed: {e}", "ERROR")
-            return None
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
 
     # ===== AUTHENTICATION TESTS FOR ALL ROLES =====
 
+    @provides("bishop_token", "bishop_user")
     def test_1_bishop_login(self):
         """Test 1: LOGIN AS BISHOP - obispo@diocesis.com"""
         self.log("👑 Test 1: LOGIN AS BISHOP - obispo@diocesis.com")
@@ -103,6 +87,7 @@ class ConfesAppTester:
             self.test_results.append(("Bishop Login", False, str(error_msg)))
             return False
 
+    @provides("priest_token", "priest_user")
     def test_2_priest_login(self):
         """Test 2: LOGIN AS PRIEST - padre.parroco@sanmiguel.es"""
         self.log("🔐 Test 2: LOGIN AS PRIEST - padre.parroco@sanmiguel.es")
@@ -139,6 +124,7 @@ class ConfesAppTester:
             self.test_results.append(("Priest Login", False, str(error_msg)))
             return False
 
+    @provides("faithful_token", "faithful_user")
     def test_3_faithful_login(self):
         """Test 3: LOGIN AS FAITHFUL - fiel1@ejemplo.com"""
         self.log("🙏 Test 3: LOGIN AS FAITHFUL - fiel1@ejemplo.com")
@@ -177,6 +163,8 @@ class ConfesAppTester:
 
     # ===== BISHOP DASHBOARD ENDPOINTS =====
 
+    @requires("bishop_token")
+    @provides("diocese_id")
     def test_4_get_dioceses(self):
         """Test 4: GET DIOCESES - /api/dioceses (Bishop Dashboard)"""
         if not self.bishop_token:
@@ -206,6 +194,8 @@ class ConfesAppTester:
             self.test_results.append(("GET Dioceses", False, str(error_msg)))
             return False
 
+    @requires("bishop_token")
+    @provides("parish_ids")
     def test_5_get_parishes(self):
         """Test 5: GET PARISHES - /api/parishes (Bishop Dashboard)"""
         if not self.bishop_token:
@@ -234,6 +224,7 @@ class ConfesAppTester:
             self.test_results.append(("GET Parishes", False, str(error_msg)))
             return False
 
+    @requires("bishop_token")
     def test_6_get_users_with_role_filtering(self):
         """Test 6: GET USERS WITH ROLE FILTERING - /api/users (Bishop Dashboard)"""
         if not self.bishop_token:
@@ -266,6 +257,7 @@ class ConfesAppTester:
             self.test_results.append(("GET Users with Role Filtering", False, str(error_msg)))
             return False
 
+    @requires("bishop_token")
     def test_7_get_priests_only(self):
         """Test 7: GET PRIESTS ONLY - /api/users/priests (Bishop Dashboard)"""
         if not self.bishop_token:
@@ -295,6 +287,7 @@ class ConfesAppTester:
 
     # ===== CONFESSION HISTORY ENDPOINTS =====
 
+    @requires("faithful_token")
     def test_8_get_confession_history_faithful(self):
         """Test 8: GET CONFESSION HISTORY - /api/confessions (Faithful User)"""
         if not self.faithful_token:
@@ -322,6 +315,7 @@ class ConfesAppTester:
             self.test_results.append(("GET Confession History (Faithful)", False, str(error_msg)))
             return False
 
+    @requires("priest_token")
     def test_9_get_confession_history_priest(self):
         """Test 9: GET CONFESSION HISTORY - /api/confessions (Priest User)"""
         if not self.priest_token:
@@ -351,6 +345,7 @@ class ConfesAppTester:
 
     # ===== CONFESSION BANDS OVERVIEW =====
 
+    @requires("priest_token")
     def test_10_get_priest_bands(self):
         """Test 10: GET PRIEST BANDS - /api/confession-bands/my-bands (Overview)"""
         if not self.priest_token:
@@ -380,6 +375,7 @@ class ConfesAppTester:
 
     # ===== CONFESSION BOOKING AND CONFIRMATION FLOW =====
 
+    @requires("faithful_token")
     def test_11_get_available_bands_faithful(self):
         """Test 11: GET AVAILABLE BANDS - /api/confession-bands/available (Faithful)"""
         if not self.faithful_token:
@@ -408,6 +404,8 @@ class ConfesAppTester:
             self.test_results.append(("GET Available Bands (Faithful)", False, str(error_msg)))
             return False
 
+    @requires("faithful_token")
+    @provides("test_confession_id")
     def test_12_book_confession_from_band(self):
         """Test 12: BOOK CONFESSION FROM BAND - POST /api/confession-bands/book"""
         if not self.faithful_token:
@@ -458,6 +456,7 @@ class ConfesAppTester:
             self.test_results.append(("Book Confession from Band", False, str(error_msg)))
             return False
 
+    @requires("faithful_token", after=("test_12_book_confession_from_band",))
     def test_13_cancel_confession_booking(self):
         """Test 13: CANCEL CONFESSION BOOKING - PATCH /api/confession-bands/bookings/:id/cancel"""
         if not self.faithful_token:
@@ -513,6 +512,7 @@ class ConfesAppTester:
 
     # ===== ROLE-BASED ACCESS CONTROL TESTS =====
 
+    @requires("priest_token")
     def test_14_role_based_access_bishop_endpoints(self):
         """Test 14: ROLE-BASED ACCESS - Bishop endpoints with different roles"""
         self.log("🔒 Test 14: ROLE-BASED ACCESS - Bishop endpoints with different roles")
@@ -537,6 +537,7 @@ class ConfesAppTester:
             self.test_results.append(("Role-based Access (Bishop endpoints)", False, "No priest token"))
             return False
 
+    @requires("faithful_token")
     def test_15_role_based_access_priest_endpoints(self):
         """Test 15: ROLE-BASED ACCESS - Priest endpoints with different roles"""
         self.log("🔒 Test 15: ROLE-BASED ACCESS - Priest endpoints with different roles")
@@ -561,6 +562,9 @@ class ConfesAppTester:
             self.test_results.append(("Role-based Access (Priest endpoints)", False, "No faithful token"))
             return False
 
+    # Runs after the booking flow so test 12 can never book the band under test
+    @requires("priest_token", after=("test_13_cancel_confession_booking",))
+    @provides("test_band_id", "created_band_ids")
     def test_3_create_new_band(self):
         """Test 3: CREATE NEW BAND - POST /api/confession-bands"""
         if not self.priest_token:
@@ -600,6 +604,7 @@ class ConfesAppTester:
             self.test_results.append(("CREATE New Band", False, str(error_msg)))
             return False
 
+    @requires("priest_token", "test_band_id")
     def test_4_verify_band_creation(self):
         """Test 4: VERIFY BAND CREATION - GET /api/confession-bands/my-bands"""
         if not self.priest_token or not self.test_band_id:
@@ -634,6 +639,7 @@ class ConfesAppTester:
             self.test_results.append(("VERIFY Band Creation", False, str(error_msg)))
             return False
 
+    @requires("priest_token", "test_band_id", after=("test_4_verify_band_creation",))
     def test_5_update_existing_band(self):
         """Test 5: UPDATE EXISTING BAND - PUT /api/confession-bands/my-bands/:id"""
         if not self.priest_token or not self.test_band_id:
@@ -675,6 +681,7 @@ class ConfesAppTester:
             self.test_results.append(("UPDATE Existing Band", False, str(error_msg)))
             return False
 
+    @requires("priest_token", "test_band_id", after=("test_5_update_existing_band",))
     def test_6_change_band_status_to_cancelled(self):
         """Test 6: CHANGE BAND STATUS TO CANCELLED - PATCH /api/confession-bands/my-bands/:id/status"""
         if not self.priest_token or not self.test_band_id:
@@ -706,6 +713,7 @@ class ConfesAppTester:
             self.test_results.append(("CHANGE Status to Cancelled", False, str(error_msg)))
             return False
 
+    @requires("priest_token", "test_band_id", after=("test_6_change_band_status_to_cancelled",))
     def test_7_change_band_status_to_available(self):
         """Test 7: CHANGE BAND STATUS TO AVAILABLE - PATCH /api/confession-bands/my-bands/:id/status"""
         if not self.priest_token or not self.test_band_id:
@@ -737,6 +745,7 @@ class ConfesAppTester:
             self.test_results.append(("CHANGE Status to Available", False, str(error_msg)))
             return False
 
+    @requires("priest_token", "test_band_id", after=("test_5_update_existing_band", "test_7_change_band_status_to_available"))
     def test_8_delete_band_with_foreign_key_fix(self):
         """Test 8: DELETE BAND - DELETE /api/confession-bands/my-bands/:id (FOREIGN KEY FIX)"""
         if not self.priest_token or not self.test_band_id:
@@ -767,6 +776,7 @@ class ConfesAppTester:
             self.test_results.append(("DELETE Band (Foreign Key Fix)", False, str(error_msg)))
             return False
 
+    @requires("priest_token")
     def test_9_create_band_with_validation_errors(self):
         """Test 9: CREATE BAND WITH VALIDATION ERRORS - Test proper validation"""
         if not self.priest_token:
@@ -828,7 +838,7 @@ class ConfesAppTester:
             except Exception as e:
                 self.log(f"⚠️ Error cleaning up band {band_id}: {e}")
 
-    def run_navigation_features_testing(self):
+    def run_navigation_features_testing(self, max_workers=8):
         """Run comprehensive testing for navigation features integration"""
         self.log("🚀 INICIANDO NAVIGATION FEATURES INTEGRATION TESTING")
         self.log("=" * 80)
@@ -869,20 +879,11 @@ class ConfesAppTester:
             ("19. DELETE BAND", self.test_8_delete_band_with_foreign_key_fix),
         ]
         
-        passed = 0
-        failed = 0
-        
-        for test_name, test_func in tests:
-            self.log(f"\n--- {test_name} ---")
-            try:
-                if test_func():
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.log(f"❌ {test_name} failed with exception: {e}", "ERROR")
-                failed += 1
-                self.test_results.append((test_name, False, f"Exception: {e}"))
+        # Independent tests run concurrently; each waits only for the tests
+        # providing the attributes it requires (see the @requires/@provides declarations)
+        outcomes = run_tests(tests, self.test_results, max_workers=max_workers, log=self.log)
+        passed = sum(1 for outcome in outcomes if outcome)
+        failed = len(outcomes) - passed
         
         # Cleanup
         self.cleanup_created_bands()
@@ -904,6 +905,7 @@ class ConfesAppTester:
 if __name__ == "__main__":
     tester = ConfesAppTester()
     passed, failed = tester.run_navigation_features_testing()
+    write_report(suite="ConfesAppTester", extra={"passed": passed, "failed": failed})
     
     # Exit with error code if any tests failed
     exit(0 if failed == 0 else 1)
\ No newline at end of file
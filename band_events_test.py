@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Backend API Testing Suite - BAND EVENTS
+Tests that booking through POST /confessions pushes the band's new seat count to
+subscribers of GET /confession-bands/public/events (server-sent events)
+Focus: ConfessionsService.create must publish like bookBand and cancel do
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from harness import ApiClient, get_session, write_report
+
+# Configuration
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
+HEADERS = {"Content-Type": "application/json"}
+# Seconds to wait for the band event after booking
+EVENT_TIMEOUT = 10
+
+class BandEventsTester:
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
+        # Test users
+        self.priest_token = None
+        self.priest_id = None
+        self.faithful_token = None
+        # Test data
+        self.test_band_id = None
+        self.stream = None
+        # Results tracking
+        self.test_results = []
+
+    def log(self, message, level="INFO"):
+        """Log test messages with timestamp"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {level}: {message}")
+
+    def make_request(self, method, endpoint, data=None, token=None):
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
+
+    def next_band_event(self):
+        """Read the stream until a 'band' event for the test band arrives (pings are skipped)"""
+        event = None
+        deadline = time.time() + EVENT_TIMEOUT
+        # chunk_size=1: the default 512-byte chunk would wait for more events than the server sends
+        for line in self.stream.iter_lines(chunk_size=1, decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "band":
+                data = json.loads(line[5:])
+                if data.get("bandId") == self.test_band_id:
+                    return data
+            if time.time() > deadline:
+                break
+        return None
+
+    # ===== BAND EVENTS SEQUENCE =====
+
+    def test_1_priest_login(self):
+        """Test 1: LOGIN AS PRIEST"""
+        self.log("🔐 Test 1: LOGIN AS PRIEST (padre.parroco@sanmiguel.es)")
+
+        login_data = {
+            "email": "padre.parroco@sanmiguel.es",
+            "password": "Pass123!"
+        }
+
+        response = self.make_request("POST", "/auth/login", login_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.priest_token = response.json()["access_token"]
+            self.priest_id = response.json()["user"]["id"]
+            self.log("✅ Priest login successful")
+            self.test_results.append(("Priest Login", True, "Login successful"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Priest login failed: {error_msg}", "ERROR")
+            self.test_results.append(("Priest Login", False, str(error_msg)))
+            return False
+
+    def test_2_register_faithful(self):
+        """Test 2: REGISTER A FAITHFUL USER"""
+        self.log("🙏 Test 2: REGISTER A FAITHFUL USER")
+
+        register_data = {
+            "email": f"events.{int(time.time())}@ejemplo.com",
+            "password": "Pass123!",
+            "firstName": "Fiel",
+            "lastName": "Events",
+        }
+
+        response = self.make_request("POST", "/auth/register", register_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.faithful_token = response.json()["access_token"]
+            self.log("✅ Faithful registered")
+            self.test_results.append(("Register Faithful", True, "User registered"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Faithful registration failed: {error_msg}", "ERROR")
+            self.test_results.append(("Register Faithful", False, str(error_msg)))
+            return False
+
+    def test_3_create_band(self):
+        """Test 3: CREATE BAND WITH maxCapacity = 2"""
+        self.log("📅 Test 3: CREATE BAND WITH maxCapacity=2")
+
+        # A few days ahead, so the 2-hour cancellation window never applies
+        start_time = (datetime.now() + timedelta(days=3)).replace(second=0, microsecond=0)
+        end_time = start_time + timedelta(minutes=30)
+
+        band_data = {
+            "startTime": start_time.isoformat() + "Z",
+            "endTime": end_time.isoformat() + "Z",
+            "location": "Confesionario Principal",
+            "maxCapacity": 2,
+            "notes": "Band for band events test",
+            "isRecurrent": False
+        }
+
+        response = self.make_request("POST", "/confession-bands", band_data, self.priest_token)
+
+        if response and response.status_code == 201 and response.json().get("id"):
+            self.test_band_id = response.json()["id"]
+            self.log(f"✅ Band created: {self.test_band_id}")
+            self.test_results.append(("Create Band", True, f"Band created with ID: {self.test_band_id}"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Band creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Band", False, str(error_msg)))
+            return False
+
+    def test_4_subscribe(self):
+        """Test 4: OPEN THE EVENT STREAM FILTERED BY PRIEST"""
+        self.log("📡 Test 4: SUBSCRIBE TO public/events")
+
+        # Headers arrive once the server has registered the subscription, so no event can be missed after this
+        self.stream = get_session().get(
+            f"{self.base_url}/confession-bands/public/events",
+            params={"priestId": self.priest_id},
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(5, EVENT_TIMEOUT),
+        )
+        content_type = self.stream.headers.get("Content-Type", "")
+
+        if self.stream.status_code == 200 and content_type.startswith("text/event-stream"):
+            self.log("✅ Event stream open")
+            self.test_results.append(("Subscribe", True, "text/event-stream open"))
+            return True
+        else:
+            details = f"status={self.stream.status_code}, Content-Type={content_type}"
+            self.log(f"❌ Cannot open event stream: {details}", "ERROR")
+            self.test_results.append(("Subscribe", False, details))
+            return False
+
+    def test_5_create_confession_emits_event(self):
+        """Test 5: POST /confessions PUBLISHES THE NEW SEAT COUNT"""
+        self.log("📝 Test 5: POST /confessions EMITS A BAND EVENT")
+
+        response = self.make_request("POST", "/confessions", {"confessionBandId": self.test_band_id},
+                                     self.faithful_token)
+
+        if not response or response.status_code != 201:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Confession creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Emits Event", False, str(error_msg)))
+            return False
+
+        data = self.next_band_event()
+
+        if data and data.get("currentBookings") == 1 and data.get("status") == "available":
+            self.log(f"✅ Band event received: {data}")
+            self.test_results.append(("Create Emits Event", True, "currentBookings=1, status=available"))
+            return True
+        else:
+            details = f"Event: {data}" if data else f"No band event within {EVENT_TIMEOUT}s"
+            self.log(f"❌ {details}", "ERROR")
+            self.test_results.append(("Create Emits Event", False, details))
+            return False
+
+    def cleanup(self):
+        """Close the stream and delete the test band"""
+        if self.stream is not None:
+            self.stream.close()
+
+        if not self.priest_token or not self.test_band_id:
+            return
+
+        response = self.make_request("DELETE", f"/confession-bands/my-bands/{self.test_band_id}", token=self.priest_token)
+        if response and response.status_code == 200:
+            self.log(f"🧹 Cleaned up band: {self.test_band_id}")
+        else:
+            self.log(f"⚠️ Could not clean up band: {self.test_band_id}")
+
+    def run_band_events_testing(self):
+        """Run the subscribe -> POST /confessions sequence"""
+        self.log("🚀 STARTING BAND EVENTS TESTING")
+        self.log("=" * 80)
+
+        tests = [
+            ("1. Priest Login", self.test_1_priest_login),
+            ("2. Register Faithful", self.test_2_register_faithful),
+            ("3. Create Band", self.test_3_create_band),
+            ("4. Subscribe", self.test_4_subscribe),
+            ("5. Create Emits Event", self.test_5_create_confession_emits_event),
+        ]
+
+        passed = 0
+        failed = 0
+
+        # Each step depends on the state left by the previous one
+        for test_name, test_func in tests:
+            self.log(f"\n--- {test_name} ---")
+            try:
+                if test_func():
+                    passed += 1
+                else:
+                    failed += 1
+                    break
+            except Exception as e:
+                self.log(f"❌ {test_name} failed with exception: {e}", "ERROR")
+                failed += 1
+                self.test_results.append((test_name, False, f"Exception: {e}"))
+                break
+
+        self.cleanup()
+
+        self.log("\n" + "=" * 80)
+        self.log("🏁 BAND EVENTS TESTING COMPLETED!")
+        self.log(f"✅ Passed: {passed}")
+        self.log(f"❌ Failed: {failed}")
+
+        self.log("\n📋 DETAILED RESULTS:")
+        for test_name, success, details in self.test_results:
+            status = "✅" if success else "❌"
+            self.log(f"{status} {test_name}: {details}")
+
+        return passed, failed
+
+if __name__ == "__main__":
+    tester = BandEventsTester()
+    passed, failed = tester.run_band_events_testing()
+    write_report(suite="BandEventsTester", extra={"passed": passed, "failed": failed})
+
+    # Exit with error code if booking did not reach subscribers
+    exit(0 if failed == 0 else 1)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Backend Benchmark - LAST-SEAT BOOKING CONTENTION
+Measures ConfessionBandsService.bookBand under concurrent load
+Focus: N simultaneous POST /api/confession-bands/book calls racing for the last free
+seats of a band with a known maxCapacity (built on the delete_bug_test.py flow)
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from harness import ApiClient, write_report
+from harness.metrics import percentile
+
+# Configuration
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
+HEADERS = {"Content-Type": "application/json"}
+
+class BookingContentionTester:
+    def __init__(self, bookers=20, capacity=5, prefill=3, base_url=BASE_URL):
+        self.base_url = base_url
+        self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
+        # Scenario shape: `prefill` seats are taken sequentially, then `bookers`
+        # faithful race for the remaining capacity - prefill seats
+        self.bookers = bookers
+        self.capacity = capacity
+        self.prefill = min(prefill, capacity - 1)
+        # Test users
+        self.priest_token = None
+        self.faithful_tokens = []
+        # Test data
+        self.test_band_id = None
+        self.booking_outcomes = []
+        self.burst_duration = 0.0
+        # Results tracking
+        self.test_results = []
+        self.metrics = {}
+
+    def log(self, message, level="INFO"):
+        """Log test messages with timestamp"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {level}: {message}")
+
+    def make_request(self, method, endpoint, data=None, token=None):
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
+
+    # ===== LAST-SEAT CONTENTION SEQUENCE =====
+
+    def test_1_priest_login(self):
+        """Test 1: LOGIN AS PRIEST"""
+        self.log("🔐 Test 1: LOGIN AS PRIEST (padre.parroco@sanmiguel.es)")
+
+        login_data = {
+            "email": "padre.parroco@sanmiguel.es",
+            "password": "Pass123!"
+        }
+
+        response = self.make_request("POST", "/auth/login", login_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.priest_token = response.json()["access_token"]
+            self.log("✅ Priest login successful")
+            self.test_results.append(("Priest Login", True, "Login successful"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Priest login failed: {error_msg}", "ERROR")
+            self.test_results.append(("Priest Login", False, str(error_msg)))
+            return False
+
+    def test_2_register_faithful_users(self):
+        """Test 2: REGISTER ONE FAITHFUL PER BOOKING (bookBand rejects duplicate bookers)"""
+        needed = self.prefill + self.bookers
+        self.log(f"🙏 Test 2: REGISTER {needed} FAITHFUL USERS")
+
+        run_id = int(time.time())
+        for i in range(needed):
+            register_data = {
+                "email": f"contention.{run_id}.{i}@ejemplo.com",
+                "password": "Pass123!",
+                "firstName": "Fiel",
+                "lastName": f"Contention {i}",
+            }
+
+            response = self.make_request("POST", "/auth/register", register_data)
+
+            if response and response.status_code == 201 and response.json().get("access_token"):
+                self.faithful_tokens.append(response.json()["access_token"])
+            else:
+                error_msg = response.json() if response else "No response"
+                self.log(f"❌ Faithful {i} registration failed: {error_msg}", "ERROR")
+
+        if len(self.faithful_tokens) == needed:
+            self.log(f"✅ Registered {needed} faithful users")
+            self.test_results.append(("Register Faithful Users", True, f"{needed} users registered"))
+            return True
+        else:
+            self.test_results.append(("Register Faithful Users", False, f"Only {len(self.faithful_tokens)}/{needed} registered"))
+            return False
+
+    def test_3_create_band_with_known_capacity(self):
+        """Test 3: CREATE BAND WITH KNOWN maxCapacity"""
+        if not self.priest_token:
+            self.log("❌ Cannot create band: No priest token", "ERROR")
+            self.test_results.append(("Create Contention Band", False, "No priest token"))
+            return False
+
+        self.log(f"📅 Test 3: CREATE BAND WITH maxCapacity={self.capacity}")
+
+        # A few days ahead, so the 2-hour cancellation window never applies
+        start_time = (datetime.now() + timedelta(days=3)).replace(second=0, microsecond=0)
+        end_time = start_time + timedelta(minutes=30)
+
+        band_data = {
+            "startTime": start_time.isoformat() + "Z",
+            "endTime": end_time.isoformat() + "Z",
+            "location": "Confesionario Principal",
+            "maxCapacity": self.capacity,
+            "notes": "Band for last-seat contention benchmark",
+            "isRecurrent": False
+        }
+
+        response = self.make_request("POST", "/confession-bands", band_data, self.priest_token)
+
+        if response and response.status_code == 201 and response.json().get("id"):
+            self.test_band_id = response.json()["id"]
+            self.log(f"✅ Contention band created: {self.test_band_id}")
+            self.test_results.append(("Create Contention Band", True, f"Band created with ID: {self.test_band_id}"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Band creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Contention Band", False, str(error_msg)))
+            return False
+
+    def test_4_prefill_seats(self):
+        """Test 4: TAKE ALL BUT THE LAST SEATS SEQUENTIALLY"""
+        if not self.test_band_id or len(self.faithful_tokens) < self.prefill:
+            self.test_results.append(("Prefill Seats", False, "Missing band or faithful tokens"))
+            return False
+
+        self.log(f"📝 Test 4: PREFILL {self.prefill}/{self.capacity} SEATS")
+
+        for token in self.faithful_tokens[:self.prefill]:
+            response = self.make_request("POST", "/confession-bands/book", {"bandId": self.test_band_id}, token)
+            if not response or response.status_code != 201:
+                error_msg = response.json() if response else "No response"
+                self.log(f"❌ Prefill booking failed: {error_msg}", "ERROR")
+                self.test_results.append(("Prefill Seats", False, str(error_msg)))
+                return False
+
+        self.log(f"✅ {self.capacity - self.prefill} seat(s) left for {self.bookers} concurrent bookers")
+        self.test_results.append(("Prefill Seats", True, f"{self.prefill} seats taken"))
+        return True
+
+    def test_5_concurrent_last_seat_bookings(self):
+        """Test 5: FIRE N SIMULTANEOUS BOOKINGS AT THE LAST FREE SEATS"""
+        tokens = self.faithful_tokens[self.prefill:]
+        if not self.test_band_id or len(tokens) < self.bookers:
+            self.test_results.append(("Concurrent Bookings", False, "Missing band or faithful tokens"))
+            return False
+
+        self.log(f"🚨 Test 5: {self.bookers} SIMULTANEOUS POST /confession-bands/book")
+
+        # Every worker waits on the barrier so the requests leave together
+        barrier = threading.Barrier(self.bookers)
+
+        def book(token):
+            barrier.wait()
+            started = time.perf_counter()
+            response = self.make_request("POST", "/confession-bands/book", {"bandId": self.test_band_id}, token)
+            elapsed = time.perf_counter() - started
+            return (response.status_code if response is not None else None), elapsed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.bookers) as executor:
+            self.booking_outcomes = list(executor.map(book, tokens[:self.bookers]))
+        self.burst_duration = time.perf_counter() - started
+
+        accepted = sum(1 for status, _ in self.booking_outcomes if status == 201)
+        rejected = sum(1 for status, _ in self.booking_outcomes if status == 400)
+        # Transport failures (no response) and any other status: the race was not measured for these
+        errors = len(self.booking_outcomes) - accepted - rejected
+        remaining = self.capacity - self.prefill
+        summary = f"{accepted} accepted, {rejected} rejected, {errors} errors"
+
+        if errors == 0 and accepted <= remaining:
+            self.log(f"✅ Burst finished in {self.burst_duration:.3f}s: {summary}")
+            self.test_results.append(("Concurrent Bookings", True, summary))
+            return True
+        else:
+            codes = sorted(str(status) for status, _ in self.booking_outcomes if status not in (201, 400))
+            self.log(f"❌ Burst finished in {self.burst_duration:.3f}s: {summary} "
+                     f"({remaining} seat(s) left; other outcomes: {', '.join(codes) or 'none'})", "ERROR")
+            self.test_results.append(("Concurrent Bookings", False, f"{summary} for {remaining} free seat(s)"))
+            return False
+
+    def test_6_verify_no_overbooking(self):
+        """Test 6: COMPARE CONFESSIONS CREATED WITH maxCapacity"""
+        if not self.priest_token or not self.test_band_id:
+            self.test_results.append(("Verify No Overbooking", False, "Missing token or band ID"))
+            return False
+
+        self.log("🔍 Test 6: VERIFY NO OVERBOOKING")
+
+        response = self.make_request("GET", f"/confession-bands/my-bands/{self.test_band_id}", token=self.priest_token)
+
+        if not response or response.status_code != 200:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Cannot read band: {error_msg}", "ERROR")
+            self.test_results.append(("Verify No Overbooking", False, str(error_msg)))
+            return False
+
+        band = response.json()
+        booked = [c for c in band.get("confessions", []) if c.get("status") == "booked"]
+        latencies = [elapsed for _, elapsed in self.booking_outcomes]
+        accepted = sum(1 for status, _ in self.booking_outcomes if status == 201)
+
+        self.metrics = {
+            "bookers": self.bookers,
+            "max_capacity": band.get("maxCapacity"),
+            "prefilled": self.prefill,
+            "accepted": accepted,
+            "errors": sum(1 for status, _ in self.booking_outcomes if status not in (201, 400)),
+            "confessions_created": len(booked),
+            "current_bookings": band.get("currentBookings"),
+            "band_status": band.get("status"),
+            "overbooked_by": max(0, len(booked) - band.get("maxCapacity", 0)),
+            "burst_duration_s": self.burst_duration,
+            "throughput_rps": (len(self.booking_outcomes) / self.burst_duration) if self.burst_duration else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+        self.log(f"📊 Confessions created: {len(booked)} / maxCapacity {band.get('maxCapacity')} "
+                 f"(currentBookings={band.get('currentBookings')}, status={band.get('status')})")
+        self.log(f"📊 Throughput: {self.metrics['throughput_rps']:.2f} req/s | "
+                 f"p50 {self.metrics['p50_ms']:.0f}ms | p99 {self.metrics['p99_ms']:.0f}ms")
+
+        consistent = (len(booked) <= band.get("maxCapacity", 0)
+                      and band.get("currentBookings") == len(booked))
+
+        if consistent:
+            self.log("✅ No overbooking: confessions and currentBookings match capacity")
+            self.test_results.append(("Verify No Overbooking", True, f"{len(booked)}/{band.get('maxCapacity')} seats booked"))
+            return True
+        else:
+            self.log(f"❌ OVERBOOKING DETECTED: {len(booked)} confessions, currentBookings={band.get('currentBookings')}", "ERROR")
+            self.test_results.append(("Verify No Overbooking", False,
+                                      f"{len(booked)} confessions vs maxCapacity {band.get('maxCapacity')}, "
+                                      f"currentBookings={band.get('currentBookings')}"))
+            return False
+
+    def cleanup_band(self):
+        """Delete the contention band (cancels its bookings)"""
+        if not self.priest_token or not self.test_band_id:
+            return
+
+        response = self.make_request("DELETE", f"/confession-bands/my-bands/{self.test_band_id}", token=self.priest_token)
+        if response and response.status_code == 200:
+            self.log(f"🧹 Cleaned up band: {self.test_band_id}")
+        else:
+            self.log(f"⚠️ Could not clean up band: {self.test_band_id}")
+
+    def run_contention_benchmark(self):
+        """Run the last-seat contention scenario"""
+        self.log("🚀 STARTING LAST-SEAT BOOKING CONTENTION BENCHMARK")
+        self.log("=" * 80)
+
+        tests = [
+            ("1. Priest Login", self.test_1_priest_login),
+            ("2. Register Faithful Users", self.test_2_register_faithful_users),
+            ("3. Create Contention Band", self.test_3_create_band_with_known_capacity),
+            ("4. Prefill Seats", self.test_4_prefill_seats),
+            ("5. CONCURRENT LAST-SEAT BOOKINGS", self.test_5_concurrent_last_seat_bookings),
+            ("6. VERIFY NO OVERBOOKING", self.test_6_verify_no_overbooking),
+        ]
+
+        passed = 0
+        failed = 0
+
+        for test_name, test_func in tests:
+            self.log(f"\n--- {test_name} ---")
+            try:
+                if test_func():
+                    passed += 1
+                else:
+                    failed += 1
+                    break
+            except Exception as e:
+                self.log(f"❌ {test_name} failed with exception: {e}", "ERROR")
+                failed += 1
+                self.test_results.append((test_name, False, f"Exception: {e}"))
+                break
+
+        self.cleanup_band()
+
+        self.log("\n" + "=" * 80)
+        self.log("🏁 LAST-SEAT CONTENTION BENCHMARK COMPLETED!")
+        self.log(f"✅ Passed: {passed}")
+        self.log(f"❌ Failed: {failed}")
+
+        self.log("\n📋 DETAILED RESULTS:")
+        for test_name, success, details in self.test_results:
+            status = "✅" if success else "❌"
+            self.log(f"{status} {test_name}: {details}")
+
+        return passed, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Last-seat contention benchmark for POST /confession-bands/book")
+    parser.add_argument("--bookers", type=int, default=20, help="simultaneous booking requests")
+    parser.add_argument("--capacity", type=int, default=5, help="maxCapacity of the contention band")
+    parser.add_argument("--prefill", type=int, default=3, help="seats taken before the burst")
+    args = parser.parse_args()
+
+    tester = BookingContentionTester(bookers=args.bookers, capacity=args.capacity, prefill=args.prefill)
+    passed, failed = tester.run_contention_benchmark()
+    write_report(suite="BookingContentionTester", extra={"passed": passed, "failed": failed, "contention": tester.metrics})
+
+    # Exit with error code if the scenario failed or overbooked
+    exit(1 if failed > 0 else 0)
@@ -5,20 +5,23 @@ Tests the NestJS backend for Catholic confession booking system
 Focus: Testing critical delete bug fix for ConfessionBand deletion with foreign key constraints
 """
 
-import requests
 import json
+import os
 import time
 from datetime import datetime, timedelta
 import uuid
 
+from harness import ApiClient, write_report
+
 # Configuration
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 class ConfesAppDeleteBugTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
         # Test users from review request
         self.priest_token = None
         self.faithful_token = None
@@ -37,30 +40,12 @@ class ConfesAppDeleteBugTester:
         print(f"[{timestamp}] {level}: {message}")
         
     def make_request(self, method, endpoint, data=None, token=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
+        """Make HTTP request through the shared pooled client"""
+        response = self.client.request(method, endpoint, data, token)
+
+        if response is not None:
             self.log(f"Request: {method} {endpoint} -> {response.status_code}")
-            return response
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request failed: {e}", "ERROR")
-            return None
+        return response
 
     # ===== CRITICAL DELETE BUG FIX TESTING SEQUENCE =====
 
@@ -487,6 +472,7 @@ class ConfesAppDeleteBugTester:
 if __name__ == "__main__":
     tester = ConfesAppDeleteBugTester()
     passed, failed = tester.run_delete_bug_fix_testing()
+    write_report(suite="ConfesAppDeleteBugTester", extra={"passed": passed, "failed": failed})
     
     # Exit with error code if any critical tests failed
     exit(0 if failed == 0 else 1)
\ No newline at end of file
@@ -5,20 +5,23 @@ Tests specific issues reported by user in frontend integration
 Focus: Franjas de confesión, validaciones, eliminación, datos existentes
 """
 
-import requests
 import json
+import os
 import time
 from datetime import datetime, timedelta
 import uuid
 
+from harness import ApiClient, write_report
+
 # Configuration
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 class ConfesAppDiagnosticTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=15, log=self.log)
         # Test users from review request
         self.priest_token = None
         self.faithful_token = None
@@ -35,29 +38,8 @@ class ConfesAppDiagnosticTester:
         print(f"[{timestamp}] {level}: {message}")
         
     def make_request(self, method, endpoint, data=None, token=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=15)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=15)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=15)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=15)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request failed: {e}", "ERROR")
-            return None
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
 
     def test_1_priest_login(self):
         """Test 1: LOGIN COMO SACERDOTE SEED"""
@@ -472,6 +454,7 @@ class ConfesAppDiagnosticTester:
 if __name__ == "__main__":
     tester = ConfesAppDiagnosticTester()
     passed, failed = tester.run_diagnostic_sequence()
+    write_report(suite="ConfesAppDiagnosticTester", extra={"passed": passed, "failed": failed})
     
     # Exit with error code if any tests failed
     exit(0 if failed == 0 else 1)
\ No newline at end of file
@@ -6,38 +6,23 @@ Testing ONLY the specific issues reported by user:
 2. PATCH /api/confessions/:id/cancel (faithful confession cancellation)
 """
 
-import requests
 import json
+import os
 from datetime import datetime, timedelta
 
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+from harness import ApiClient, write_report
+
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 def log(message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] {message}")
 
+_client = ApiClient(BASE_URL, HEADERS, timeout=10, log=lambda message, level="INFO": log(f"❌ {message}"))
+
 def make_request(method, endpoint, data=None, token=None):
-    url = f"{BASE_URL}{endpoint}"
-    headers = HEADERS.copy()
-    
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-        
-    try:
-        if method == "GET":
-            response = requests.get(url, headers=headers, timeout=10)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, json=data, timeout=10)
-        elif method == "PATCH":
-            response = requests.patch(url, headers=headers, json=data, timeout=10)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, timeout=10)
-        
-        return response
-    except Exception as e:
-        log(f"❌ Request failed: {e}")
-        return None
+    return _client.request(method, endpoint, data, token)
 
 def main():
     log("🚀 FOCUSED DIAGNOSTIC TEST - DELETE & CANCEL FUNCTIONALITY")
@@ -166,4 +151,5 @@ def main():
         log("❌ Both APIs have issues - backend problems confirmed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    write_report(suite="focused_diagnostic_test")
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""
+ConfesApp test harness - shared building blocks for the backend test scripts
+"""
+
+from harness.auth import TOKENS, TokenCache
+from harness.client import ApiClient, get_session
+from harness.metrics import REGISTRY, route_template, write_report
+from harness.standin import start_server
+
+__all__ = ["ApiClient", "get_session", "TOKENS", "TokenCache", "REGISTRY", "route_template", "write_report", "start_server"]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+On-disk JWT cache shared by every harness script
+POST /auth/login costs a bcrypt compare on the server, so login responses are
+cached per (base URL, email) and reused until shortly before the token's `exp`;
+a 401 on a cached token forces a refresh
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+CACHE_PATH = os.environ.get(
+    "CONFESAPP_TOKEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "confesapp", "tokens.json"),
+)
+ENABLED = os.environ.get("CONFESAPP_TOKEN_CACHE_ENABLED", "1") != "0"
+
+# Treat tokens as expired this many seconds before their real `exp`
+EXPIRY_MARGIN = 60
+
+
+def _fingerprint(password):
+    """Cache hits must match the password too, so failed-login tests still fail"""
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def token_expiry(token):
+    """Decode the JWT payload (no signature check) and return its `exp`, or None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+class TokenCache:
+    """Login responses keyed by 'base_url|email', persisted as JSON"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+        # Stale token -> replacement, so testers holding an old token keep working
+        self._replacements = {}
+        self._credentials = {}
+
+    @staticmethod
+    def key(base_url, email):
+        return f"{base_url.rstrip('/')}|{email.strip().lower()}"
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as handle:
+                    self._entries = json.load(handle)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        # Atomic replace, so concurrent scripts never read a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(self._entries, handle)
+        os.replace(tmp_path, self.path)
+
+    def get(self, base_url, email, password):
+        """Cached login body for this user, or None when missing or about to expire"""
+        with self._lock:
+            entry = self._load().get(self.key(base_url, email))
+        if not entry or entry.get("password") != _fingerprint(password):
+            return None
+        exp = entry.get("exp")
+        if exp is not None and exp - EXPIRY_MARGIN <= time.time():
+            return None
+        self._credentials[entry["body"]["access_token"]] = (base_url, email, password)
+        return entry["body"]
+
+    def put(self, base_url, email, password, body):
+        token = body.get("access_token")
+        if not token:
+            return
+        with self._lock:
+            # Re-read first so logins cached by other scripts are not overwritten
+            self._entries = None
+            entries = self._load()
+            previous = entries.get(self.key(base_url, email))
+            if previous and previous["body"].get("access_token") != token:
+                self._replacements[previous["body"]["access_token"]] = token
+            entries[self.key(base_url, email)] = {
+                "body": body,
+                "exp": token_expiry(token),
+                "password": _fingerprint(password),
+            }
+            self._save()
+        # Passwords stay in memory only; they are needed to re-login on a 401
+        self._credentials[token] = (base_url, email, password)
+
+    def credentials_for(self, token):
+        """(base_url, email, password) behind a token seen by this process, if known"""
+        return self._credentials.get(token)
+
+    def current(self, token):
+        """Follow refreshes so a stale token resolves to the newest one"""
+        seen = set()
+        while token in self._replacements and token not in seen:
+            seen.add(token)
+            token = self._replacements[token]
+        return token
+
+    def invalidate(self, base_url, email):
+        with self._lock:
+            if self._load().pop(self.key(base_url, email), None) is not None:
+                self._save()
+
+
+# Process-wide cache used by ApiClient
+TOKENS = TokenCache()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Record/replay cassettes for requests made through make_request
+    CONFESAPP_CASSETTE_MODE=record python backend_test.py   # hits BASE_URL, saves cassette
+    CONFESAPP_CASSETTE_MODE=replay python backend_test.py   # no network, served from cassette
+    CONFESAPP_CASSETTE_LOOSE=1 ...                           # replay may fall back to the route template
+Cassettes are gzipped JSON under cassettes/<script>.json.gz unless
+CONFESAPP_CASSETTE points elsewhere (cassettes/ is git-ignored). Recorded bodies
+carry no live credentials: JWT signatures and Authorization values are redacted
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+from harness.metrics import route_template
+
+MODE = os.environ.get("CONFESAPP_CASSETTE_MODE", "off").lower()
+# Matching by route template can answer /confessions/<id> with another id's recording: opt-in only
+LOOSE = os.environ.get("CONFESAPP_CASSETTE_LOOSE", "0").lower() in ("1", "true", "yes")
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cassettes")
+
+
+REDACTED = "redacted"
+SECRET_KEYS = frozenset(["access_token", "authorization"])
+BEARER = re.compile(r"Bearer\s+[\w.~+/=-]+")
+
+
+def redact_token(token):
+    """Keep header and payload (claims and `exp` stay readable on replay), drop the signature"""
+    parts = token.split(".") if isinstance(token, str) else []
+    return ".".join(parts[:2] + [REDACTED]) if len(parts) == 3 else REDACTED
+
+
+def redact(value):
+    """Copy of a decoded JSON body with tokens and Authorization values made unusable"""
+    if isinstance(value, dict):
+        return {key: redact_token(item) if key.lower() in SECRET_KEYS else redact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return BEARER.sub(f"Bearer {REDACTED}", value)
+    return value
+
+
+def redact_content(content):
+    text = content.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(redact(json.loads(text)), ensure_ascii=False)
+    except ValueError:
+        return BEARER.sub(f"Bearer {REDACTED}", text)
+
+
+class CassetteMiss(LookupError):
+    """A replayed request that was never recorded"""
+
+    def __init__(self, method, endpoint, path):
+        super().__init__(f"No recording for {method} {endpoint} in {path} "
+                         f"(re-record, or set CONFESAPP_CASSETTE_LOOSE=1 to match by route)")
+
+
+def default_path():
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "harness"))[0] or "harness"
+    return os.environ.get("CONFESAPP_CASSETTE", os.path.join(CASSETTE_DIR, f"{script}.json.gz"))
+
+
+def body_digest(data):
+    """Short stable digest of a JSON request body ('' when there is none)"""
+    if data is None:
+        return ""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+class Cassette:
+    """
+    Ordered request/response pairs. Replay matches on method + endpoint + body
+    first, then method + endpoint (and, when loose, method + route template),
+    consuming recorded responses in order so repeated calls replay their own answers.
+    """
+
+    def __init__(self, path=None, mode=MODE, loose=LOOSE):
+        self.path = path or default_path()
+        self.mode = mode
+        self.loose = loose
+        self.entries = []
+        self._queues = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+        if self.replaying:
+            self._load()
+        elif self.recording:
+            atexit.register(self.save)
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            self.entries = json.load(handle)["interactions"]
+
+        for entry in self.entries:
+            for key in self._keys(entry["method"], entry["endpoint"], entry["body"]):
+                self._queues.setdefault(key, []).append(entry)
+
+    def _keys(self, method, endpoint, digest):
+        keys = [("body", method, endpoint, digest), ("endpoint", method, endpoint)]
+        if self.loose:
+            keys.append(("route", method, route_template(endpoint)))
+        return keys
+
+    def record(self, method, endpoint, data, status, content_type, content):
+        with self._lock:
+            self.entries.append({
+                "method": method,
+                "endpoint": endpoint,
+                "body": body_digest(data),
+                "status": status,
+                "content_type": content_type,
+                "content": redact_content(content),
+            })
+
+    def play(self, method, endpoint, data):
+        """Recorded (status, content_type, content) for this request; CassetteMiss if there is none"""
+        with self._lock:
+            for key in self._keys(method, endpoint, body_digest(data)):
+                queue = self._queues.get(key)
+                if queue:
+                    # Walk forward through repeated calls, then keep serving the last answer
+                    position = self._positions.get(key, 0)
+                    entry = queue[min(position, len(queue) - 1)]
+                    self._positions[key] = position + 1
+                    return entry["status"], entry["content_type"], entry["content"].encode("utf-8")
+        raise CassetteMiss(method, endpoint, self.path)
+
+    def save(self):
+        if not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", encoding="utf-8") as handle:
+            json.dump({"version": 1, "interactions": self.entries}, handle, separators=(",", ":"), ensure_ascii=False)
+
+
+_cassette = None
+
+
+def get_cassette():
+    """Process-wide cassette, or None when CONFESAPP_CASSETTE_MODE is off"""
+    global _cassette
+    if MODE not in ("record", "replay"):
+        return None
+    if _cassette is None:
+        _cassette = Cassette()
+    return _cassette
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP client shared by every ConfesApp test script
+One keep-alive requests.Session per process, so a suite run pays for the
+TCP/TLS handshake to BASE_URL once instead of on every call
+"""
+
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from harness.auth import ENABLED as TOKEN_CACHE_ENABLED, TOKENS
+from harness.cassette import CassetteMiss, get_cassette
+from harness.metrics import REGISTRY
+
+# Configuration (overridable from the environment)
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
+POOL_SIZE = int(os.environ.get("CONFESAPP_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.environ.get("CONFESAPP_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.environ.get("CONFESAPP_BACKOFF_FACTOR", "0.3"))
+
+# Only verbs that are safe to replay are retried; POST and PATCH never are
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+RETRY_STATUSES = (502, 503, 504)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session(pool_size, max_retries, backoff_factor):
+    """Create a Session whose adapters keep up to pool_size connections alive"""
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(pool_size=None, max_retries=None, backoff_factor=None):
+    """Return the process-wide Session, creating it on first use (and again after fork)"""
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _build_session(
+                pool_size or POOL_SIZE,
+                MAX_RETRIES if max_retries is None else max_retries,
+                BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+            )
+            _session_pid = os.getpid()
+        return _session
+
+
+class ApiClient:
+    """Thin wrapper around the shared Session with the testers' make_request contract"""
+
+    def __init__(self, base_url, headers=None, timeout=30, log=None, token_cache=TOKEN_CACHE_ENABLED):
+        self.base_url = base_url
+        self.headers = dict(headers or {"Content-Type": "application/json"})
+        self.timeout = timeout
+        self.log = log
+        self.cassette = get_cassette()
+        # Logins must reach the cassette layer to be recorded and replayed
+        self.token_cache = token_cache and self.cassette is None
+        self.session = get_session()
+
+    def request(self, method, endpoint, data=None, token=None):
+        """Send a request; returns the Response, or None when the transport fails"""
+        method = method.upper()
+        if method not in ("GET", "POST", "PATCH", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        if self.token_cache:
+            if method == "POST" and endpoint == "/auth/login" and isinstance(data, dict):
+                return self._login(data)
+            if token:
+                token = TOKENS.current(token)
+
+        response = self._send(method, endpoint, data, token)
+
+        # A cached token the server no longer accepts: log in again and retry once
+        if self.token_cache and token and response is not None and response.status_code == 401:
+            refreshed = self._refresh(token)
+            if refreshed:
+                response = self._send(method, endpoint, data, refreshed)
+
+        return response
+
+    def _send(self, method, endpoint, data, token):
+        url = f"{self.base_url}{endpoint}"
+        headers = self.headers.copy()
+
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        # Bodies are only sent on verbs that carry one, as the original helpers did
+        body = data if method in ("POST", "PATCH", "PUT") else None
+
+        if self.cassette and self.cassette.replaying:
+            return self._replay(method, endpoint, body)
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            REGISTRY.record(method, endpoint, time.perf_counter() - started)
+            if self.log:
+                self.log(f"Request failed: {e}", "ERROR")
+            return None
+
+        # Reading .content here keeps body download inside the timed window
+        REGISTRY.record(method, endpoint, time.perf_counter() - started, response.status_code, len(response.content))
+
+        if self.cassette and self.cassette.recording:
+            self.cassette.record(method, endpoint, body, response.status_code,
+                                 response.headers.get("Content-Type", ""), response.content)
+        return response
+
+    def _replay(self, method, endpoint, body):
+        started = time.perf_counter()
+        try:
+            status, content_type, content = self.cassette.play(method, endpoint, body)
+        except CassetteMiss as e:
+            # Not a transport failure: the test must stop here rather than read None as "no response"
+            REGISTRY.record(method, endpoint, time.perf_counter() - started)
+            if self.log:
+                self.log(str(e), "ERROR")
+            raise
+
+        REGISTRY.record(method, endpoint, time.perf_counter() - started, status, len(content))
+        return self._build_response(status, endpoint, content, content_type)
+
+    def _login(self, data):
+        """POST /auth/login served from the token cache while the JWT is still valid"""
+        email, password = data.get("email"), data.get("password")
+        if not email or not password:
+            return self._send("POST", "/auth/login", data, None)
+
+        cached = TOKENS.get(self.base_url, email, password)
+        if cached:
+            return self._cached_response(cached)
+
+        response = self._send("POST", "/auth/login", data, None)
+        if response is not None and response.status_code == 201:
+            TOKENS.put(self.base_url, email, password, response.json())
+        return response
+
+    def _refresh(self, token):
+        credentials = TOKENS.credentials_for(token)
+        if not credentials or credentials[0] != self.base_url:
+            return None
+
+        _, email, password = credentials
+        response = self._send("POST", "/auth/login", {"email": email, "password": password}, None)
+        if response is None or response.status_code != 201:
+            return None
+
+        body = response.json()
+        TOKENS.put(self.base_url, email, password, body)
+        return body.get("access_token")
+
+    def _cached_response(self, body):
+        """Build the Response a real login would have returned"""
+        return self._build_response(201, "/auth/login", json.dumps(body).encode("utf-8"))
+
+    def _build_response(self, status, endpoint, content, content_type="application/json; charset=utf-8"):
+        """A requests.Response carrying a body that did not come off the wire"""
+        response = requests.Response()
+        response.status_code = status
+        response.url = f"{self.base_url}{endpoint}"
+        response.headers["Content-Type"] = content_type
+        response.encoding = "utf-8"
+        response._content = content
+        return response
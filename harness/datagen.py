@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Synthetic Data Generator - SCALE POPULATIONS
+Writes dioceses -> parishes -> priests -> faithful -> bands -> confessions straight
+into the TypeORM SQLite schema (backend/confes_app.db), next to the seed.ts data.
+
+Rows are a pure function of (seed, kind, chunk): ids are uuid5s of the row index,
+so chunks can be built on a process pool in any order, and every committed chunk
+is recorded in a progress table in the same transaction. Re-running the same
+command (same day, sizes and seed) resumes where an interrupted run stopped;
+growing a population keeps the users already written and adds the rest.
+
+Usage:
+    python -m harness.datagen --scale small
+    python -m harness.datagen --scale large --workers 8      # 50 dioceses ... 10M confessions
+    python -m harness.datagen --bands 500000 --confessions 2000000 --db /tmp/confes_app.db
+
+Every generated account logs in with Pass123!, e.g. gen.faithful.42@confesapp.test
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+DB_PATH = os.environ.get(
+    "CONFESAPP_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "confes_app.db"),
+)
+EMAIL_DOMAIN = "confesapp.test"
+
+# bcrypt('Pass123!', 12), same password as the seed.ts accounts
+PASSWORD = "Pass123!"
+PASSWORD_HASH = "$2b$12$ZUzQI9GwWDk4xmujk7HxA.ZdvYeWRVs.NjdKOnfqvwT7m1M76jXPG"
+
+SCALES = {
+    "small": {"dioceses": 2, "parishes": 20, "priests": 60, "faithful": 2_000,
+              "bands": 5_000, "confessions": 20_000},
+    "medium": {"dioceses": 10, "parishes": 500, "priests": 2_000, "faithful": 50_000,
+               "bands": 200_000, "confessions": 1_000_000},
+    "large": {"dioceses": 50, "parishes": 5_000, "priests": 20_000, "faithful": 500_000,
+              "bands": 2_000_000, "confessions": 10_000_000},
+}
+
+# Relative weight of each start hour: mornings, and a strong Saturday-evening-style peak
+HOUR_WEIGHTS = {9: 2, 10: 3, 11: 3, 12: 2, 16: 2, 17: 4, 18: 6, 19: 6, 20: 3}
+# Lent / Holy Week and Advent carry most of the yearly demand
+MONTH_WEIGHTS = {1: 0.8, 2: 1.0, 3: 2.0, 4: 2.5, 5: 0.9, 6: 0.8, 7: 0.6, 8: 0.6,
+                 9: 0.8, 10: 0.9, 11: 1.2, 12: 2.0}
+CAPACITY_WEIGHTS = {1: 10, 2: 8, 3: 8, 4: 6, 5: 6, 6: 4, 8: 4, 10: 3, 15: 2, 20: 1}
+
+FIRST_NAMES = ("María", "Juan", "José", "Ana", "Carmen", "Francisco", "Lucía", "Antonio", "Isabel",
+               "Manuel", "Teresa", "Pedro", "Pilar", "Miguel", "Rosa", "Javier", "Elena", "Pablo")
+LAST_NAMES = ("García", "Fernández", "González", "Rodríguez", "López", "Martínez", "Sánchez", "Pérez",
+              "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Álvarez")
+SAINTS = ("San Miguel", "Santa María", "San José", "San Pedro", "Santiago Apóstol", "San Francisco",
+          "Santa Teresa", "San Juan Bautista", "Santa Ana", "San Pablo", "La Asunción", "El Carmen")
+CITIES = ("Madrid", "Toledo", "Sevilla", "Valencia", "Zaragoza", "Burgos", "Salamanca", "Granada",
+          "Córdoba", "Oviedo", "Pamplona", "Valladolid", "Málaga", "Bilbao", "Santiago")
+
+NAMESPACE = uuid.UUID("6f1c7a52-3c1e-4c55-9b1d-8e4f0a6b2d11")
+
+
+def row_id(kind, index):
+    return str(uuid.uuid5(NAMESPACE, f"{kind}:{index}"))
+
+
+def account_email(kind, index):
+    return f"gen.{kind}.{index}@{EMAIL_DOMAIN}"
+
+
+def faithful_credentials(count):
+    """(email, password) of the first `count` generated faithful, one per harness.load user"""
+    return [(account_email("faithful", index), PASSWORD) for index in range(count)]
+
+
+def timestamp(value):
+    """TypeORM's SQLite datetime format"""
+    return value.strftime("%Y-%m-%d %H:%M:%S.000")
+
+
+def weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class Population:
+    """Target sizes plus the time window bands are spread over"""
+
+    def __init__(self, dioceses, parishes, priests, faithful, bands, confessions,
+                 start=None, days=270, seed=2025, chunk_size=5_000):
+        self.dioceses = dioceses
+        self.parishes = max(parishes, dioceses)
+        self.priests = max(priests, 1)
+        self.faithful = max(faithful, 1)
+        self.bands = bands
+        self.confessions = confessions
+        # Default window: six months of history and three months ahead
+        self.start = start or (datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                               - timedelta(days=180))
+        self.days = days
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.now = datetime.utcnow()
+
+    @property
+    def signature(self):
+        """Identifies a run for resuming; changing any size or the window starts a new one"""
+        return (f"{self.seed}:{self.dioceses}:{self.parishes}:{self.priests}:{self.faithful}:"
+                f"{self.bands}:{self.confessions}:{self.start:%Y%m%d}:{self.days}:{self.chunk_size}")
+
+    def chunks(self, kind):
+        total = {"dioceses": self.dioceses, "parishes": self.parishes, "priests": self.priests,
+                 "faithful": self.faithful, "bands": self.bands}[kind]
+        return (total + self.chunk_size - 1) // self.chunk_size
+
+    def rng(self, kind, chunk):
+        return random.Random(f"{self.seed}:{kind}:{chunk}")
+
+    def diocese_of_parish(self, parish):
+        return parish % self.dioceses
+
+    def parish_of_priest(self, priest):
+        return priest % self.parishes
+
+
+# ===== ROW BUILDERS (run in worker processes) =====
+
+def user_row(kind, index, rng, role, population, **extra):
+    created = timestamp(population.start - timedelta(days=rng.randint(1, 720)))
+    email = account_email(kind, index)
+    row = {
+        "id": row_id(kind, index),
+        "email": email,
+        "emailNormalized": email.lower(),
+        "password": PASSWORD_HASH,
+        "firstName": rng.choice(FIRST_NAMES),
+        "lastName": f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "role": role,
+        "isActive": 1,
+        "phone": f"+34 6{rng.randint(10_000_000, 99_999_999)}",
+        "dioceseId": None,
+        "currentParishId": None,
+        "language": "es",
+        "canConfess": 0,
+        "available": 1,
+        "city": rng.choice(CITIES),
+        "country": "España",
+        "createdAt": created,
+        "updatedAt": created,
+    }
+    row.update(extra)
+    return row
+
+
+def build_dioceses(population, chunk):
+    rng = population.rng("dioceses", chunk)
+    users, dioceses = [], []
+    for index in range(chunk * population.chunk_size,
+                       min((chunk + 1) * population.chunk_size, population.dioceses)):
+        bishop = user_row("bishop", index, rng, "bishop", population, canConfess=1,
+                          dioceseId=row_id("diocese", index))
+        users.append(bishop)
+        dioceses.append({
+            "id": row_id("diocese", index),
+            "name": f"Diócesis de {CITIES[index % len(CITIES)]} {index + 1}",
+            "bishopId": bishop["id"],
+            "city": CITIES[index % len(CITIES)],
+            "country": "España",
+            "email": f"diocesis.{index}@{EMAIL_DOMAIN}",
+            "isActive": 1,
+        })
+    return {"users": users, "dioceses": dioceses}
+
+
+def build_parishes(population, chunk):
+    rng = population.rng("parishes", chunk)
+    parishes = []
+    for index in range(chunk * population.chunk_size,
+                       min((chunk + 1) * population.chunk_size, population.parishes)):
+        parishes.append({
+            "id": row_id("parish", index),
+            "name": f"Parroquia de {rng.choice(SAINTS)} ({index + 1})",
+            "dioceseId": row_id("diocese", population.diocese_of_parish(index)),
+            "city": rng.choice(CITIES),
+            "country": "España",
+            "email": f"parroquia.{index}@{EMAIL_DOMAIN}",
+            "latitude": round(rng.uniform(36.0, 43.5), 8),
+            "longitude": round(rng.uniform(-9.0, 3.0), 8),
+            "isActive": 1,
+        })
+    return {"parishes": parishes}
+
+
+def build_priests(population, chunk):
+    rng = population.rng("priests", chunk)
+    users = []
+    for index in range(chunk * population.chunk_size,
+                       min((chunk + 1) * population.chunk_size, population.priests)):
+        parish = population.parish_of_priest(index)
+        users.append(user_row("priest", index, rng, "priest", population, canConfess=1,
+                              dioceseId=row_id("diocese", population.diocese_of_parish(parish)),
+                              currentParishId=row_id("parish", parish)))
+    return {"users": users}
+
+
+def build_faithful(population, chunk):
+    rng = population.rng("faithful", chunk)
+    users = []
+    for index in range(chunk * population.chunk_size,
+                       min((chunk + 1) * population.chunk_size, population.faithful)):
+        users.append(user_row("faithful", index, rng, "faithful", population,
+                              dioceseId=row_id("diocese", rng.randrange(population.dioceses))))
+    return {"users": users}
+
+
+def band_start(population, band, rng):
+    """
+    Band n of a priest lands in the n-th equal slice of the window, so one priest's
+    bands never overlap; within the slice the start hour follows HOUR_WEIGHTS
+    """
+    per_priest = max(1, -(-population.bands // population.priests))
+    slice_hours = population.days * 24 / per_priest
+    occurrence = band // population.priests
+    slice_start = population.start + timedelta(hours=occurrence * slice_hours)
+
+    if slice_hours >= 24:
+        day = slice_start + timedelta(days=rng.randrange(int(slice_hours // 24)))
+        start = day.replace(hour=weighted(rng, HOUR_WEIGHTS), minute=rng.choice((0, 15, 30)))
+        duration = rng.choice((30, 60, 60, 90, 120))
+    else:
+        duration = max(15, min(120, int(slice_hours * 60) - 15))
+        start = slice_start + timedelta(minutes=rng.randrange(0, max(1, int(slice_hours * 60) - duration)))
+    return start, start + timedelta(minutes=duration)
+
+
+def build_bands(population, chunk):
+    """Bands and their confessions together, so currentBookings always matches"""
+    rng = population.rng("bands", chunk)
+    mean_bookings = population.confessions / population.bands if population.bands else 0
+    average = sum(MONTH_WEIGHTS.values()) / len(MONTH_WEIGHTS)
+    bands, confessions = [], []
+
+    for index in range(chunk * population.chunk_size,
+                       min((chunk + 1) * population.chunk_size, population.bands)):
+        priest = index % population.priests
+        start, end = band_start(population, index, rng)
+
+        # Demand follows the liturgical season
+        season = MONTH_WEIGHTS[start.month] / average
+        wanted = round(rng.expovariate(1 / mean_bookings) * season) if mean_bookings else 0
+        capacity = max(weighted(rng, CAPACITY_WEIGHTS), wanted)
+        capacity = min(capacity, 50)
+        past = end < population.now
+
+        # Distinct faithful per band: the partial unique index allows one BOOKED row per (faithful, band)
+        faithful = rng.sample(range(population.faithful), min(wanted, capacity, population.faithful))
+        booked = 0
+        for seat, person in enumerate(faithful):
+            roll = rng.random()
+            if past:
+                status = "completed" if roll < 0.85 else "cancelled"
+            else:
+                status = "booked" if roll < 0.9 else "cancelled"
+            booked += status == "booked"
+            created = start - timedelta(hours=rng.uniform(2, 24 * 21))
+            confessions.append({
+                "id": row_id(f"{population.signature}/confession", f"{index}:{seat}"),
+                "faithfulId": row_id("faithful", person),
+                "status": status,
+                "scheduledTime": timestamp(start + timedelta(minutes=rng.randrange(0, max(1, int((end - start).total_seconds() // 60))))),
+                "confessionBandId": row_id(f"{population.signature}/band", index),
+                "createdAt": timestamp(created),
+                "updatedAt": timestamp(created),
+            })
+
+        parish = population.parish_of_priest(priest)
+        if past:
+            status = "completed" if rng.random() < 0.95 else "cancelled"
+        else:
+            status = "full" if booked >= capacity else "available"
+        created = timestamp(start - timedelta(days=rng.randint(1, 60)))
+        bands.append({
+            "id": row_id(f"{population.signature}/band", index),
+            "priestId": row_id("priest", priest),
+            "startTime": timestamp(start),
+            "endTime": timestamp(end),
+            "status": status,
+            "location": f"Confesionario {rng.randint(1, 4)}",
+            "parishId": row_id("parish", parish),
+            "maxCapacity": capacity,
+            "currentBookings": booked if not past else 0,
+            "recurrenceType": "none",
+            "isRecurrent": 0,
+            "createdAt": created,
+            "updatedAt": created,
+        })
+    return {"confession_bands": bands, "confessions": confessions}
+
+
+BUILDERS = {
+    "dioceses": build_dioceses,
+    "parishes": build_parishes,
+    "priests": build_priests,
+    "faithful": build_faithful,
+    "bands": build_bands,
+}
+
+
+def _build(args):
+    population, kind, chunk = args
+    return kind, chunk, BUILDERS[kind](population, chunk)
+
+
+# ===== WRITER (single process, SQLite allows one writer) =====
+
+# Ids scoped to the run's signature: a conflict here is a generator bug, so let it fail the chunk.
+# Users, dioceses and parishes are shared by every preset and may already exist.
+RUN_TABLES = {"confession_bands", "confessions"}
+
+class Writer:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=OFF")
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS "datagen_progress" ('
+            '"run" varchar NOT NULL, "kind" varchar NOT NULL, "chunk" integer NOT NULL, '
+            '"rows" integer NOT NULL, "createdAt" datetime NOT NULL DEFAULT (CURRENT_TIMESTAMP), '
+            'PRIMARY KEY ("run", "kind", "chunk"))'
+        )
+
+    def done(self, run, kind):
+        return {chunk for chunk, in self.connection.execute(
+            'SELECT "chunk" FROM "datagen_progress" WHERE "run" = ? AND "kind" = ?', (run, kind))}
+
+    def write(self, run, kind, chunk, tables):
+        """One transaction per chunk: rows and progress marker land together"""
+        rows = 0
+        self.connection.execute("BEGIN")
+        try:
+            for table, records in tables.items():
+                if not records:
+                    continue
+                columns = list(records[0])
+                names = ", ".join(f'"{column}"' for column in columns)
+                marks = ", ".join("?" for _ in columns)
+                verb = "INSERT" if table in RUN_TABLES else "INSERT OR IGNORE"
+                sql = f'{verb} INTO "{table}" ({names}) VALUES ({marks})'
+                self.connection.executemany(sql, ([record[c] for c in columns] for record in records))
+                rows += len(records)
+            self.connection.execute(
+                'INSERT INTO "datagen_progress" ("run", "kind", "chunk", "rows") VALUES (?, ?, ?, ?)',
+                (run, kind, chunk, rows))
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return rows
+
+    def close(self):
+        self.connection.close()
+
+
+def generate(population, path=DB_PATH, workers=None, log=print):
+    """Build every level in dependency order; returns {kind: rows written this run}"""
+    writer = Writer(path)
+    written = {}
+    try:
+        with Pool(processes=workers) as pool:
+            for kind in BUILDERS:
+                done = writer.done(population.signature, kind)
+                todo = [chunk for chunk in range(population.chunks(kind)) if chunk not in done]
+                if not todo:
+                    log(f"✅ {kind}: already generated")
+                    continue
+
+                log(f"⚙️ {kind}: {len(todo)} chunks pending ({len(done)} already done)")
+                started = time.perf_counter()
+                written[kind] = 0
+                jobs = ((population, kind, chunk) for chunk in todo)
+                for number, (_, chunk, tables) in enumerate(pool.imap_unordered(_build, jobs), 1):
+                    written[kind] += writer.write(population.signature, kind, chunk, tables)
+                    if number % 20 == 0 or number == len(todo):
+                        rate = written[kind] / max(time.perf_counter() - started, 1e-9)
+                        log(f"   {kind}: {number}/{len(todo)} chunks, {written[kind]:,} rows ({rate:,.0f} rows/s)")
+    finally:
+        writer.close()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk synthetic data for ConfesApp scale testing")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database created by the backend (synchronize)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in ("dioceses", "parishes", "priests", "faithful", "bands", "confessions"):
+        parser.add_argument(f"--{name}", type=int, help=f"override the {name} count of --scale")
+    parser.add_argument("--days", type=int, default=270, help="length of the band time window")
+    parser.add_argument("--seed", type=int, default=2025, help="same seed = same rows, resumable")
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=None, help="builder processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} not found; start the backend once so TypeORM creates the schema")
+
+    sizes = dict(SCALES[args.scale])
+    sizes.update({name: getattr(args, name) for name in sizes if getattr(args, name) is not None})
+    population = Population(days=args.days, seed=args.seed, chunk_size=args.chunk_size, **sizes)
+
+    print("🚀 GENERANDO DATOS SINTÉTICOS")
+    print("   " + ", ".join(f"{name}={value:,}" for name, value in sizes.items()))
+    started = time.perf_counter()
+    written = generate(population, args.db, args.workers)
+    print(f"🎉 Done in {time.perf_counter() - started:.1f}s: "
+          + (", ".join(f"{kind}={rows:,}" for kind, rows in written.items()) or "nothing to do"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
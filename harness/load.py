@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Load Generator - FAITHFUL BOOKING JOURNEY
+Replays the ConfesAppTester booking flow (tests 11 -> 12 -> 13) as many
+concurrent virtual faithful users:
+login -> GET /confession-bands/available -> POST /confession-bands/book -> PATCH /bookings/:id/cancel
+
+Every virtual user logs in with its own account, so bookings are not rejected as
+duplicates of another user's: by default the harness.datagen faithful
+(gen.faithful.0 ... gen.faithful.N-1), or one email:password per line of --credentials-file
+
+Usage:
+    python -m harness.datagen --scale small       # 2000 faithful accounts
+    python -m harness.load --users 2000 --concurrency 200 --ramp-up 30
+    python -m harness.load --users 50 --credentials-file faithful.txt
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from harness.client import BASE_URL, get_session
+from harness.datagen import faithful_credentials
+from harness.metrics import REGISTRY, percentile, write_report
+
+HEADERS = {"Content-Type": "application/json"}
+
+STEPS = ("login", "available", "book", "cancel")
+
+
+def log(message, level="INFO"):
+    """Log load messages with timestamp"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}")
+
+
+class StepStats:
+    """Counters and latencies for one step of the journey"""
+
+    def __init__(self, name):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.latencies = []
+        self.status_codes = {}
+        self.lock = threading.Lock()
+
+    def record(self, status, elapsed, ok):
+        with self.lock:
+            self.requests += 1
+            self.latencies.append(elapsed)
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+            if not ok:
+                self.errors += 1
+
+    def summary(self, duration):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": (self.errors / self.requests) if self.requests else 0.0,
+            "throughput_rps": (self.requests / duration) if duration else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "status_codes": dict(self.status_codes),
+        }
+
+
+class BookingLoadGenerator:
+    """Runs N virtual faithful users through the booking journey on a bounded worker pool"""
+
+    def __init__(self, base_url=BASE_URL, users=100, concurrency=20, ramp_up=0.0,
+                 credentials=None, timeout=30, keep_bookings=False):
+        self.base_url = base_url
+        self.users = users
+        self.concurrency = concurrency
+        self.ramp_up = ramp_up
+        self.credentials = credentials or faithful_credentials(users)
+        # A faithful holds one booking per band: shared accounts would measure duplicate rejections
+        accounts = len(set(email for email, _ in self.credentials))
+        if accounts < users:
+            raise ValueError(f"Cada usuario virtual necesita su propia cuenta: {users} usuarios, "
+                             f"{accounts} credenciales distintas")
+        self.timeout = timeout
+        self.keep_bookings = keep_bookings
+        # One keep-alive connection per worker, sized before anything else grabs the shared session
+        self.session = get_session(pool_size=concurrency)
+        self.stats = {step: StepStats(step) for step in STEPS}
+        self.completed_journeys = 0
+        self.completed_lock = threading.Lock()
+        self.duration = 0.0
+
+    def _call(self, step, method, endpoint, data=None, token=None, expected=(200, 201)):
+        """Timed request; returns the decoded JSON body or None on failure"""
+        headers = HEADERS.copy()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.base_url}{endpoint}", json=data, headers=headers,
+                                            timeout=self.timeout)
+            raw = response.content
+        except requests.exceptions.RequestException:
+            elapsed = time.perf_counter() - started
+            self.stats[step].record("error", elapsed, False)
+            REGISTRY.record(method, endpoint, elapsed)
+            return None
+
+        elapsed = time.perf_counter() - started
+        ok = response.status_code in expected
+        self.stats[step].record(response.status_code, elapsed, ok)
+        REGISTRY.record(method, endpoint, elapsed, response.status_code, len(raw))
+
+        if not ok or not raw:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def _journey(self, user_index):
+        """One virtual faithful user: login, list, book, cancel"""
+        email, password = self.credentials[user_index]
+
+        data = self._call("login", "POST", "/auth/login", {"email": email, "password": password})
+        token = data.get("access_token") if data else None
+        if not token:
+            return False
+
+        bands = self._call("available", "GET", "/confession-bands/available", token=token)
+        candidates = [band for band in bands or [] if band.get("status") == "available"]
+        if not candidates:
+            return False
+
+        booking = self._call("book", "POST", "/confession-bands/book", {
+            "bandId": random.choice(candidates)["id"],
+            "notes": "Load test booking",
+        }, token)
+        if not booking or not booking.get("id"):
+            return False
+
+        if not self.keep_bookings:
+            cancelled = self._call("cancel", "PATCH",
+                                   f"/confession-bands/bookings/{booking['id']}/cancel", token=token)
+            if cancelled is None:
+                return False
+
+        return True
+
+    def _run_user(self, user_index):
+        if self._journey(user_index):
+            with self.completed_lock:
+                self.completed_journeys += 1
+
+    def run(self):
+        started = time.perf_counter()
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for user_index in range(self.users):
+                # Spread user start times evenly over the ramp-up window; a busy pool queues the rest
+                if self.ramp_up and self.users > 1:
+                    delay = started + self.ramp_up * user_index / (self.users - 1) - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(pool.submit(self._run_user, user_index))
+        self.duration = time.perf_counter() - started
+
+        # A journey that crashed is a bug in the generator, not a server error: surface it
+        for future in futures:
+            future.result()
+
+        return self.report()
+
+    def report(self):
+        return {
+            "users": self.users,
+            "concurrency": self.concurrency,
+            "ramp_up_s": self.ramp_up,
+            "duration_s": self.duration,
+            "completed_journeys": self.completed_journeys,
+            "bookings_per_second": (self.stats["book"].requests - self.stats["book"].errors) / self.duration
+            if self.duration else 0.0,
+            "steps": {step: stats.summary(self.duration) for step, stats in self.stats.items()},
+        }
+
+
+def print_report(report):
+    log("=" * 80)
+    log("🏁 LOAD TEST COMPLETE!")
+    log(f"👥 Users: {report['users']} | Concurrency: {report['concurrency']} | Ramp-up: {report['ramp_up_s']}s")
+    log(f"⏱️ Duration: {report['duration_s']:.2f}s | ✅ Completed journeys: {report['completed_journeys']}")
+    log(f"📝 Bookings/s: {report['bookings_per_second']:.2f}")
+    log("\n📋 PER-STEP RESULTS:")
+    for step, summary in report["steps"].items():
+        log(f"{step:>10}: {summary['requests']} req, {summary['throughput_rps']:.2f} req/s, "
+            f"errors {summary['error_rate'] * 100:.1f}%, p50 {summary['p50_ms']:.0f}ms, "
+            f"p95 {summary['p95_ms']:.0f}ms, p99 {summary['p99_ms']:.0f}ms, codes {summary['status_codes']}")
+
+
+def parse_credentials(value):
+    """'a@x.com:pw,b@y.com:pw' -> [(email, password), ...]"""
+    return [tuple(pair.split(":", 1)) for pair in value.split(",") if pair]
+
+
+def read_credentials_file(path):
+    """One email:password per line; blank lines and # comments are skipped"""
+    with open(path, encoding="utf-8") as handle:
+        return [tuple(line.strip().split(":", 1)) for line in handle
+                if line.strip() and not line.lstrip().startswith("#")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ConfesApp booking-flow load generator")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--users", type=int, default=100, help="total virtual faithful users")
+    parser.add_argument("--concurrency", type=int, default=20, help="max journeys in flight")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which users start")
+    parser.add_argument("--credentials", type=parse_credentials, default=None,
+                        help="comma-separated email:password pairs, one per user")
+    parser.add_argument("--credentials-file", type=read_credentials_file, default=None,
+                        help="file with one email:password per line, one per user")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--keep-bookings", action="store_true", help="skip the cancel step")
+    args = parser.parse_args()
+
+    log("🚀 INICIANDO LOAD TEST - FAITHFUL BOOKING JOURNEY")
+    try:
+        generator = BookingLoadGenerator(
+            base_url=args.base_url,
+            users=args.users,
+            concurrency=args.concurrency,
+            ramp_up=args.ramp_up,
+            credentials=args.credentials or args.credentials_file,
+            timeout=args.timeout,
+            keep_bookings=args.keep_bookings,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    report = generator.run()
+    print_report(report)
+    write_report(suite="BookingLoadGenerator", extra={"load": report})
+
+    failed = sum(summary["errors"] for summary in report["steps"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Per-route latency histograms for every request made through the harness
+Routes are keyed on their template (e.g. GET /confession-bands/my-bands/:id),
+never on the raw URL, so results aggregate across runs and deploys
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+
+REPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_output.txt")
+
+# Log-scale buckets: 0.1ms .. ~2min, each bucket 10% wider than the previous one
+BUCKET_BASE_MS = 0.1
+BUCKET_GROWTH = 1.1
+BUCKET_COUNT = 150
+
+_UUID = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_TOKEN = re.compile(r"^[0-9a-fA-F]{32,}$")
+_NUMBER = re.compile(r"^\d+$")
+
+
+def route_template(path):
+    """'/api/confession-bands/my-bands/3f2c...' -> '/confession-bands/my-bands/:id'"""
+    path = urlsplit(path).path
+    segments = []
+    for segment in path.split("/"):
+        if _UUID.match(segment) or _NUMBER.match(segment):
+            segments.append(":id")
+        elif _TOKEN.match(segment):
+            segments.append(":token")
+        else:
+            segments.append(segment)
+    template = "/".join(segments)
+    # Strip the global prefix so templates match the controller routes
+    if template.startswith("/api/"):
+        template = template[4:]
+    return template or "/"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list (0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LatencyHistogram:
+    """Fixed log-bucket latency histogram with status and byte counters"""
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.bytes_received = 0
+        self.status_codes = {}
+
+    @staticmethod
+    def bucket_index(elapsed_ms):
+        if elapsed_ms <= BUCKET_BASE_MS:
+            return 0
+        index = int(math.ceil(math.log(elapsed_ms / BUCKET_BASE_MS, BUCKET_GROWTH)))
+        return min(index, BUCKET_COUNT - 1)
+
+    @staticmethod
+    def bucket_upper_ms(index):
+        return BUCKET_BASE_MS * (BUCKET_GROWTH ** index)
+
+    def record(self, elapsed_ms, status=None, nbytes=0):
+        self.buckets[self.bucket_index(elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.bytes_received += nbytes or 0
+        key = str(status) if status is not None else "error"
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th sample (capped at the observed max)"""
+        if not self.count:
+            return 0.0
+        target = max(1, int(math.ceil(pct / 100.0 * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min(self.bucket_upper_ms(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "bytes_received": self.bytes_received,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            # Sparse [upper_ms, count] pairs, enough to rebuild the distribution
+            "histogram": [[round(self.bucket_upper_ms(i), 3), n] for i, n in enumerate(self.buckets) if n],
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe map of 'METHOD /route/template' -> LatencyHistogram"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}
+        self.started_at = datetime.now()
+
+    def record(self, method, path, elapsed_s, status=None, nbytes=0):
+        key = f"{method.upper()} {route_template(path)}"
+        with self._lock:
+            histogram = self.routes.get(key)
+            if histogram is None:
+                histogram = self.routes[key] = LatencyHistogram()
+            histogram.record(elapsed_s * 1000.0, status, nbytes)
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+            self.started_at = datetime.now()
+
+    def report(self, suite=None, extra=None):
+        with self._lock:
+            routes = {key: histogram.summary() for key, histogram in sorted(self.routes.items())}
+        report = {
+            "suite": suite,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "total_requests": sum(route["count"] for route in routes.values()),
+            "routes": routes,
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+    def write_report(self, suite=None, path=None, extra=None):
+        """Write the JSON benchmark report (bench_output.txt at the repo root by default)"""
+        report = self.report(suite, extra)
+        with open(path or REPORT_PATH, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+        return report
+
+
+# Process-wide registry used by ApiClient and the load tools
+REGISTRY = MetricsRegistry()
+
+
+def write_report(suite=None, path=None, extra=None):
+    return REGISTRY.write_report(suite, path, extra)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware parallel runner for the tester classes
+Each test declares the tester attributes it needs and provides, e.g.
+
+    @provides("bishop_token")
+    def test_1_bishop_login(self): ...
+
+    @requires("bishop_token")
+    def test_4_get_dioceses(self): ...
+
+run_tests() then executes independent tests concurrently on a worker pool,
+while the results table keeps the declared test order
+"""
+
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+_current = threading.local()
+
+
+def requires(*attributes, after=()):
+    """Declare tester attributes this test reads, plus tests (by name) it must follow"""
+    def decorate(func):
+        func.requires = tuple(attributes)
+        func.after = tuple(after)
+        return func
+    return decorate
+
+
+def provides(*attributes):
+    """Declare tester attributes this test sets for later tests"""
+    def decorate(func):
+        func.provides = tuple(attributes)
+        return func
+    return decorate
+
+
+def _declared(func):
+    return any(hasattr(func, attr) for attr in ("requires", "provides", "after"))
+
+
+class ResultLog(list):
+    """test_results list that remembers which step appended each row"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._lock = threading.Lock()
+        self._steps = [sys.maxsize] * len(self)
+
+    def append(self, item):
+        with self._lock:
+            super().append(item)
+            self._steps.append(getattr(_current, "step", sys.maxsize))
+
+    def sort_by_step(self):
+        """Stable reorder so rows appear in test order, not completion order"""
+        with self._lock:
+            ordered = sorted(zip(self._steps, range(len(self)), list(self)))
+            self[:] = [row for _, _, row in ordered]
+            self._steps = [step for step, _, _ in ordered]
+
+
+def build_dependencies(tests):
+    """Map step index -> set of step indexes that must finish first"""
+    names = [func.__name__ for _, func in tests]
+    dependencies = {}
+
+    for index, (_, func) in enumerate(tests):
+        if not _declared(func):
+            # Undeclared tests keep the old strictly-sequential semantics
+            dependencies[index] = set(range(index))
+            continue
+
+        needs = set(getattr(func, "requires", ()))
+        deps = set()
+        for earlier in range(index):
+            earlier_func = tests[earlier][1]
+            if not _declared(earlier_func) or needs & set(getattr(earlier_func, "provides", ())):
+                deps.add(earlier)
+        for name in getattr(func, "after", ()):
+            deps.update(i for i in range(index) if names[i] == name)
+        dependencies[index] = deps
+
+    return dependencies
+
+
+def run_tests(tests, results=None, max_workers=8, log=None):
+    """
+    Run (name, func) pairs respecting declared dependencies.
+    Returns a list of booleans in test order; exceptions count as failures and are
+    appended to `results` as (name, False, "Exception: ...") rows.
+    """
+    dependencies = build_dependencies(tests)
+    outcomes = [None] * len(tests)
+    finished = set()
+
+    def execute(index):
+        name, func = tests[index]
+        _current.step = index
+        try:
+            if log:
+                log(f"\n--- {name} ---")
+            return bool(func())
+        except Exception as e:
+            if log:
+                log(f"❌ {name} failed with exception: {e}", "ERROR")
+            if results is not None:
+                results.append((name, False, f"Exception: {e}"))
+            return False
+        finally:
+            _current.step = sys.maxsize
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        pending = set(range(len(tests)))
+
+        while pending or running:
+            for index in sorted(pending):
+                if dependencies[index] <= finished:
+                    running[executor.submit(execute, index)] = index
+            pending -= set(running.values())
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                outcomes[index] = future.result()
+                finished.add(index)
+
+    if isinstance(results, ResultLog):
+        results.sort_by_step()
+
+    return outcomes
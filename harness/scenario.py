@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Scenario Runner - OPEN-MODEL ARRIVAL RATES
+Fires GET /confession-bands/public/available and POST /confession-bands/book at a
+target arrival rate (constant, step or spike profile) regardless of how fast
+responses come back, through ConfesAppTester.make_request.
+
+Every request has an intended start time taken from the schedule. Latency is
+reported twice: service time (actual send -> response) and corrected time
+(intended send -> response). When the server or the worker pool falls behind,
+the queueing delay shows up in the corrected numbers instead of being silently
+omitted (coordinated omission).
+
+Usage:
+    python -m harness.scenario constant --rate 50 --duration 60
+    python -m harness.scenario step --rate 10 --step-rate 10 --step-every 30 --steps 6
+    python -m harness.scenario spike --rate 5 --peak 200 --spike-at 30 --spike-for 20 --duration 90
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from harness.client import get_session
+from harness.load import parse_credentials
+from harness.metrics import LatencyHistogram, write_report
+
+DEFAULT_MIX = {"available": 0.9, "book": 0.1}
+OPERATIONS = {
+    "available": ("GET", "/confession-bands/public/available"),
+    "book": ("POST", "/confession-bands/book"),
+}
+
+
+def log(message, level="INFO"):
+    """Log scenario messages with timestamp"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}")
+
+
+class Profile:
+    """Target arrival rate (requests/s) as a function of seconds since start"""
+
+    def __init__(self, name, duration, rate, description):
+        self.name = name
+        self.duration = duration
+        self.rate = rate
+        self.description = description
+
+    @classmethod
+    def constant(cls, rate, duration):
+        return cls("constant", duration, lambda t: rate, f"{rate} req/s for {duration}s")
+
+    @classmethod
+    def step(cls, rate, step_rate, step_every, steps):
+        """rate, then +step_rate every step_every seconds, for steps plateaus"""
+        duration = step_every * steps
+        return cls("step", duration, lambda t: rate + step_rate * int(t // step_every),
+                   f"{rate} req/s +{step_rate} every {step_every}s x{steps}")
+
+    @classmethod
+    def spike(cls, rate, peak, spike_at, spike_for, duration):
+        """Baseline rate with a burst to peak, e.g. a parish publishing its Holy Week schedule"""
+        return cls("spike", duration, lambda t: peak if spike_at <= t < spike_at + spike_for else rate,
+                   f"{rate} req/s, {peak} req/s at {spike_at}s for {spike_for}s, {duration}s total")
+
+    def arrivals(self, poisson=True, rng=None):
+        """Intended send offsets (seconds); exponential gaps when poisson, else evenly spaced"""
+        rng = rng or random.Random()
+        t = 0.0
+        while True:
+            rate = self.rate(t)
+            if rate <= 0:
+                t += 0.1
+            else:
+                t += rng.expovariate(rate) if poisson else 1.0 / rate
+            if t >= self.duration:
+                return
+            yield t
+
+
+class OperationStats:
+    """Service and corrected latency for one operation"""
+
+    def __init__(self):
+        self.service = LatencyHistogram()
+        self.corrected = LatencyHistogram()
+        self.errors = 0
+        self.max_lag_ms = 0.0
+
+    def record(self, intended, started, finished, status, ok):
+        self.service.record((finished - started) * 1000, status)
+        self.corrected.record((finished - intended) * 1000, status)
+        self.max_lag_ms = max(self.max_lag_ms, (started - intended) * 1000)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, duration):
+        def latencies(histogram):
+            return {f"p{pct}_ms": histogram.percentile(pct) for pct in (50, 90, 99, 99.9)}
+
+        return {
+            "requests": self.service.count,
+            "errors": self.errors,
+            "throughput_rps": self.service.count / duration if duration else 0.0,
+            "service": latencies(self.service),
+            "corrected": latencies(self.corrected),
+            "max_start_lag_ms": self.max_lag_ms,
+            "status_codes": dict(self.service.status_codes),
+        }
+
+
+class ArrivalRateRunner:
+    """
+    Open-model driver: a dispatcher thread releases requests on the profile's
+    schedule into a worker pool; it never waits for responses
+    """
+
+    def __init__(self, profile, tester=None, mix=None, workers=64, poisson=True,
+                 credentials=None, cancel_bookings=True, seed=None):
+        if tester is None:
+            # Size the shared keep-alive pool before the tester's client grabs it
+            get_session(pool_size=workers)
+            from backend_test import ConfesAppTester
+            tester = ConfesAppTester()
+
+        self.profile = profile
+        self.tester = tester
+        self.mix = mix or DEFAULT_MIX
+        self.workers = workers
+        self.poisson = poisson
+        self.credentials = credentials or []
+        self.cancel_bookings = cancel_bookings
+        self.rng = random.Random(seed)
+
+        self.tokens = []
+        self.band_ids = []
+        self.bookings = []
+        self.stats = {operation: OperationStats() for operation in self.mix}
+        self.timeline = {}
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    # ===== SETUP / TEARDOWN =====
+
+    def setup(self):
+        """Faithful tokens via the tester's own login test (plus any extra credentials)"""
+        if "book" not in self.mix:
+            return True
+
+        if not self.tester.faithful_token:
+            self.tester.test_3_faithful_login()
+        if self.tester.faithful_token:
+            self.tokens.append(self.tester.faithful_token)
+
+        for email, password in self.credentials:
+            response = self.tester.make_request("POST", "/auth/login", {"email": email, "password": password})
+            if response is not None and response.status_code in (200, 201):
+                self.tokens.append(response.json()["access_token"])
+
+        self._refresh_bands()
+        if not self.tokens or not self.band_ids:
+            log("❌ Booking mix needs a faithful token and at least one available band", "ERROR")
+            return False
+        return True
+
+    def _refresh_bands(self):
+        response = self.tester.make_request("GET", "/confession-bands/public/available")
+        if response is not None and response.status_code == 200:
+            band_ids = [band["id"] for band in response.json() if band.get("status") == "available"]
+            if band_ids:
+                self.band_ids = band_ids
+
+    def teardown(self):
+        """Cancel what the scenario booked, so the run can be repeated"""
+        if not self.cancel_bookings:
+            return
+        for booking_id, token in self.bookings:
+            self.tester.make_request("PATCH", f"/confession-bands/bookings/{booking_id}/cancel", token=token)
+
+    # ===== REQUESTS =====
+
+    def _execute(self, operation, intended, origin):
+        started = time.perf_counter()
+        method, endpoint = OPERATIONS[operation]
+        data, token = None, None
+        if operation == "book":
+            token = self.rng.choice(self.tokens)
+            data = {"bandId": self.rng.choice(self.band_ids), "notes": "Scenario runner booking"}
+
+        response = self.tester.make_request(method, endpoint, data, token)
+        finished = time.perf_counter()
+
+        status = response.status_code if response is not None else "error"
+        ok = response is not None and response.status_code in (200, 201)
+        if operation == "book" and ok:
+            with self._lock:
+                self.bookings.append((response.json().get("id"), token))
+        elif operation == "available" and ok and "book" in self.mix:
+            band_ids = [band["id"] for band in response.json() if band.get("status") == "available"]
+            if band_ids:
+                self.band_ids = band_ids
+
+        with self._lock:
+            self.stats[operation].record(intended, started, finished, status, ok)
+            second = self.timeline.setdefault(int(intended - origin), {"completed": 0, "errors": 0})
+            second["completed"] += 1
+            second["errors"] += 0 if ok else 1
+
+    def run(self):
+        if not self.setup():
+            return None
+
+        operations = list(self.mix)
+        weights = list(self.mix.values())
+        offered = {}
+
+        log(f"🚦 {self.profile.name}: {self.profile.description}, {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            origin = time.perf_counter()
+            for offset in self.profile.arrivals(self.poisson, self.rng):
+                intended = origin + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                # Never wait on responses: a saturated pool queues here and the
+                # wait is charged to the corrected latency via `intended`
+                pool.submit(self._execute, self.rng.choices(operations, weights)[0], intended, origin)
+                offered[int(offset)] = offered.get(int(offset), 0) + 1
+        self.duration = time.perf_counter() - origin
+
+        for second, count in offered.items():
+            self.timeline.setdefault(second, {"completed": 0, "errors": 0})["offered"] = count
+
+        self.teardown()
+        return self.report()
+
+    def report(self):
+        return {
+            "profile": self.profile.name,
+            "description": self.profile.description,
+            "arrivals": "poisson" if self.poisson else "uniform",
+            "workers": self.workers,
+            "duration_s": self.duration,
+            "operations": {operation: stats.summary(self.duration) for operation, stats in self.stats.items()},
+            "timeline": [dict(second=second, **self.timeline[second]) for second in sorted(self.timeline)],
+        }
+
+
+def print_report(report):
+    log("=" * 80)
+    log(f"🏁 SCENARIO COMPLETE: {report['profile']} ({report['description']})")
+    log(f"⏱️ Duration: {report['duration_s']:.2f}s | Workers: {report['workers']} | Arrivals: {report['arrivals']}")
+    for operation, summary in report["operations"].items():
+        service, corrected = summary["service"], summary["corrected"]
+        log(f"{operation:>10}: {summary['requests']} req, {summary['throughput_rps']:.2f} req/s, "
+            f"errors {summary['errors']}, codes {summary['status_codes']}")
+        log(f"{'':>10}  service   p50 {service['p50_ms']:.0f}ms p99 {service['p99_ms']:.0f}ms "
+            f"p99.9 {service['p99.9_ms']:.0f}ms")
+        log(f"{'':>10}  corrected p50 {corrected['p50_ms']:.0f}ms p99 {corrected['p99_ms']:.0f}ms "
+            f"p99.9 {corrected['p99.9_ms']:.0f}ms (max start lag {summary['max_start_lag_ms']:.0f}ms)")
+
+
+def parse_mix(value):
+    """'available=9,book=1' -> {'available': 9.0, 'book': 1.0}"""
+    mix = {}
+    for pair in value.split(","):
+        operation, _, weight = pair.partition("=")
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation: {operation}")
+        mix[operation] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-model arrival-rate scenarios for ConfesApp")
+    parser.add_argument("profile", choices=("constant", "step", "spike"))
+    parser.add_argument("--rate", type=float, default=10, help="(baseline) arrivals per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds (constant/spike)")
+    parser.add_argument("--step-rate", type=float, default=10, help="rate added at each step")
+    parser.add_argument("--step-every", type=float, default=30, help="seconds per step")
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--peak", type=float, default=100, help="spike arrivals per second")
+    parser.add_argument("--spike-at", type=float, default=20)
+    parser.add_argument("--spike-for", type=float, default=10)
+    parser.add_argument("--mix", type=parse_mix, default=None, help="e.g. available=9,book=1")
+    parser.add_argument("--workers", type=int, default=64, help="max requests in flight")
+    parser.add_argument("--uniform", action="store_true", help="evenly spaced instead of Poisson arrivals")
+    parser.add_argument("--credentials", type=parse_credentials, default=None,
+                        help="extra faithful email:password pairs used for bookings")
+    parser.add_argument("--keep-bookings", action="store_true", help="do not cancel bookings afterwards")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.profile == "constant":
+        profile = Profile.constant(args.rate, args.duration)
+    elif args.profile == "step":
+        profile = Profile.step(args.rate, args.step_rate, args.step_every, args.steps)
+    else:
+        profile = Profile.spike(args.rate, args.peak, args.spike_at, args.spike_for, args.duration)
+
+    log("🚀 INICIANDO ESCENARIO - OPEN-MODEL ARRIVAL RATE")
+    runner = ArrivalRateRunner(profile, mix=args.mix, workers=args.workers, poisson=not args.uniform,
+                               credentials=args.credentials, cancel_bookings=not args.keep_bookings,
+                               seed=args.seed)
+    report = runner.run()
+    if report is None:
+        return 1
+
+    print_report(report)
+    write_report(suite="ArrivalRateRunner", extra={"scenario": report})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,862 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Stand-in Server - LOCAL IN-PROCESS REST API
+Implements the routes the Python suites call (/auth, /dioceses, /parishes, /users,
+/confessions, /confession-bands, /invites) over in-memory state seeded like
+backend/src/seed.ts, with the same capacity counters and band status transitions.
+Zero network latency, no database: a baseline target for the harness and CI.
+
+Usage:
+    python -m harness.standin --port 8001
+    CONFESAPP_BASE_URL=http://127.0.0.1:8001/api python backend_test.py
+
+or in-process (testers take the URL at construction, their client is built there):
+    server = start_server()          # random free port
+    tester = ConfesAppTester(base_url=server.base_url)
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import queue
+import re
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEED_PASSWORD = "Pass123!"
+SEED_DIOCESE_ID = "a81d2bd3-c2e2-42ac-b4e7-66b44e4ad358"
+SEED_INVITE_TOKEN = "ebe0d53471a55634e1e8b0652f19ac1f1a69eac876285928b1ba54d3873f83da"
+TOKEN_TTL = 24 * 60 * 60
+# Seconds between ping events on /confession-bands/public/events (BAND_EVENTS_HEARTBEAT_MS in the backend)
+EVENTS_HEARTBEAT = 25
+
+USER_FIELDS = ("id", "email", "firstName", "lastName", "role", "isActive", "phone", "dioceseId",
+               "currentParishId", "language", "canConfess", "available", "createdAt", "updatedAt")
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+REASONS = {400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found"}
+
+
+def now():
+    return datetime.now(timezone.utc)
+
+
+def iso(value):
+    """Serialise like JSON.stringify(Date): 2025-01-01T10:00:00.000Z"""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+def parse_date(value, field="fecha"):
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise HttpError(400, [f"Fecha y hora de {field} inválida"])
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+class Store:
+    """In-memory tables, guarded by one lock so counters move atomically"""
+
+    def __init__(self, secret=None):
+        self.lock = threading.RLock()
+        self.secret = secret or secrets.token_bytes(32)
+        self.users = {}
+        self.dioceses = {}
+        self.parishes = {}
+        self.bands = {}
+        self.confessions = {}
+        self.invites = {}
+        # One queue per open public/events stream
+        self.subscribers = []
+        self.seed()
+
+    # ===== BAND EVENTS (mirrors BandEventsService) =====
+
+    def subscribe(self, parish_id=None, priest_id=None):
+        subscriber = (queue.Queue(), parish_id, priest_id)
+        with self.lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.remove(subscriber)
+
+    def publish(self, band):
+        """Queue the band's seats and status for every stream whose filters match"""
+        delta = {"bandId": band["id"], "currentBookings": band["currentBookings"], "status": band["status"]}
+        with self.lock:
+            for events, parish_id, priest_id in self.subscribers:
+                if (not parish_id or band["parishId"] == parish_id) and \
+                        (not priest_id or band["priestId"] == priest_id):
+                    events.put(delta)
+
+    # ===== SEED (mirrors backend/src/seed.ts) =====
+
+    def _user(self, email, first_name, last_name, role, **extra):
+        user = {
+            "id": str(uuid.uuid4()),
+            "email": email,
+            "password": hash_password(SEED_PASSWORD),
+            "firstName": first_name,
+            "lastName": last_name,
+            "role": role,
+            "isActive": True,
+            "phone": None,
+            "dioceseId": None,
+            "currentParishId": None,
+            "language": "es",
+            "canConfess": False,
+            "available": True,
+            "createdAt": iso(now()),
+            "updatedAt": iso(now()),
+        }
+        user.update(extra)
+        self.users[user["id"]] = user
+        return user
+
+    def seed(self):
+        self._user("admin@confesapp.com", "Sistema", "Administrador", "admin", available=False)
+        bishop = self._user("obispo@diocesis.com", "Francisco", "González", "bishop",
+                            canConfess=True, dioceseId=SEED_DIOCESE_ID)
+
+        self.dioceses[SEED_DIOCESE_ID] = {
+            "id": SEED_DIOCESE_ID, "name": "Diócesis de Madrid", "bishopId": bishop["id"],
+            "city": "Madrid", "country": "España", "email": "info@diocesismadrid.es", "isActive": True,
+        }
+        parishes = []
+        for name, email in (("Parroquia de San Miguel", "info@sanmiguel.es"),
+                            ("Parroquia de Santa María", "info@santamaria.es")):
+            parish = {"id": str(uuid.uuid4()), "name": name, "dioceseId": SEED_DIOCESE_ID,
+                      "city": "Madrid", "country": "España", "email": email, "isActive": True}
+            self.parishes[parish["id"]] = parish
+            parishes.append(parish)
+
+        self._user("padre.parroco@sanmiguel.es", "Miguel", "Fernández", "priest", canConfess=True,
+                   dioceseId=SEED_DIOCESE_ID, currentParishId=parishes[0]["id"])
+        self._user("padre.carlos@ejemplo.com", "Carlos", "Rodríguez", "priest", isActive=False,
+                   dioceseId=SEED_DIOCESE_ID, currentParishId=parishes[1]["id"])
+        self._user("fiel1@ejemplo.com", "María", "García", "faithful", dioceseId=SEED_DIOCESE_ID)
+        self._user("fiel2@ejemplo.com", "Juan", "López", "faithful", dioceseId=SEED_DIOCESE_ID)
+
+        invite = {
+            "id": str(uuid.uuid4()), "email": "sacerdote.invitado@ejemplo.com", "role": "priest",
+            "dioceseId": SEED_DIOCESE_ID, "parishId": parishes[0]["id"], "token": SEED_INVITE_TOKEN,
+            "status": "pending", "createdByUserId": bishop["id"],
+            "expiresAt": iso(now() + timedelta(days=7)), "createdAt": iso(now()),
+        }
+        self.invites[invite["id"]] = invite
+
+    # ===== TOKENS (HS256 JWTs, same claims as AuthService.login) =====
+
+    def sign(self, user):
+        def encode(part):
+            raw = json.dumps(part, separators=(",", ":")).encode("utf-8")
+            return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+        issued = int(time.time())
+        header = encode({"alg": "HS256", "typ": "JWT"})
+        payload = encode({"email": user["email"], "sub": user["id"], "role": user["role"],
+                          "iat": issued, "exp": issued + TOKEN_TTL})
+        signature = hmac.new(self.secret, f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+        return f"{header}.{payload}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode('ascii')}"
+
+    def verify(self, token):
+        try:
+            header, payload, signature = token.split(".")
+            expected = hmac.new(self.secret, f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+            if not hmac.compare_digest(base64.urlsafe_b64encode(expected).rstrip(b"=").decode("ascii"), signature):
+                return None
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (ValueError, AttributeError):
+            return None
+        if claims.get("exp", 0) <= time.time():
+            return None
+        return self.users.get(claims.get("sub"))
+
+    def login_body(self, user):
+        return {
+            "access_token": self.sign(user),
+            "user": {key: user[key] for key in ("id", "email", "firstName", "lastName", "role", "isActive")},
+        }
+
+    # ===== SERIALISATION =====
+
+    def public_user(self, user):
+        return {key: user.get(key) for key in USER_FIELDS} if user else None
+
+    def band_view(self, band, confessions=False, relations=True):
+        view = {key: (iso(value) if isinstance(value, datetime) else value) for key, value in band.items()}
+        if relations:
+            view["priest"] = self.public_user(self.users.get(band["priestId"]))
+            view["parish"] = self.parishes.get(band["parishId"])
+        if confessions:
+            view["confessions"] = [
+                dict(self.confession_view(c, relations=False), faithful=self.public_user(self.users.get(c["faithfulId"])))
+                for c in self.confessions.values() if c["confessionBandId"] == band["id"]
+            ]
+        return view
+
+    def confession_view(self, confession, relations=True):
+        view = {key: (iso(value) if isinstance(value, datetime) else value) for key, value in confession.items()}
+        if relations:
+            band = self.bands.get(confession["confessionBandId"])
+            view["faithful"] = self.public_user(self.users.get(confession["faithfulId"]))
+            view["confessionSlot"] = None
+            view["confessionBand"] = self.band_view(band) if band else None
+        return view
+
+
+ROUTES = []
+
+
+def route(method, pattern, roles=None, public=False):
+    """Register a handler for METHOD /pattern/:param (pattern excludes the /api prefix)"""
+    regex = re.compile("^" + re.sub(r":(\w+)", r"(?P<\1>[^/]+)", pattern) + "$")
+
+    def decorate(func):
+        ROUTES.append((method, regex, func, roles, public))
+        return func
+    return decorate
+
+
+def find_user_by_email(store, email):
+    email = (email or "").strip().lower()
+    return next((u for u in store.users.values() if u["email"].lower() == email), None)
+
+
+# ===== AUTH =====
+
+@route("POST", "/auth/login", public=True)
+def login(store, user, body, params, query):
+    candidate = find_user_by_email(store, body.get("email"))
+    if not candidate or candidate["password"] != hash_password(body.get("password") or ""):
+        raise HttpError(401, "Unauthorized")
+    return 201, store.login_body(candidate)
+
+
+@route("POST", "/auth/register", public=True)
+def register(store, user, body, params, query):
+    if find_user_by_email(store, body.get("email")):
+        raise HttpError(401, "Ya existe un usuario con este correo electrónico")
+    extra = {key: body[key] for key in ("phone",) if key in body}
+    created = store._user(body["email"], body.get("firstName", ""), body.get("lastName", ""),
+                          body.get("role", "faithful"), **extra)
+    created["password"] = hash_password(body.get("password", ""))
+    return 201, store.login_body(created)
+
+
+@route("POST", "/auth/register-priest", public=True)
+def register_priest(store, user, body, params, query):
+    if find_user_by_email(store, body.get("email")):
+        raise HttpError(401, "Ya existe un usuario con este correo electrónico")
+    if len(body.get("password") or "") < 8:
+        raise HttpError(400, ["La contraseña debe tener al menos 8 caracteres"])
+    created = store._user(body["email"], body.get("firstName", ""), body.get("lastName", ""), "priest",
+                          isActive=False, canConfess=False, phone=body.get("phone"),
+                          dioceseId=body.get("dioceseId"), currentParishId=body.get("currentParishId"))
+    created["password"] = hash_password(body["password"])
+    return 201, {
+        "success": True,
+        "message": "Solicitud enviada correctamente. El obispo de la diócesis será notificado para revisar tu solicitud.",
+        "user": store.login_body(created)["user"],
+    }
+
+
+@route("POST", "/auth/register-from-invite/:token", public=True)
+def register_from_invite(store, user, body, params, query):
+    invite = pending_invite(store, params["token"])
+    created = store._user(invite["email"], body.get("firstName", ""), body.get("lastName", ""), invite["role"],
+                          phone=body.get("phone"), dioceseId=invite["dioceseId"],
+                          currentParishId=invite.get("parishId"), canConfess=invite["role"] == "priest")
+    created["password"] = hash_password(body.get("password", ""))
+    invite.update(status="accepted", acceptedByUserId=created["id"], acceptedAt=iso(now()))
+    diocese = store.dioceses.get(invite["dioceseId"]) or {}
+    return 201, dict(store.login_body(created),
+                     message=f"¡Bienvenido! Te has unido exitosamente a la diócesis {diocese.get('name')}.",
+                     invite={"diocese": diocese.get("name"), "role": invite["role"]})
+
+
+@route("PATCH", "/auth/approve-priest/:userId", roles=("bishop", "admin"))
+def approve_priest(store, user, body, params, query):
+    priest = store.users.get(params["userId"])
+    if not priest or priest["role"] != "priest" or priest["isActive"]:
+        raise HttpError(400, "Solicitud de sacerdote no válida")
+    approved = bool(body.get("approved"))
+    priest.update(isActive=approved, canConfess=approved, available=approved)
+    message = "Sacerdote aprobado exitosamente" if approved else "Solicitud de sacerdote rechazada"
+    return 200, {"success": True, "message": message}
+
+
+# ===== DIOCESES / PARISHES / USERS =====
+
+@route("GET", "/dioceses")
+def list_dioceses(store, user, body, params, query):
+    return 200, list(store.dioceses.values())
+
+
+@route("GET", "/dioceses/my-diocese/info", roles=("bishop",))
+def my_diocese(store, user, body, params, query):
+    diocese = next((d for d in store.dioceses.values() if d["bishopId"] == user["id"]), None)
+    if not diocese:
+        raise HttpError(404, "Diócesis no encontrada")
+    return 200, dict(diocese, parishes=[p for p in store.parishes.values() if p["dioceseId"] == diocese["id"]])
+
+
+@route("GET", "/parishes")
+def list_parishes(store, user, body, params, query):
+    return 200, list(store.parishes.values())
+
+
+@route("GET", "/users")
+def list_users(store, user, body, params, query):
+    return 200, [{key: u[key] for key in ("id", "email", "firstName", "lastName", "role", "isActive")}
+                 for u in store.users.values()]
+
+
+@route("GET", "/users/priests")
+def list_priests(store, user, body, params, query):
+    return 200, [{key: u[key] for key in ("id", "email", "firstName", "lastName", "role")}
+                 for u in store.users.values() if u["role"] == "priest" and u["isActive"]]
+
+
+# ===== INVITES =====
+
+def pending_invite(store, token):
+    invite = next((i for i in store.invites.values() if i["token"] == token), None)
+    if not invite:
+        raise HttpError(404, "Token de invitación inválido")
+    if invite["status"] != "pending":
+        raise HttpError(400, "Esta invitación ya fue utilizada o expiró")
+    if parse_date(invite["expiresAt"]) < now():
+        invite["status"] = "expired"
+        raise HttpError(400, "Esta invitación ha expirado")
+    return invite
+
+
+@route("POST", "/invites", roles=("bishop", "admin"))
+def create_invite(store, user, body, params, query):
+    email = body.get("email")
+    if any(i["email"] == email and i["status"] == "pending" for i in store.invites.values()):
+        raise HttpError(400, "Ya existe una invitación pendiente para este correo electrónico")
+    if find_user_by_email(store, email):
+        raise HttpError(400, "Ya existe un usuario registrado con este correo electrónico")
+    invite = {
+        "id": str(uuid.uuid4()), "email": email, "role": body.get("role"), "dioceseId": body.get("dioceseId"),
+        "parishId": body.get("parishId"), "message": body.get("message"), "token": secrets.token_hex(32),
+        "status": "pending", "createdByUserId": user["id"],
+        "expiresAt": iso(now() + timedelta(days=7)), "createdAt": iso(now()),
+    }
+    store.invites[invite["id"]] = invite
+    return 201, dict(invite, diocese=store.dioceses.get(invite["dioceseId"]))
+
+
+@route("GET", "/invites", roles=("bishop", "admin"))
+def list_invites(store, user, body, params, query):
+    diocese_id = query.get("dioceseId")
+    return 200, [i for i in store.invites.values() if not diocese_id or i["dioceseId"] == diocese_id]
+
+
+@route("GET", "/invites/by-token/:token", public=True)
+def invite_by_token(store, user, body, params, query):
+    invite = pending_invite(store, params["token"])
+    return 200, dict(invite, diocese=store.dioceses.get(invite["dioceseId"]),
+                     parish=store.parishes.get(invite.get("parishId")))
+
+
+# ===== CONFESSION BANDS (mirrors ConfessionBandsService) =====
+
+def owned_band(store, band_id, priest_id):
+    band = store.bands.get(band_id)
+    if not band or band["priestId"] != priest_id:
+        raise HttpError(404, "Franja de confesión no encontrada")
+    return band
+
+
+def parse_occurrence_id(value):
+    """'<parent uuid>@<ISO start>' -> (parent id, start), or None for a plain band id"""
+    parent_id, separator, start = str(value or "").partition("@")
+    if not separator:
+        return None
+    try:
+        return parent_id, parse_date(start)
+    except HttpError:
+        return None
+
+
+def series_occurrences(store, parent, start, end):
+    """Virtual occurrences of a daily/weekly series in [start, end], like recurrence.expandOccurrences"""
+    if (not parent or not parent["isRecurrent"] or parent["parentBandId"]
+            or parent["recurrenceType"] not in ("daily", "weekly")):
+        return []
+    days = json.loads(parent["recurrenceDays"]) if parent["recurrenceDays"] else []
+    if parent["recurrenceType"] == "weekly" and not days:
+        return []
+
+    series_end = (parse_date(parent["recurrenceEndDate"]) if parent["recurrenceEndDate"]
+                  else parent["createdAt"] + timedelta(days=365))
+    materialized = {b.get("occurrenceStart") for b in store.bands.values() if b["parentBandId"] == parent["id"]}
+    duration = parent["endTime"] - parent["startTime"]
+
+    occurrences = []
+    occurrence = parent["startTime"] + timedelta(days=1)
+    while occurrence <= min(end, series_end):
+        # JavaScript's getDay(): Sunday is 0
+        on_day = parent["recurrenceType"] == "daily" or (occurrence.weekday() + 1) % 7 in days
+        if on_day and occurrence >= start and occurrence not in materialized:
+            occurrences.append(dict(
+                parent, id=f"{parent['id']}@{iso(occurrence)}", startTime=occurrence, endTime=occurrence + duration,
+                status="available", currentBookings=0, recurrenceType="none", recurrenceDays=None,
+                recurrenceEndDate=None, isRecurrent=False, parentBandId=parent["id"], occurrenceStart=occurrence,
+            ))
+        occurrence += timedelta(days=1)
+    return occurrences
+
+
+def all_occurrences(store, start, end, **filters):
+    return [occurrence for parent in list(store.bands.values())
+            if all(parent[key] == value for key, value in filters.items())
+            for occurrence in series_occurrences(store, parent, start, end)]
+
+
+def resolve_band(store, band_id):
+    """Band by id; a virtual occurrence is materialized first, like ConfessionBandsService.findOneById"""
+    parsed = parse_occurrence_id(band_id)
+    if not parsed:
+        return store.bands.get(band_id)
+
+    parent_id, start = parsed
+    for band in store.bands.values():
+        if band["parentBandId"] == parent_id and band.get("occurrenceStart") == start:
+            return band
+
+    occurrences = series_occurrences(store, store.bands.get(parent_id), start, start)
+    if not occurrences:
+        return None
+    band = dict(occurrences[0], id=str(uuid.uuid4()), createdAt=now(), updatedAt=now())
+    store.bands[band["id"]] = band
+    return band
+
+
+def check_overlaps(store, priest_id, start, end, exclude_id=None):
+    for band in store.bands.values():
+        if (band["priestId"] == priest_id and band["status"] != "cancelled" and band["id"] != exclude_id
+                and band["startTime"] < end and band["endTime"] > start):
+            raise HttpError(400, "Ya tienes franjas programadas que se solapan con este horario")
+
+
+@route("POST", "/confession-bands", roles=("priest",))
+def create_band(store, user, body, params, query):
+    start = parse_date(body.get("startTime"), "inicio")
+    end = parse_date(body.get("endTime"), "fin")
+    capacity = body.get("maxCapacity")
+    if not isinstance(capacity, int) or not 1 <= capacity <= 50:
+        raise HttpError(400, ["La capacidad máxima debe ser al menos 1"])
+    if start >= end:
+        raise HttpError(400, "La hora de inicio debe ser anterior a la hora de fin")
+    if start <= now():
+        raise HttpError(400, "La hora de inicio debe ser en el futuro")
+    check_overlaps(store, user["id"], start, end)
+
+    band = {
+        "id": str(uuid.uuid4()), "priestId": user["id"], "startTime": start, "endTime": end,
+        "status": "available", "location": body.get("location"),
+        "parishId": body.get("parishId") or user.get("currentParishId"), "notes": body.get("notes"),
+        "maxCapacity": capacity, "currentBookings": 0, "recurrenceType": body.get("recurrenceType", "none"),
+        "recurrenceDays": json.dumps(body["recurrenceDays"]) if body.get("recurrenceDays") else None,
+        "recurrenceEndDate": body.get("recurrenceEndDate"), "isRecurrent": bool(body.get("isRecurrent")),
+        "parentBandId": None, "createdAt": now(), "updatedAt": now(),
+    }
+    store.bands[band["id"]] = band
+    return 201, store.band_view(band, confessions=True)
+
+
+@route("GET", "/confession-bands/my-bands", roles=("priest",))
+def my_bands(store, user, body, params, query):
+    bands = [b for b in store.bands.values() if b["priestId"] == user["id"]]
+    if query.get("startDate") and query.get("endDate"):
+        start, end = parse_date(query["startDate"]), parse_date(query["endDate"])
+        bands = [b for b in bands if start <= b["startTime"] <= end]
+    else:
+        start, end = datetime.min.replace(tzinfo=timezone.utc), now() + timedelta(days=180)
+    bands += all_occurrences(store, start, end, priestId=user["id"])
+    bands.sort(key=lambda b: b["startTime"])
+    return 200, [store.band_view(b, confessions=True, relations=False) for b in bands]
+
+
+@route("GET", "/confession-bands/my-bands/:id", roles=("priest",))
+def my_band(store, user, body, params, query):
+    return 200, store.band_view(owned_band(store, params["id"], user["id"]), confessions=True)
+
+
+@route("PATCH", "/confession-bands/my-bands/:id", roles=("priest",))
+def update_band(store, user, body, params, query):
+    band = owned_band(store, params["id"], user["id"])
+    if body.get("startTime") or body.get("endTime"):
+        start = parse_date(body["startTime"], "inicio") if body.get("startTime") else band["startTime"]
+        end = parse_date(body["endTime"], "fin") if body.get("endTime") else band["endTime"]
+        if start >= end:
+            raise HttpError(400, "La hora de inicio debe ser anterior a la hora de fin")
+        check_overlaps(store, user["id"], start, end, band["id"])
+    if band["currentBookings"] > 0 and (body.get("startTime") or body.get("endTime") or body.get("maxCapacity")):
+        raise HttpError(400, "No se puede modificar una franja que ya tiene reservas. Cancela las reservas primero.")
+
+    for key, value in body.items():
+        if key in ("startTime", "endTime"):
+            value = parse_date(value)
+        if key in band and key not in ("id", "priestId", "currentBookings"):
+            band[key] = value
+    band["updatedAt"] = now()
+    return 200, store.band_view(band, confessions=True)
+
+
+@route("DELETE", "/confession-bands/my-bands/:id", roles=("priest",))
+def delete_band(store, user, body, params, query):
+    band = owned_band(store, params["id"], user["id"])
+    doomed = {band["id"]}
+    if band["isRecurrent"] and not band["parentBandId"]:
+        doomed.update(b["id"] for b in store.bands.values()
+                      if b["parentBandId"] == band["id"] and b["startTime"] > now())
+    cancelled = detached = 0
+    for confession in store.confessions.values():
+        if confession["confessionBandId"] in doomed:
+            if confession["status"] == "booked":
+                confession["status"] = "cancelled"
+                cancelled += 1
+            else:
+                detached += 1
+            confession["confessionBandId"] = None
+    for band_id in doomed:
+        store.bands.pop(band_id, None)
+    for child in store.bands.values():
+        if child["parentBandId"] == band["id"]:
+            child["parentBandId"] = None
+    message = ("Instancia de franja recurrente eliminada exitosamente" if band["parentBandId"]
+               else "Franja eliminada exitosamente")
+    return 200, {"message": message, "cancelledConfessions": cancelled,
+                 "detachedConfessions": detached, "deletedBands": len(doomed)}
+
+
+@route("PATCH", "/confession-bands/my-bands/:id/status", roles=("priest",))
+def change_band_status(store, user, body, params, query):
+    band = owned_band(store, params["id"], user["id"])
+    status = body.get("status")
+    if status == "cancelled" and band["currentBookings"] > 0:
+        raise HttpError(400, "No se puede cancelar una franja que tiene reservas activas. Cancela las reservas primero.")
+    band["status"] = status
+    band["updatedAt"] = now()
+    return 200, store.band_view(band, confessions=True)
+
+
+def available_bands(store, query):
+    start = parse_date(query["startDate"]) if query.get("startDate") and query.get("endDate") else None
+    end = parse_date(query["endDate"]) if start else None
+    occurrences = all_occurrences(store, start or now(), end or now() + timedelta(days=180))
+    bands = [
+        b for b in list(store.bands.values()) + occurrences
+        if b["status"] == "available" and b["currentBookings"] < b["maxCapacity"]
+        and ((start <= b["startTime"] <= end) if start else b["startTime"] > now())
+        and (not query.get("parishId") or b["parishId"] == query["parishId"])
+    ]
+    bands.sort(key=lambda b: b["startTime"])
+    return [store.band_view(b) for b in bands]
+
+
+@route("GET", "/confession-bands/available", roles=("faithful",))
+def get_available(store, user, body, params, query):
+    return 200, available_bands(store, query)
+
+
+@route("GET", "/confession-bands/public/available", public=True)
+def get_public_available(store, user, body, params, query):
+    return 200, available_bands(store, query)
+
+
+def book(store, band, faithful_id, scheduled, notes=None, preparation_notes=None):
+    """Shared by /confession-bands/book and POST /confessions: capacity check + counter, atomically"""
+    if band["currentBookings"] >= band["maxCapacity"]:
+        raise HttpError(400, "Esta franja ya está llena")
+    if any(c["confessionBandId"] == band["id"] and c["faithfulId"] == faithful_id and c["status"] == "booked"
+           for c in store.confessions.values()):
+        raise HttpError(400, "Ya tienes una reserva en esta franja")
+
+    confession = {
+        "id": str(uuid.uuid4()), "faithfulId": faithful_id, "confessionSlotId": None, "status": "booked",
+        "scheduledTime": scheduled, "confessionBandId": band["id"], "notes": notes,
+        "preparationNotes": preparation_notes, "createdAt": now(), "updatedAt": now(),
+    }
+    store.confessions[confession["id"]] = confession
+    band["currentBookings"] += 1
+    band["status"] = "full" if band["currentBookings"] >= band["maxCapacity"] else "available"
+    store.publish(band)
+    return confession
+
+
+def release(store, confession):
+    confession["status"] = "cancelled"
+    confession["updatedAt"] = now()
+    band = store.bands.get(confession["confessionBandId"])
+    if band and band["currentBookings"] > 0:
+        band["currentBookings"] -= 1
+        if band["status"] == "full":
+            band["status"] = "available"
+        store.publish(band)
+
+
+@route("POST", "/confession-bands/book", roles=("faithful",))
+def book_band(store, user, body, params, query):
+    band = resolve_band(store, body.get("bandId"))
+    if not band or band["status"] == "cancelled":
+        raise HttpError(404, "Franja de confesión no encontrada o no disponible")
+    if band["status"] == "full":
+        raise HttpError(400, "Esta franja ya está llena")
+    scheduled = parse_date(body["preferredTime"]) if body.get("preferredTime") else band["startTime"]
+    confession = book(store, band, user["id"], scheduled, body.get("notes"), body.get("preparationNotes"))
+    return 201, store.confession_view(confession)
+
+
+@route("GET", "/confession-bands/my-bookings", roles=("faithful",))
+def my_bookings(store, user, body, params, query):
+    mine = sorted((c for c in store.confessions.values() if c["faithfulId"] == user["id"]),
+                  key=lambda c: c["scheduledTime"])
+    return 200, [store.confession_view(c) for c in mine]
+
+
+@route("PATCH", "/confession-bands/bookings/:id/cancel", roles=("faithful",))
+def cancel_booking(store, user, body, params, query):
+    confession = store.confessions.get(params["id"])
+    if not confession or confession["faithfulId"] != user["id"] or confession["status"] != "booked":
+        raise HttpError(404, "Reserva no encontrada")
+    if confession["scheduledTime"] - now() < timedelta(hours=2):
+        raise HttpError(400, "No se puede cancelar una reserva con menos de 2 horas de anticipación")
+    release(store, confession)
+    return 200, {"message": "Reserva cancelada exitosamente"}
+
+
+# ===== CONFESSIONS (mirrors ConfessionsService) =====
+
+@route("GET", "/confessions")
+def list_confessions(store, user, body, params, query):
+    confessions = list(store.confessions.values())
+    if user["role"] == "faithful":
+        confessions = [c for c in confessions if c["faithfulId"] == user["id"]]
+    elif user["role"] == "priest":
+        confessions = [c for c in confessions
+                       if (store.bands.get(c["confessionBandId"]) or {}).get("priestId") == user["id"]]
+    confessions.sort(key=lambda c: c["scheduledTime"])
+    return 200, [store.confession_view(c) for c in confessions]
+
+
+@route("POST", "/confessions", roles=("faithful",))
+def create_confession(store, user, body, params, query):
+    band_id = body.get("confessionBandId")
+    if not band_id:
+        raise HttpError(400, "Debes proporcionar confessionSlotId o confessionBandId")
+    # CreateConfessionDto's @IsBandId(): a band uuid or a virtual occurrence id
+    try:
+        uuid.UUID(parse_occurrence_id(band_id)[0] if parse_occurrence_id(band_id) else band_id)
+    except ValueError:
+        raise HttpError(400, ["confessionBandId must be a UUID"])
+    band = resolve_band(store, band_id)
+    if not band:
+        raise HttpError(404, "Franja de confesión no encontrada")
+    if band["status"] != "available":
+        raise HttpError(400, "Esta franja de confesión no está disponible")
+    if band["startTime"] <= now():
+        raise HttpError(400, "No puedes reservar una franja que ya pasó")
+    confession = book(store, band, user["id"], band["startTime"], body.get("notes"), body.get("preparationNotes"))
+    return 201, store.confession_view(confession)
+
+
+@route("GET", "/confessions/:id")
+def get_confession(store, user, body, params, query):
+    confession = store.confessions.get(params["id"])
+    if not confession:
+        raise HttpError(404, "Confesión no encontrada")
+    return 200, store.confession_view(confession)
+
+
+@route("PATCH", "/confessions/:id/cancel")
+def cancel_confession(store, user, body, params, query):
+    confession = store.confessions.get(params["id"])
+    if not confession:
+        raise HttpError(404, "Confesión no encontrada")
+    if user["role"] == "faithful" and confession["faithfulId"] != user["id"]:
+        raise HttpError(403, "No puedes cancelar confesiones de otros usuarios")
+    if confession["status"] == "completed":
+        raise HttpError(400, "No puedes cancelar una confesión completada")
+    if confession["scheduledTime"] - now() <= timedelta(hours=2):
+        raise HttpError(400, "No puedes cancelar una confesión con menos de 2 horas de anticipación")
+    if confession["status"] == "booked":
+        release(store, confession)
+    confession["status"] = "cancelled"
+    return 200, store.confession_view(confession)
+
+
+@route("PATCH", "/confessions/:id/complete", roles=("priest",))
+def complete_confession(store, user, body, params, query):
+    confession = store.confessions.get(params["id"])
+    if not confession:
+        raise HttpError(404, "Confesión no encontrada")
+    if (store.bands.get(confession["confessionBandId"]) or {}).get("priestId") != user["id"]:
+        raise HttpError(403, "Solo el sacerdote asignado puede completar esta confesión")
+    confession["status"] = "completed"
+    return 200, store.confession_view(confession)
+
+
+@route("GET", "/confession-slots/available", public=True)
+def legacy_slots(store, user, body, params, query):
+    return 200, []
+
+
+# ===== HTTP PLUMBING =====
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "ConfesAppStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        path = parts.path[4:] if parts.path.startswith("/api/") else parts.path
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        store = self.server.store
+
+        # The only streaming route: it holds the connection open instead of returning a payload
+        if method == "GET" and path == "/confession-bands/public/events":
+            return self._stream_events(store, query)
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+            for route_method, regex, handler, roles, public in ROUTES:
+                match = regex.match(path)
+                if route_method != method or not match:
+                    continue
+                with store.lock:
+                    user = self._authenticate(store, public, roles)
+                    status, payload = handler(store, user, body, match.groupdict(), query)
+                return self._send(status, payload)
+
+            raise HttpError(404, f"Cannot {method} {parts.path}")
+        except HttpError as e:
+            self._send(e.status, {"message": e.message, "error": REASONS.get(e.status, "Error"), "statusCode": e.status})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"message": str(e), "error": "Bad Request", "statusCode": 400})
+
+    def _authenticate(self, store, public, roles):
+        header = self.headers.get("Authorization") or ""
+        user = store.verify(header[7:]) if header.startswith("Bearer ") else None
+        if public:
+            return user
+        if not user:
+            raise HttpError(401, "Unauthorized")
+        if roles and user["role"] not in roles:
+            raise HttpError(403, "Forbidden resource")
+        return user
+
+    def _stream_events(self, store, query):
+        """Server-sent events in the format Nest's @Sse writes: id, event type and JSON data"""
+        subscriber = store.subscribe(query.get("parishId"), query.get("priestId"))
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "keep-alive")
+            self.end_headers()
+            self.wfile.flush()
+
+            for event_id in itertools.count(1):
+                try:
+                    event, data = "band", json.dumps(subscriber[0].get(timeout=EVENTS_HEARTBEAT))
+                except queue.Empty:
+                    event, data = "ping", ""
+                self.wfile.write(f"id: {event_id}\nevent: {event}\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            store.unsubscribe(subscriber)
+
+    def _send(self, status, payload):
+        content = json.dumps(payload, default=str, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 resets connections during contention bursts
+    request_queue_size = 128
+
+    def __init__(self, address, store=None):
+        super().__init__(address, StandInHandler)
+        self.store = store or Store()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+
+def start_server(host="127.0.0.1", port=0, store=None):
+    """Start the stand-in on a background thread; port 0 picks a free port"""
+    server = StandInServer((host, port), store)
+    threading.Thread(target=server.serve_forever, name="confesapp-standin", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local in-memory stand-in for the ConfesApp REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port))
+    print(f"🚀 ConfesApp stand-in running on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,19 +6,22 @@ Tests the two main priest registration workflows:
 2. Direct Priest Application System
 """
 
-import requests
 import json
+import os
 import time
 from datetime import datetime
 
+from harness import ApiClient, write_report
+
 # Configuration
-BASE_URL = "https://faith-connect-34.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
 HEADERS = {"Content-Type": "application/json"}
 
 class PriestRegistrationTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
         self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=10, log=self.log)
         self.bishop_token = None
         self.bishop_user = None
         self.diocese_id = "a81d2bd3-c2e2-42ac-b4e7-66b44e4ad358"  # From seed data
@@ -30,27 +33,8 @@ class PriestRegistrationTester:
         print(f"[{timestamp}] {level}: {message}")
         
     def make_request(self, method, endpoint, data=None, token=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=10)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=headers, json=data, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            return response
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request failed: {e}", "ERROR")
-            return None
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
 
     def test_bishop_login(self):
         """Test bishop login with seed data"""
@@ -362,6 +346,7 @@ class PriestRegistrationTester:
 if __name__ == "__main__":
     tester = PriestRegistrationTester()
     passed, failed = tester.run_priest_registration_tests()
+    write_report(suite="PriestRegistrationTester", extra={"passed": passed, "failed": failed})
     
     # Exit with error code if any tests failed
     exit(0 if failed == 0 else 1)
\ No newline at end of file
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Backend API Testing Suite - BAND SEAT COUNTER
+Tests that POST /confessions, PATCH /confessions/:id/cancel and POST /confession-bands/book
+keep currentBookings in step on a band with maxCapacity = 1
+Focus: create -> cancel -> bookBand must neither overbook nor leave the counter below the bookings
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from harness import ApiClient, write_report
+
+# Configuration
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
+HEADERS = {"Content-Type": "application/json"}
+
+class SeatCounterTester:
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
+        # Test users: the first faithful books through /confessions, the second through bookBand
+        self.priest_token = None
+        self.faithful_tokens = []
+        # Test data
+        self.test_band_id = None
+        self.confession_id = None
+        # Results tracking
+        self.test_results = []
+
+    def log(self, message, level="INFO"):
+        """Log test messages with timestamp"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {level}: {message}")
+
+    def make_request(self, method, endpoint, data=None, token=None):
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
+
+    def check_band(self, name, current_bookings, status, booked):
+        """Compare the band's counter, status and BOOKED confessions with the expected values"""
+        response = self.make_request("GET", f"/confession-bands/my-bands/{self.test_band_id}", token=self.priest_token)
+
+        if not response or response.status_code != 200:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Cannot read band: {error_msg}", "ERROR")
+            self.test_results.append((name, False, str(error_msg)))
+            return False
+
+        band = response.json()
+        actual_booked = sum(1 for c in band.get("confessions", []) if c.get("status") == "booked")
+        details = (f"currentBookings={band.get('currentBookings')}, status={band.get('status')}, "
+                   f"booked confessions={actual_booked}")
+
+        if (band.get("currentBookings"), band.get("status"), actual_booked) == (current_bookings, status, booked):
+            self.log(f"✅ {details}")
+            self.test_results.append((name, True, details))
+            return True
+        else:
+            self.log(f"❌ Expected currentBookings={current_bookings}, status={status}, "
+                     f"booked confessions={booked}; got {details}", "ERROR")
+            self.test_results.append((name, False, details))
+            return False
+
+    # ===== SEAT COUNTER SEQUENCE =====
+
+    def test_1_priest_login(self):
+        """Test 1: LOGIN AS PRIEST"""
+        self.log("🔐 Test 1: LOGIN AS PRIEST (padre.parroco@sanmiguel.es)")
+
+        login_data = {
+            "email": "padre.parroco@sanmiguel.es",
+            "password": "Pass123!"
+        }
+
+        response = self.make_request("POST", "/auth/login", login_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.priest_token = response.json()["access_token"]
+            self.log("✅ Priest login successful")
+            self.test_results.append(("Priest Login", True, "Login successful"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Priest login failed: {error_msg}", "ERROR")
+            self.test_results.append(("Priest Login", False, str(error_msg)))
+            return False
+
+    def test_2_register_faithful_users(self):
+        """Test 2: REGISTER TWO FAITHFUL USERS"""
+        self.log("🙏 Test 2: REGISTER 2 FAITHFUL USERS")
+
+        run_id = int(time.time())
+        for i in range(2):
+            register_data = {
+                "email": f"seats.{run_id}.{i}@ejemplo.com",
+                "password": "Pass123!",
+                "firstName": "Fiel",
+                "lastName": f"Seats {i}",
+            }
+
+            response = self.make_request("POST", "/auth/register", register_data)
+
+            if response and response.status_code == 201 and response.json().get("access_token"):
+                self.faithful_tokens.append(response.json()["access_token"])
+            else:
+                error_msg = response.json() if response else "No response"
+                self.log(f"❌ Faithful {i} registration failed: {error_msg}", "ERROR")
+
+        if len(self.faithful_tokens) == 2:
+            self.log("✅ Registered 2 faithful users")
+            self.test_results.append(("Register Faithful Users", True, "2 users registered"))
+            return True
+        else:
+            self.test_results.append(("Register Faithful Users", False, f"Only {len(self.faithful_tokens)}/2 registered"))
+            return False
+
+    def test_3_create_single_seat_band(self):
+        """Test 3: CREATE BAND WITH maxCapacity = 1"""
+        self.log("📅 Test 3: CREATE BAND WITH maxCapacity=1")
+
+        # A few days ahead, so the 2-hour cancellation window never applies
+        start_time = (datetime.now() + timedelta(days=3)).replace(second=0, microsecond=0)
+        end_time = start_time + timedelta(minutes=30)
+
+        band_data = {
+            "startTime": start_time.isoformat() + "Z",
+            "endTime": end_time.isoformat() + "Z",
+            "location": "Confesionario Principal",
+            "maxCapacity": 1,
+            "notes": "Band for seat counter test",
+            "isRecurrent": False
+        }
+
+        response = self.make_request("POST", "/confession-bands", band_data, self.priest_token)
+
+        if response and response.status_code == 201 and response.json().get("id"):
+            self.test_band_id = response.json()["id"]
+            self.log(f"✅ Single-seat band created: {self.test_band_id}")
+            self.test_results.append(("Create Single-Seat Band", True, f"Band created with ID: {self.test_band_id}"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Band creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Single-Seat Band", False, str(error_msg)))
+            return False
+
+    def test_4_create_confession(self):
+        """Test 4: FIRST FAITHFUL BOOKS THROUGH POST /confessions"""
+        self.log("📝 Test 4: POST /confessions TAKES THE ONLY SEAT")
+
+        response = self.make_request("POST", "/confessions", {"confessionBandId": self.test_band_id},
+                                     self.faithful_tokens[0])
+
+        if not response or response.status_code != 201:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Confession creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Confession", False, str(error_msg)))
+            return False
+
+        self.confession_id = response.json()["id"]
+        self.test_results.append(("Create Confession", True, f"Confession {self.confession_id} booked"))
+        return self.check_band("Counter After Create", 1, "full", 1)
+
+    def test_5_book_band_while_full(self):
+        """Test 5: SECOND FAITHFUL CANNOT bookBand A FULL BAND"""
+        self.log("🚫 Test 5: bookBand ON THE FULL BAND IS REJECTED")
+
+        response = self.make_request("POST", "/confession-bands/book", {"bandId": self.test_band_id},
+                                     self.faithful_tokens[1])
+
+        if response is not None and response.status_code == 400:
+            self.log("✅ Booking rejected while the band is full")
+            self.test_results.append(("Book Full Band", True, "Rejected with 400"))
+            return self.check_band("Counter After Rejected Booking", 1, "full", 1)
+        else:
+            status = response.status_code if response is not None else "No response"
+            self.log(f"❌ OVERBOOKING: bookBand on a full band returned {status}", "ERROR")
+            self.test_results.append(("Book Full Band", False, f"Expected 400, got {status}"))
+            return False
+
+    def test_6_cancel_confession(self):
+        """Test 6: FIRST FAITHFUL CANCELS THROUGH PATCH /confessions/:id/cancel"""
+        self.log("❌ Test 6: CANCEL THE CONFESSION")
+
+        response = self.make_request("PATCH", f"/confessions/{self.confession_id}/cancel", token=self.faithful_tokens[0])
+
+        if not response or response.status_code != 200:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Cancellation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Cancel Confession", False, str(error_msg)))
+            return False
+
+        self.test_results.append(("Cancel Confession", True, "Confession cancelled"))
+        return self.check_band("Counter After Cancel", 0, "available", 0)
+
+    def test_7_book_band_after_cancel(self):
+        """Test 7: SECOND FAITHFUL TAKES THE FREED SEAT WITH bookBand"""
+        self.log("📝 Test 7: bookBand TAKES THE FREED SEAT")
+
+        response = self.make_request("POST", "/confession-bands/book", {"bandId": self.test_band_id},
+                                     self.faithful_tokens[1])
+
+        if not response or response.status_code != 201:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Booking the freed seat failed: {error_msg}", "ERROR")
+            self.test_results.append(("Book Freed Seat", False, str(error_msg)))
+            return False
+
+        self.test_results.append(("Book Freed Seat", True, "Freed seat booked"))
+        return self.check_band("Counter After Rebooking", 1, "full", 1)
+
+    def cleanup_band(self):
+        """Delete the test band (cancels its bookings)"""
+        if not self.priest_token or not self.test_band_id:
+            return
+
+        response = self.make_request("DELETE", f"/confession-bands/my-bands/{self.test_band_id}", token=self.priest_token)
+        if response and response.status_code == 200:
+            self.log(f"🧹 Cleaned up band: {self.test_band_id}")
+        else:
+            self.log(f"⚠️ Could not clean up band: {self.test_band_id}")
+
+    def run_seat_counter_testing(self):
+        """Run the create -> cancel -> bookBand sequence"""
+        self.log("🚀 STARTING BAND SEAT COUNTER TESTING")
+        self.log("=" * 80)
+
+        tests = [
+            ("1. Priest Login", self.test_1_priest_login),
+            ("2. Register Faithful Users", self.test_2_register_faithful_users),
+            ("3. Create Single-Seat Band", self.test_3_create_single_seat_band),
+            ("4. Create Confession", self.test_4_create_confession),
+            ("5. Book Full Band", self.test_5_book_band_while_full),
+            ("6. Cancel Confession", self.test_6_cancel_confession),
+            ("7. Book Freed Seat", self.test_7_book_band_after_cancel),
+        ]
+
+        passed = 0
+        failed = 0
+
+        # Each step depends on the state left by the previous one
+        for test_name, test_func in tests:
+            self.log(f"\n--- {test_name} ---")
+            try:
+                if test_func():
+                    passed += 1
+                else:
+                    failed += 1
+                    break
+            except Exception as e:
+                self.log(f"❌ {test_name} failed with exception: {e}", "ERROR")
+                failed += 1
+                self.test_results.append((test_name, False, f"Exception: {e}"))
+                break
+
+        self.cleanup_band()
+
+        self.log("\n" + "=" * 80)
+        self.log("🏁 BAND SEAT COUNTER TESTING COMPLETED!")
+        self.log(f"✅ Passed: {passed}")
+        self.log(f"❌ Failed: {failed}")
+
+        self.log("\n📋 DETAILED RESULTS:")
+        for test_name, success, details in self.test_results:
+            status = "✅" if success else "❌"
+            self.log(f"{status} {test_name}: {details}")
+
+        return passed, failed
+
+if __name__ == "__main__":
+    tester = SeatCounterTester()
+    passed, failed = tester.run_seat_counter_testing()
+    write_report(suite="SeatCounterTester", extra={"passed": passed, "failed": failed})
+
+    # Exit with error code if the counter drifted or the band was overbooked
+    exit(0 if failed == 0 else 1)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+ConfesApp Backend API Testing Suite - VIRTUAL OCCURRENCE BOOKING
+Tests that POST /confessions (the frontend's booking path) accepts the id of a lazily
+expanded occurrence of a recurring band (<parent uuid>@<ISO start>) and materializes it
+Focus: CreateConfessionDto validation and ConfessionsService.create on recurring series
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from harness import ApiClient, write_report
+
+# Configuration
+BASE_URL = os.environ.get("CONFESAPP_BASE_URL", "https://faith-connect-34.preview.emergentagent.com/api")
+HEADERS = {"Content-Type": "application/json"}
+
+class VirtualOccurrenceBookingTester:
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.headers = HEADERS.copy()
+        self.client = ApiClient(self.base_url, self.headers, timeout=30, log=self.log)
+        # Test users
+        self.priest_token = None
+        self.faithful_token = None
+        # Test data
+        self.series_id = None
+        self.series_start = None
+        self.occurrence_id = None
+        self.materialized_id = None
+        # Results tracking
+        self.test_results = []
+
+    def log(self, message, level="INFO"):
+        """Log test messages with timestamp"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {level}: {message}")
+
+    def make_request(self, method, endpoint, data=None, token=None):
+        """Make HTTP request through the shared pooled client"""
+        return self.client.request(method, endpoint, data, token)
+
+    # ===== VIRTUAL OCCURRENCE BOOKING SEQUENCE =====
+
+    def test_1_priest_login(self):
+        """Test 1: LOGIN AS PRIEST"""
+        self.log("🔐 Test 1: LOGIN AS PRIEST (padre.parroco@sanmiguel.es)")
+
+        login_data = {
+            "email": "padre.parroco@sanmiguel.es",
+            "password": "Pass123!"
+        }
+
+        response = self.make_request("POST", "/auth/login", login_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.priest_token = response.json()["access_token"]
+            self.log("✅ Priest login successful")
+            self.test_results.append(("Priest Login", True, "Login successful"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Priest login failed: {error_msg}", "ERROR")
+            self.test_results.append(("Priest Login", False, str(error_msg)))
+            return False
+
+    def test_2_register_faithful(self):
+        """Test 2: REGISTER A FAITHFUL USER"""
+        self.log("🙏 Test 2: REGISTER A FAITHFUL USER")
+
+        register_data = {
+            "email": f"occurrence.{int(time.time())}@ejemplo.com",
+            "password": "Pass123!",
+            "firstName": "Fiel",
+            "lastName": "Occurrence",
+        }
+
+        response = self.make_request("POST", "/auth/register", register_data)
+
+        if response and response.status_code == 201 and response.json().get("access_token"):
+            self.faithful_token = response.json()["access_token"]
+            self.log("✅ Faithful registered")
+            self.test_results.append(("Register Faithful", True, "User registered"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Faithful registration failed: {error_msg}", "ERROR")
+            self.test_results.append(("Register Faithful", False, str(error_msg)))
+            return False
+
+    def test_3_create_daily_series(self):
+        """Test 3: CREATE A SHORT DAILY SERIES"""
+        self.log("📅 Test 3: CREATE DAILY RECURRING BAND")
+
+        # An unusual hour a few days ahead, so neither seeded bands nor the cancellation window interfere
+        start_time = (datetime.utcnow() + timedelta(days=3)).replace(hour=5, minute=10, second=0, microsecond=0)
+        end_time = start_time + timedelta(minutes=20)
+
+        band_data = {
+            "startTime": start_time.isoformat() + "Z",
+            "endTime": end_time.isoformat() + "Z",
+            "location": "Confesionario Principal",
+            "maxCapacity": 2,
+            "notes": "Series for virtual occurrence booking test",
+            "isRecurrent": True,
+            "recurrenceType": "daily",
+            "recurrenceEndDate": (start_time + timedelta(days=4)).isoformat() + "Z",
+        }
+
+        response = self.make_request("POST", "/confession-bands", band_data, self.priest_token)
+
+        if response and response.status_code == 201 and response.json().get("id"):
+            self.series_id = response.json()["id"]
+            self.series_start = start_time
+            self.log(f"✅ Daily series created: {self.series_id}")
+            self.test_results.append(("Create Daily Series", True, f"Series created with ID: {self.series_id}"))
+            return True
+        else:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Series creation failed: {error_msg}", "ERROR")
+            self.test_results.append(("Create Daily Series", False, str(error_msg)))
+            return False
+
+    def test_4_find_virtual_occurrence(self):
+        """Test 4: THE NEXT DAY'S OCCURRENCE IS LISTED WITH A VIRTUAL ID"""
+        self.log("🔍 Test 4: FIND THE SECOND OCCURRENCE IN MY-BANDS")
+
+        window_start = self.series_start + timedelta(hours=12)
+        window_end = self.series_start + timedelta(days=1, hours=12)
+        endpoint = (f"/confession-bands/my-bands?startDate={window_start.isoformat()}Z"
+                    f"&endDate={window_end.isoformat()}Z")
+
+        response = self.make_request("GET", endpoint, token=self.priest_token)
+
+        if not response or response.status_code != 200:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Cannot list bands: {error_msg}", "ERROR")
+            self.test_results.append(("Find Virtual Occurrence", False, str(error_msg)))
+            return False
+
+        virtual = [band["id"] for band in response.json()
+                   if band.get("parentBandId") == self.series_id and "@" in band["id"]]
+
+        if virtual:
+            self.occurrence_id = virtual[0]
+            self.log(f"✅ Virtual occurrence: {self.occurrence_id}")
+            self.test_results.append(("Find Virtual Occurrence", True, self.occurrence_id))
+            return True
+        else:
+            self.log("❌ No virtual occurrence of the series in the window", "ERROR")
+            self.test_results.append(("Find Virtual Occurrence", False, "No occurrence listed"))
+            return False
+
+    def test_5_book_occurrence_through_confessions(self):
+        """Test 5: POST /confessions WITH THE VIRTUAL OCCURRENCE ID"""
+        self.log("📝 Test 5: POST /confessions BOOKS THE VIRTUAL OCCURRENCE")
+
+        response = self.make_request("POST", "/confessions", {"confessionBandId": self.occurrence_id},
+                                     self.faithful_token)
+
+        if not response or response.status_code != 201:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Booking the occurrence failed: {error_msg}", "ERROR")
+            self.test_results.append(("Book Virtual Occurrence", False, str(error_msg)))
+            return False
+
+        self.materialized_id = response.json().get("confessionBandId")
+
+        if self.materialized_id and "@" not in self.materialized_id:
+            self.log(f"✅ Booked on materialized band {self.materialized_id}")
+            self.test_results.append(("Book Virtual Occurrence", True, f"Band {self.materialized_id}"))
+            return True
+        else:
+            self.log(f"❌ Confession points at {self.materialized_id}, not a persisted band", "ERROR")
+            self.test_results.append(("Book Virtual Occurrence", False, f"confessionBandId={self.materialized_id}"))
+            return False
+
+    def test_6_verify_materialized_band(self):
+        """Test 6: THE MATERIALIZED BAND BELONGS TO THE SERIES AND HOLDS THE BOOKING"""
+        self.log("🔍 Test 6: VERIFY THE MATERIALIZED BAND")
+
+        response = self.make_request("GET", f"/confession-bands/my-bands/{self.materialized_id}", token=self.priest_token)
+
+        if not response or response.status_code != 200:
+            error_msg = response.json() if response else "No response"
+            self.log(f"❌ Cannot read materialized band: {error_msg}", "ERROR")
+            self.test_results.append(("Verify Materialized Band", False, str(error_msg)))
+            return False
+
+        band = response.json()
+        booked = sum(1 for c in band.get("confessions", []) if c.get("status") == "booked")
+        details = (f"parentBandId={band.get('parentBandId')}, currentBookings={band.get('currentBookings')}, "
+                   f"booked confessions={booked}")
+
+        if band.get("parentBandId") == self.series_id and band.get("currentBookings") == 1 and booked == 1:
+            self.log(f"✅ {details}")
+            self.test_results.append(("Verify Materialized Band", True, details))
+            return True
+        else:
+            self.log(f"❌ {details}", "ERROR")
+            self.test_results.append(("Verify Materialized Band", False, details))
+            return False
+
+    def cleanup_series(self):
+        """Delete the series (cancels the bookings of its future occurrences)"""
+        if not self.priest_token or not self.series_id:
+            return
+
+        response = self.make_request("DELETE", f"/confession-bands/my-bands/{self.series_id}", token=self.priest_token)
+        if response and response.status_code == 200:
+            self.log(f"🧹 Cleaned up series: {self.series_id}")
+        else:
+            self.log(f"⚠️ Could not clean up series: {self.series_id}")
+
+    def run_virtual_occurrence_testing(self):
+        """Run the recurring-band booking sequence"""
+        self.log("🚀 STARTING VIRTUAL OCCURRENCE BOOKING TESTING")
+        self.log("=" * 80)
+
+        tests = [
+            ("1. Priest Login", self.test_1_priest_login),
+            ("2. Register Faithful", self.test_2_register_faithful),
+            ("3. Create Daily Series", self.test_3_create_daily_series),
+            ("4. Find Virtual Occurrence", self.test_4_find_virtual_occurrence),
+            ("5. Book Through POST /confessions", self.test_5_book_occurrence_through_confessions),
+            ("6. Verify Materialized Band", self.test_6_verify_materialized_band),
+        ]
+
+        passed = 0
+        failed = 0
+
+        # Each step depends on the state left by the previous one
+        for test_name, test_func in tests:
+            self.log(f"\n--- {test_name} ---")
+            try:
+                if test_func():
+                    passed += 1
+                else:
+                    failed += 1
+                    break
+            except Exception as e:
+                self.log(f"❌ {test_name} failed with exception: {e}", "ERROR")
+                failed += 1
+                self.test_results.append((test_name, False, f"Exception: {e}"))
+                break
+
+        self.cleanup_series()
+
+        self.log("\n" + "=" * 80)
+        self.log("🏁 VIRTUAL OCCURRENCE BOOKING TESTING COMPLETED!")
+        self.log(f"✅ Passed: {passed}")
+        self.log(f"❌ Failed: {failed}")
+
+        self.log("\n📋 DETAILED RESULTS:")
+        for test_name, success, details in self.test_results:
+            status = "✅" if success else "❌"
+            self.log(f"{status} {test_name}: {details}")
+
+        return passed, failed
+
+if __name__ == "__main__":
+    tester = VirtualOccurrenceBookingTester()
+    passed, failed = tester.run_virtual_occurrence_testing()
+    write_report(suite="VirtualOccurrenceBookingTester", extra={"passed": passed, "failed": failed})
+
+    # Exit with error code if the occurrence could not be booked
+    exit(0 if failed == 0 else 1)